@@ -0,0 +1,80 @@
+'''
+Benchmark the process-pool batch parser against serial extract_voice_work_data.
+
+Pages are read from --html-dir when given, otherwise synthetic listing pages are
+written to a temporary directory. The parallel output is checked against the
+serial output before timing is reported.
+
+Usage
+-----
+python -m benchmarks.bench_batch_parse [--pages 40] [--html-dir DIR] [--workers 1 2 4]
+'''
+import argparse
+import os
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from dlsite_analyzer.scraper import VoiceWorkScraper, parse_html_files_in_parallel
+
+from tests.fixtures import build_listing_page
+
+def _write_fixture_pages(output_dir: Path, n_pages: int) -> list:
+    '''
+    Write synthetic listing pages as HTML files.
+
+    Parameters
+    ----------
+    output_dir : Path
+        Directory to write the pages to.
+    n_pages : int
+        Number of pages to write.
+
+    Returns
+    -------
+    list
+        Paths of the written files in page order.
+    '''
+    html_paths = []
+    for page in range(1, n_pages + 1):
+        html_path = output_dir / f"voice_works_page_{page}.html"
+        html_path.write_text(build_listing_page(page), encoding="UTF-8")
+        html_paths.append(html_path)
+    return html_paths
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40, help="number of synthetic pages")
+    parser.add_argument("--html-dir", type=Path, help="directory of saved listing pages (*.html)")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers, help="worker counts to benchmark")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.html_dir:
+            html_paths = sorted(args.html_dir.glob("*.html"))
+        else:
+            html_paths = _write_fixture_pages(Path(tmp_dir), args.pages)
+
+        scraper = VoiceWorkScraper()
+        start = perf_counter()
+        serial_results = [scraper.extract_voice_work_data(path.read_text(encoding="UTF-8")) for path in html_paths]
+        serial_seconds = perf_counter() - start
+        scraper.close()
+
+        print(f"{len(html_paths)} pages, {cpu_count} CPU cores")
+        print(f"{'mode':<12}{'seconds':>10}{'pages/s':>10}{'speedup':>10}")
+        print(f"{'serial':<12}{serial_seconds:>10.2f}{len(html_paths) / serial_seconds:>10.1f}{1.0:>10.2f}")
+
+        for workers in args.workers:
+            start = perf_counter()
+            results = parse_html_files_in_parallel(html_paths, max_workers=workers)
+            seconds = perf_counter() - start
+            if results != serial_results:
+                raise AssertionError(f"Parallel output with {workers} workers differs from the serial output.")
+            print(f"{f'{workers} workers':<12}{seconds:>10.2f}{len(html_paths) / seconds:>10.1f}{serial_seconds / seconds:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+'''
+Benchmark VoiceWorksBulkImporter against the original per-work insert path.
+
+Synthetic listing pages are parsed into voice works, which are imported into two
+fresh databases: once with `_insert_voice_work_data` (the original import, with one
+set of table handlers and single-row queries per work) and once with the bulk
+importer. Every table of the two databases is compared before the throughput is
+reported. The fingerprint column is left out, as the original import does not fill it.
+
+A refresh pass then re-imports every work with 1% of the sales counts changed, as a
+daily crawl would. Only the changed rows may be rewritten. The original import
+cannot update existing rows, so its refresh rebuilds a fresh database.
+
+Usage
+-----
+python -m benchmarks.bench_bulk_import [--pages 100] [--batch-size 10000]
+'''
+import argparse
+import random
+import sqlite3
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from dlsite_analyzer import DatabaseInitializer
+from dlsite_analyzer.database import (
+    SQLiteHandler,
+    VoiceWorksBulkImporter,
+    VoiceWorksTableHandler,
+    CirclesTableHandler,
+    ProductFormatTableHandler,
+    VoiceActorsTableHandler,
+    AgeRatingTableHandler,
+)
+from dlsite_analyzer.database.constants import (
+    VOICE_WORKS_TABLE,
+    CIRCLES_TABLE,
+    PRODUCT_FORMAT_TABLE,
+    VOICE_ACTORS_TABLE,
+    AGE_RATING_TABLE,
+    VOICE_WORKS_PRIMARY_KEY,
+    VOICE_WORKS_TITLE,
+    VOICE_WORKS_URL,
+    VOICE_WORKS_PRODUCT_FORMAT_ID,
+    VOICE_WORKS_CIRCLE_ID,
+    VOICE_WORKS_VOICE_ACTOR_ID,
+    VOICE_WORKS_PRICE,
+    VOICE_WORKS_POINTS,
+    VOICE_WORKS_SALES_COUNT,
+    VOICE_WORKS_REVIEW_COUNT,
+    VOICE_WORKS_AGE_ID,
+    VOICE_WORKS_FULL_IMAGE_URL,
+    VOICE_WORKS_FINGERPRINT,
+    CIRCLE_PRIMARY_KEY,
+    CIRCLE_NAME,
+    PRODUCT_FORMAT_NAME,
+    VOICE_ACTOR_NAME,
+    AGE_RATING_NAME,
+)
+from dlsite_analyzer.scraper import VoiceWorkScraper
+from dlsite_analyzer.utils import Logger
+
+from tests.fixtures import build_listing_page
+
+logger = Logger.get_logger(__name__)
+
+TABLES = (VOICE_WORKS_TABLE, CIRCLES_TABLE, PRODUCT_FORMAT_TABLE, VOICE_ACTORS_TABLE, AGE_RATING_TABLE)
+
+def _create_database(db_path: Path) -> None:
+    '''
+    Create an empty database with the application schema.
+    '''
+    initializer = DatabaseInitializer(db_path)
+    initializer.initialize()
+    initializer.db_connection.close()
+
+def _dump_tables(db_path: Path, fingerprints: bool=True) -> dict:
+    '''
+    Read every benchmarked table, sorted by all columns, optionally without the fingerprint column.
+    '''
+    tables = {}
+    with sqlite3.connect(db_path) as connection:
+        for table in TABLES:
+            columns = [row[1] for row in connection.execute(f"PRAGMA table_info({table})")]
+            if not fingerprints:
+                columns = [column for column in columns if column != VOICE_WORKS_FINGERPRINT]
+            rows = connection.execute(f"SELECT {', '.join(columns)} FROM {table}").fetchall()
+            tables[table] = sorted(rows, key=repr)
+    return tables
+
+def _insert_voice_work_data(db_connection: SQLiteHandler, work: dict) -> None:
+    '''
+    Insert a single voice work entry and its associated data into the database.
+
+    This is the per-work import the application used before VoiceWorksBulkImporter, kept
+    here as the baseline. It only inserts, so existing rows are never refreshed.
+
+    Parameters
+    ----------
+    db_connection : SQLiteHandler
+        Database connection handler.
+    work : dict
+        Voice work data to be inserted.
+    '''
+    try:
+        age_rating_manager = AgeRatingTableHandler(db_connection)
+        circles_manager = CirclesTableHandler(db_connection)
+        product_format_manager = ProductFormatTableHandler(db_connection)
+        voice_actors_manager = VoiceActorsTableHandler(db_connection)
+        voice_works_manager = VoiceWorksTableHandler(db_connection)
+
+        # Insert or retrieve maker
+        circles_data = {CIRCLE_PRIMARY_KEY: work['maker_id'], CIRCLE_NAME: work['maker']}
+        circles_manager.insert(circles_data)
+
+        # Insert or retrieve product format
+        category_data = {PRODUCT_FORMAT_NAME: work['category']}
+        product_format_manager.insert(category_data)
+        category_id = product_format_manager.get_product_format_id(category_data[PRODUCT_FORMAT_NAME])
+
+        # Insert or retrieve author
+        author_data = {VOICE_ACTOR_NAME: work['author']}
+        author_id = voice_actors_manager.get_voice_actor_id(author_data[VOICE_ACTOR_NAME])
+        if author_id is None and author_data[VOICE_ACTOR_NAME]:
+            voice_actors_manager.insert(author_data)
+            author_id = voice_actors_manager.get_voice_actor_id(author_data[VOICE_ACTOR_NAME])
+
+        # Insert or retrieve age rating
+        age_rating_data = {AGE_RATING_NAME: work['age_rating']}
+        age_rating_id = age_rating_manager.get_age_rating_id(age_rating_data[AGE_RATING_NAME])
+        if age_rating_id is None:
+            age_rating_manager.insert(age_rating_data)
+            age_rating_id = age_rating_manager.get_age_rating_id(age_rating_data[AGE_RATING_NAME])
+
+        # Insert voice work
+        voice_work_entry = {
+            VOICE_WORKS_PRIMARY_KEY: work['product_id'],
+            VOICE_WORKS_TITLE: work['title'],
+            VOICE_WORKS_URL: work['url'],
+            VOICE_WORKS_PRODUCT_FORMAT_ID: category_id,
+            VOICE_WORKS_CIRCLE_ID: circles_data[CIRCLE_PRIMARY_KEY],
+            VOICE_WORKS_VOICE_ACTOR_ID: author_id,
+            VOICE_WORKS_PRICE: work['price'],
+            VOICE_WORKS_POINTS: work['points'],
+            VOICE_WORKS_SALES_COUNT: work['sales_count'],
+            VOICE_WORKS_REVIEW_COUNT: work['review_count'],
+            VOICE_WORKS_AGE_ID: age_rating_id,
+            VOICE_WORKS_FULL_IMAGE_URL: work['full_image_url'],
+        }
+        voice_works_manager.insert(voice_work_entry)
+    except Exception as e:
+        logger.error(f"Failed to insert voice work data: {e}")
+
+def _timed_per_work_import(db_path: Path, works: list) -> float:
+    '''
+    Import the works with `_insert_voice_work_data` and return the elapsed seconds.
+    '''
+    start = perf_counter()
+    with SQLiteHandler(db_path) as db_connection:
+        for work in works:
+            _insert_voice_work_data(db_connection, work)
+    return perf_counter() - start
+
+def _timed_bulk_import(db_path: Path, works: list, batch_size: int) -> tuple[float, int]:
+    '''
+    Import the works with VoiceWorksBulkImporter and return the elapsed seconds and the number of changed rows.
+    '''
+    start = perf_counter()
+    with SQLiteHandler(db_path) as db_connection, VoiceWorksBulkImporter(db_connection, batch_size) as importer:
+        importer.add_many(works)
+    return perf_counter() - start, importer.changed
+
+def _print_row(name: str, seconds: float, n_rows: int, baseline_seconds: float) -> None:
+    '''
+    Print one line of the result table.
+    '''
+    print(f"{name:<18}{seconds:>10.2f}{n_rows / seconds:>12.0f}{baseline_seconds / seconds:>10.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100, help="number of synthetic pages")
+    parser.add_argument("--batch-size", type=int, default=10000, help="rows per bulk import batch")
+    args = parser.parse_args()
+
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in range(1, args.pages + 1) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        row_db_path = Path(tmp_dir) / "row.db"
+        bulk_db_path = Path(tmp_dir) / "bulk.db"
+        _create_database(row_db_path)
+        _create_database(bulk_db_path)
+
+        row_seconds = _timed_per_work_import(row_db_path, works)
+        bulk_seconds, changed = _timed_bulk_import(bulk_db_path, works, args.batch_size)
+        if _dump_tables(row_db_path, fingerprints=False) != _dump_tables(bulk_db_path, fingerprints=False) or changed != len(works):
+            raise AssertionError("Bulk import produced different table contents.")
+
+        rng = random.Random(0)
+        moved = rng.sample(range(len(works)), len(works) // 100)
+        refreshed_works = [dict(work) for work in works]
+        for index in moved:
+            refreshed_works[index]["sales_count"] += 1
+
+        row_refresh_db_path = Path(tmp_dir) / "row_refresh.db"
+        _create_database(row_refresh_db_path)
+        row_refresh_seconds = _timed_per_work_import(row_refresh_db_path, refreshed_works)
+        bulk_refresh_seconds, changed = _timed_bulk_import(bulk_db_path, refreshed_works, args.batch_size)
+        if _dump_tables(row_refresh_db_path, fingerprints=False) != _dump_tables(bulk_db_path, fingerprints=False) or changed != len(moved):
+            raise AssertionError(f"Refresh rewrote {changed} rows, expected {len(moved)}.")
+
+    print(f"{len(works)} voice works, refresh changes {len(moved)}")
+    print(f"{'path':<18}{'seconds':>10}{'rows/s':>12}{'speedup':>10}")
+    _print_row("per-work", row_seconds, len(works), row_seconds)
+    _print_row("bulk", bulk_seconds, len(works), row_seconds)
+    _print_row("per-work rebuild", row_refresh_seconds, len(works), row_refresh_seconds)
+    _print_row("bulk refresh", bulk_refresh_seconds, len(works), row_refresh_seconds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+'''
+Benchmark analysis reads running while an import writes, through ConnectionManager.
+
+Half of the synthetic voice works are imported first. A writer thread then imports
+the other half in small committed batches while the main thread keeps reading from
+the reader pool. Each read block counts the works twice, with a pause between, and
+both counts must agree: a reader sees one consistent snapshot however many commits
+land in the meantime. The report shows the read latency while idle and while the
+writer is busy, and how many distinct snapshots the readers observed.
+
+Usage
+-----
+python -m benchmarks.bench_concurrent_reads [--pages 100] [--batch-size 500]
+'''
+import argparse
+import statistics
+import tempfile
+import threading
+from pathlib import Path
+from time import perf_counter, sleep
+
+from dlsite_analyzer.database import ConnectionManager, VoiceWorksBulkImporter, VoiceWorksViewHandler
+from dlsite_analyzer.database.constants import VOICE_WORKS_TABLE
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from .bench_bulk_import import _create_database
+from tests.fixtures import build_listing_page
+
+def _import(manager: ConnectionManager, works: list, batch_size: int) -> None:
+    '''
+    Import the works through the writer connection, committing once per batch.
+    '''
+    with manager.writer() as db_connection, VoiceWorksBulkImporter(db_connection, batch_size) as importer:
+        importer.add_many(works)
+
+def _timed_read(manager: ConnectionManager) -> tuple[float, int]:
+    '''
+    Read the voice works view in one snapshot and return the elapsed seconds and the work count.
+    '''
+    start = perf_counter()
+    with manager.reader() as db_connection:
+        query = f"SELECT COUNT(*) FROM {VOICE_WORKS_TABLE}"
+        count = db_connection.execute_query(query).fetchone()[0]
+        VoiceWorksViewHandler(db_connection).get_all_voice_works()
+        sleep(0.01)
+        if db_connection.execute_query(query).fetchone()[0] != count:
+            raise AssertionError("A reader saw a commit in the middle of its snapshot.")
+    return perf_counter() - start, count
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100, help="number of synthetic pages")
+    parser.add_argument("--batch-size", type=int, default=500, help="rows per committed writer batch")
+    args = parser.parse_args()
+
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in range(1, args.pages + 1) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+    half = len(works) // 2
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "concurrent.db"
+        _create_database(db_path)
+
+        with ConnectionManager(db_path) as manager:
+            _import(manager, works[:half], args.batch_size)
+            idle_seconds = [_timed_read(manager)[0] for _ in range(20)]
+
+            writer = threading.Thread(target=_import, args=(manager, works[half:], args.batch_size))
+            writer.start()
+            busy_seconds = []
+            counts = set()
+            while writer.is_alive():
+                seconds, count = _timed_read(manager)
+                busy_seconds.append(seconds)
+                counts.add(count)
+            writer.join()
+
+            final_count = _timed_read(manager)[1]
+            if final_count != len({work["product_id"] for work in works}):
+                raise AssertionError(f"{final_count} works in the database after the import.")
+
+    print(f"{len(works)} voice works, {len(works) - half} written in batches of {args.batch_size} during the reads")
+    print(f"{'reads':<14}{'count':>8}{'median ms':>12}{'max ms':>10}")
+    print(f"{'idle':<14}{len(idle_seconds):>8}{statistics.median(idle_seconds) * 1000:>12.1f}{max(idle_seconds) * 1000:>10.1f}")
+    print(f"{'while writing':<14}{len(busy_seconds):>8}{statistics.median(busy_seconds) * 1000:>12.1f}{max(busy_seconds) * 1000:>10.1f}")
+    print(f"distinct snapshots seen while writing: {len(counts)}")
+
+if __name__ == "__main__":
+    main()
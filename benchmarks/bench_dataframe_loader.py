@@ -0,0 +1,99 @@
+'''
+Benchmark the chunked, typed DataFrame loader against fetchall() into a DataFrame.
+
+A database of synthetic voice works is loaded through the voice works view three
+ways: the previous fetchall() path, read_dataframe, and iter_voice_works consumed
+chunk by chunk. The report shows the elapsed time, the peak memory allocated while
+loading (tracemalloc) and the memory held by the resulting DataFrame. Every column
+of the typed frame must hold the same values as the untyped one.
+
+Usage
+-----
+python -m benchmarks.bench_dataframe_loader [--pages 500] [--chunk-size 50000]
+'''
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+import pandas as pd
+
+from dlsite_analyzer.database import SQLiteHandler, VoiceWorksBulkImporter, VoiceWorksViewHandler
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from .bench_bulk_import import _create_database
+from tests.fixtures import build_listing_page
+
+def _measure(load) -> tuple:
+    '''
+    Run a load function and return its result, the elapsed seconds and the peak traced MiB.
+    '''
+    tracemalloc.start()
+    start = perf_counter()
+    result = load()
+    seconds = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak / 2**20
+
+def _load_fetchall(db_connection: SQLiteHandler) -> pd.DataFrame:
+    '''
+    Load the view the way get_all_voice_works did before: fetchall() and one DataFrame.
+    '''
+    view_handler = VoiceWorksViewHandler(db_connection)
+    res = db_connection.execute_query(f"SELECT * FROM {view_handler.view_name}")
+    return pd.DataFrame(res.fetchall(), columns=view_handler.get_columns())
+
+def _consume_chunks(db_connection: SQLiteHandler, chunk_size: int) -> int:
+    '''
+    Aggregate the sales per age rating chunk by chunk, keeping no chunk alive, and return the row count.
+    '''
+    n_rows = 0
+    sales_by_age = pd.Series(dtype="Int64")
+    for chunk in VoiceWorksViewHandler(db_connection).iter_voice_works(chunk_size):
+        n_rows += len(chunk)
+        chunk_sales = chunk.groupby("age", observed=True)["sales_count"].sum()
+        sales_by_age = sales_by_age.add(chunk_sales, fill_value=0)
+    return n_rows
+
+def _mebibytes(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 2**20
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500, help="number of synthetic pages")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="rows per chunk")
+    args = parser.parse_args()
+
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in range(1, args.pages + 1) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "loader.db"
+        _create_database(db_path)
+        with SQLiteHandler(db_path) as db_connection, VoiceWorksBulkImporter(db_connection) as importer:
+            importer.add_many(works)
+
+        with SQLiteHandler(db_path) as db_connection:
+            view_handler = VoiceWorksViewHandler(db_connection)
+            untyped_df, fetchall_seconds, fetchall_peak = _measure(lambda: _load_fetchall(db_connection))
+            typed_df, typed_seconds, typed_peak = _measure(lambda: view_handler.get_all_voice_works(args.chunk_size))
+            n_rows, chunk_seconds, chunk_peak = _measure(lambda: _consume_chunks(db_connection, args.chunk_size))
+
+    if list(typed_df.columns) != list(untyped_df.columns) or n_rows != len(untyped_df):
+        raise AssertionError("The typed loader returned a different shape.")
+    for column in untyped_df.columns:
+        if typed_df[column].astype(object).tolist() != untyped_df[column].tolist():
+            raise AssertionError(f"Column {column} differs between the loaders.")
+
+    print(f"{len(untyped_df)} voice works, chunks of {args.chunk_size}")
+    print(f"{'loader':<16}{'seconds':>10}{'peak MiB':>10}{'frame MiB':>11}")
+    print(f"{'fetchall':<16}{fetchall_seconds:>10.2f}{fetchall_peak:>10.1f}{_mebibytes(untyped_df):>11.1f}")
+    print(f"{'read_dataframe':<16}{typed_seconds:>10.2f}{typed_peak:>10.1f}{_mebibytes(typed_df):>11.1f}")
+    print(f"{'chunk iterator':<16}{chunk_seconds:>10.2f}{chunk_peak:>10.1f}{'-':>11}")
+    print("dtypes:", ", ".join(f"{column}={dtype}" for column, dtype in typed_df.dtypes.items()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+'''
+Benchmark the materialized voice works view against the plain view.
+
+Synthetic voice works are imported into two fresh databases, one with the view
+materialized, to measure the cost of the triggers on the import. Both load the
+catalog through VoiceWorksViewHandler.get_all_voice_works, and the results must be
+identical. A refresh pass then changes sales counts, renames circles, adds works and
+deletes a few; afterwards the materialized table must still match the view. The full
+rebuild is timed last.
+
+Usage
+-----
+python -m benchmarks.bench_materialized_view [--pages 200] [--loads 5]
+'''
+import argparse
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from dlsite_analyzer import DatabaseInitializer
+from dlsite_analyzer.database import SQLiteHandler, VoiceWorksBulkImporter, VoiceWorksViewHandler
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from tests.fixtures import build_listing_page
+
+def _create_database(db_path: Path, materialize_views: bool) -> None:
+    '''
+    Create an empty database with the application schema.
+    '''
+    initializer = DatabaseInitializer(db_path)
+    initializer.initialize(materialize_views=materialize_views)
+    initializer.db_connection.close()
+
+def _timed_import(db_path: Path, works: list) -> float:
+    '''
+    Import the works with VoiceWorksBulkImporter and return the elapsed seconds.
+    '''
+    start = perf_counter()
+    with SQLiteHandler(db_path) as db_connection, VoiceWorksBulkImporter(db_connection) as importer:
+        importer.add_many(works)
+    return perf_counter() - start
+
+def _timed_loads(db_path: Path, n_loads: int) -> tuple:
+    '''
+    Load the catalog `n_loads` times and return the median seconds and the last result.
+    '''
+    seconds = []
+    with SQLiteHandler(db_path) as db_connection:
+        view_handler = VoiceWorksViewHandler(db_connection)
+        for _ in range(n_loads):
+            start = perf_counter()
+            df = view_handler.get_all_voice_works()
+            seconds.append(perf_counter() - start)
+    return sorted(seconds)[len(seconds) // 2], df
+
+def _check_in_sync(db_path: Path) -> None:
+    '''
+    Check that the materialized table holds exactly the rows of the view.
+    '''
+    with SQLiteHandler(db_path) as db_connection:
+        view_handler = VoiceWorksViewHandler(db_connection)
+        view_rows = db_connection.execute_query(f"SELECT * FROM {view_handler.view_name}").fetchall()
+        query = f"SELECT * FROM {view_handler.materialized_view_name} ORDER BY id"
+        if db_connection.execute_query(query).fetchall() != view_rows:
+            raise AssertionError("The materialized view is out of sync with the view.")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200, help="number of synthetic pages")
+    parser.add_argument("--loads", type=int, default=5, help="catalog loads per variant")
+    args = parser.parse_args()
+
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in range(1, args.pages + 1) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+    initial_works = works[:len(works) * 9 // 10]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        view_db_path = Path(tmp_dir) / "view.db"
+        materialized_db_path = Path(tmp_dir) / "materialized.db"
+        _create_database(view_db_path, materialize_views=False)
+        _create_database(materialized_db_path, materialize_views=True)
+
+        view_import_seconds = _timed_import(view_db_path, initial_works)
+        materialized_import_seconds = _timed_import(materialized_db_path, initial_works)
+
+        view_load_seconds, view_df = _timed_loads(view_db_path, args.loads)
+        materialized_load_seconds, materialized_df = _timed_loads(materialized_db_path, args.loads)
+        if not view_df.equals(materialized_df):
+            raise AssertionError("The materialized view returned different voice works.")
+
+        rng = random.Random(0)
+        refreshed_works = [dict(work) for work in works]
+        for work in rng.sample(refreshed_works, len(refreshed_works) // 100):
+            work["sales_count"] += 1
+        renamed_circles = {work["maker_id"] for work in rng.sample(refreshed_works, 20)}
+        for work in refreshed_works:
+            if work["maker_id"] in renamed_circles:
+                work["maker"] = f"{work['maker']} (renamed)"
+        _timed_import(materialized_db_path, refreshed_works)
+        with SQLiteHandler(materialized_db_path) as db_connection:
+            deleted = [(work["product_id"],) for work in rng.sample(refreshed_works, 10)]
+            db_connection.executemany_query("DELETE FROM voice_works WHERE id = ?", deleted)
+        _check_in_sync(materialized_db_path)
+
+        with SQLiteHandler(materialized_db_path) as db_connection:
+            start = perf_counter()
+            VoiceWorksViewHandler(db_connection).rebuild_materialized_view()
+            rebuild_seconds = perf_counter() - start
+        _check_in_sync(materialized_db_path)
+
+    print(f"{len(initial_works)} voice works imported, {len(works) - len(initial_works)} added on refresh")
+    print(f"{'variant':<14}{'import s':>10}{'load ms':>10}")
+    print(f"{'view':<14}{view_import_seconds:>10.2f}{view_load_seconds * 1000:>10.1f}")
+    print(f"{'materialized':<14}{materialized_import_seconds:>10.2f}{materialized_load_seconds * 1000:>10.1f}")
+    print(f"load speedup: {view_load_seconds / materialized_load_seconds:.2f}x, full rebuild: {rebuild_seconds:.2f}s")
+
+if __name__ == "__main__":
+    main()
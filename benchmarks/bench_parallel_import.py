@@ -0,0 +1,82 @@
+'''
+Benchmark the parallel decode / single-writer import against the serial import.
+
+Synthetic voice works are written to compressed NDJSON record files, then imported
+into fresh databases serially and with each worker count. Every table is compared
+with the serial result before the throughput is reported. Throughput should grow
+with the workers until the writer thread becomes the bottleneck; on a single core
+the pool only adds overhead.
+
+Usage
+-----
+python -m benchmarks.bench_parallel_import [--pages 300] [--workers 1 2 4]
+'''
+import argparse
+import os
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import dlsite_analyzer
+from dlsite_analyzer import DatabaseInitializer, import_voice_works_to_db
+from dlsite_analyzer.scraper import VoiceWorkScraper
+from dlsite_analyzer.utils import NDJSONWriter
+
+from .bench_bulk_import import _dump_tables
+from tests.fixtures import build_listing_page
+
+def _write_records(output_dir: Path, n_pages: int) -> int:
+    '''
+    Write the works of synthetic listing pages to record files of 50 pages each.
+    '''
+    scraper = VoiceWorkScraper(parser="stream")
+    n_records = 0
+    for page in range(1, n_pages + 1):
+        voice_works = scraper.extract_voice_work_data(build_listing_page(page))
+        with NDJSONWriter(output_dir / f"voice_works_{(page - 1) // 50:03d}.ndjson.gz") as writer:
+            writer.write_many(voice_works)
+        n_records += len(voice_works)
+    scraper.close()
+    return n_records
+
+def _timed_import(input_dir: Path, db_path: Path, max_workers: int) -> float:
+    '''
+    Import the record files into a fresh database and return the elapsed seconds.
+    '''
+    initializer = DatabaseInitializer(db_path)
+    initializer.initialize()
+    initializer.db_connection.close()
+
+    dlsite_analyzer.DATABASE_PATH = db_path
+    start = perf_counter()
+    import_voice_works_to_db(input_dir, max_workers=max_workers)
+    return perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=300, help="number of synthetic pages")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="worker counts to benchmark")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_dir = Path(tmp_dir) / "records"
+        input_dir.mkdir()
+        n_records = _write_records(input_dir, args.pages)
+
+        serial_db_path = Path(tmp_dir) / "serial.db"
+        serial_seconds = _timed_import(input_dir, serial_db_path, 0)
+        serial_tables = _dump_tables(serial_db_path)
+
+        print(f"{n_records} voice works, {os.cpu_count()} CPU cores")
+        print(f"{'mode':<12}{'seconds':>10}{'rows/s':>12}{'speedup':>10}")
+        print(f"{'serial':<12}{serial_seconds:>10.2f}{n_records / serial_seconds:>12.0f}{1.0:>10.2f}")
+
+        for workers in args.workers:
+            db_path = Path(tmp_dir) / f"parallel_{workers}.db"
+            seconds = _timed_import(input_dir, db_path, workers)
+            if _dump_tables(db_path) != serial_tables:
+                raise AssertionError(f"Parallel import with {workers} workers produced different table contents.")
+            print(f"{f'{workers} workers':<12}{seconds:>10.2f}{n_records / seconds:>12.0f}{serial_seconds / seconds:>10.2f}")
+
+if __name__ == "__main__":
+    main()
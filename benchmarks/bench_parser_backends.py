@@ -0,0 +1,97 @@
+'''
+Differential check and benchmark of the listing parser backends.
+
+Every backend must return exactly the same records as the BeautifulSoup reference
+parser. The check runs on recorded pages from --html-dir (*.html) when given,
+otherwise on synthetic listing pages, and the script exits with an error on the
+first mismatching page before any timing is reported.
+
+Usage
+-----
+python -m benchmarks.bench_parser_backends [--pages 20] [--html-dir DIR] [--repeat 3]
+'''
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from dlsite_analyzer.scraper import BeautifulSoupListingParser, LISTING_PARSERS
+
+from tests.fixtures import build_listing_page
+
+def _load_pages(html_dir: Path, n_pages: int) -> list:
+    '''
+    Load recorded pages, or build synthetic ones when no directory is given.
+
+    Parameters
+    ----------
+    html_dir : Path
+        Directory of recorded listing pages, or None.
+    n_pages : int
+        Number of synthetic pages to build.
+
+    Returns
+    -------
+    list
+        Tuples of (page name, HTML).
+    '''
+    if html_dir:
+        return [(path.name, path.read_text(encoding="UTF-8")) for path in sorted(html_dir.glob("*.html"))]
+    return [(f"synthetic page {page}", build_listing_page(page)) for page in range(1, n_pages + 1)]
+
+def _find_mismatch(expected: list, actual: list) -> str:
+    '''
+    Describe the first difference between two record lists.
+
+    Returns
+    -------
+    str
+        Description of the difference.
+    '''
+    if len(expected) != len(actual):
+        return f"{len(actual)} records instead of {len(expected)}"
+    for index, (expected_work, actual_work) in enumerate(zip(expected, actual)):
+        for field, expected_value in expected_work.items():
+            if actual_work.get(field) != expected_value:
+                return f"record {index} field {field!r}: {actual_work.get(field)!r} != {expected_value!r}"
+    return "records differ"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20, help="number of synthetic pages")
+    parser.add_argument("--html-dir", type=Path, help="directory of recorded listing pages (*.html)")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repetitions per backend")
+    args = parser.parse_args()
+
+    pages = _load_pages(args.html_dir, args.pages)
+    reference_parser = BeautifulSoupListingParser()
+    expected = [reference_parser.extract(html) for _, html in pages]
+
+    timings = {}
+    for name, parser_class in LISTING_PARSERS.items():
+        try:
+            backend = parser_class()
+        except ImportError as e:
+            print(f"skipping {name}: {e}")
+            continue
+
+        for (page_name, html), expected_records in zip(pages, expected):
+            records = backend.extract(html)
+            if records != expected_records:
+                sys.exit(f"{name} differs from the reference on {page_name}: {_find_mismatch(expected_records, records)}")
+
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = perf_counter()
+            for _, html in pages:
+                backend.extract(html)
+            best = min(best, perf_counter() - start)
+        timings[name] = best / len(pages)
+
+    print(f"All backends match the reference on {len(pages)} pages ({sum(map(len, expected))} records).")
+    print(f"{'backend':<10}{'ms/page':>10}{'speedup':>10}")
+    for name, seconds in timings.items():
+        print(f"{name:<10}{seconds * 1000:>10.2f}{timings['bs4'] / seconds:>10.2f}")
+
+if __name__ == "__main__":
+    main()
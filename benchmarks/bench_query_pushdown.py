@@ -0,0 +1,80 @@
+'''
+Benchmark query_voice_works (SQL pushdown) against loading the view and filtering in pandas.
+
+For each analysis below, the pandas variant loads every voice work with
+get_all_voice_works and filters, sorts and slices the DataFrame, as the wordcloud
+notebook did; the pushdown variant asks SQLite for just the rows and columns it
+needs. Both must return the same rows.
+
+Usage
+-----
+python -m benchmarks.bench_query_pushdown [--pages 500]
+'''
+import argparse
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from dlsite_analyzer.database import SQLiteHandler, VoiceWorksBulkImporter, VoiceWorksViewHandler
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from .bench_bulk_import import _create_database
+from tests.fixtures import build_listing_page
+
+# (description, criteria of query_voice_works, equivalent pandas filter on the full frame)
+ANALYSES = [
+    (
+        "titles of R-15 works",
+        {"columns": ["title"], "age": "R-15"},
+        lambda df: df.loc[df["age"] == "R-15", ["title"]],
+    ),
+    (
+        "top 100 by sales",
+        {"columns": ["id", "title", "sales_count"], "order_by": "sales_count", "limit": 100},
+        lambda df: df.sort_values(["sales_count", "id"], ascending=[False, True])[["id", "title", "sales_count"]].head(100),
+    ),
+    (
+        "cheap best sellers",
+        {"columns": ["id", "price", "sales_count"], "price_range": (None, 500), "sales_range": (40000, None)},
+        lambda df: df.loc[(df["price"] <= 500) & (df["sales_count"] >= 40000), ["id", "price", "sales_count"]],
+    ),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500, help="number of synthetic pages")
+    args = parser.parse_args()
+
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in range(1, args.pages + 1) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "pushdown.db"
+        _create_database(db_path)
+        with SQLiteHandler(db_path) as db_connection, VoiceWorksBulkImporter(db_connection) as importer:
+            importer.add_many(works)
+
+        print(f"{len(works)} voice works")
+        print(f"{'analysis':<24}{'rows':>8}{'pandas ms':>12}{'pushdown ms':>13}{'speedup':>9}")
+        with SQLiteHandler(db_path) as db_connection:
+            view_handler = VoiceWorksViewHandler(db_connection)
+            for description, criteria, pandas_filter in ANALYSES:
+                start = perf_counter()
+                expected = pandas_filter(view_handler.get_all_voice_works())
+                pandas_seconds = perf_counter() - start
+
+                start = perf_counter()
+                result = view_handler.query_voice_works(**criteria)
+                pushdown_seconds = perf_counter() - start
+
+                key = list(result.columns)
+                if result.sort_values(key).astype(object).values.tolist() != expected.sort_values(key).astype(object).values.tolist():
+                    raise AssertionError(f"{description}: pushdown returned different rows.")
+                print(
+                    f"{description:<24}{len(result):>8}{pandas_seconds * 1000:>12.1f}"
+                    f"{pushdown_seconds * 1000:>13.1f}{pandas_seconds / pushdown_seconds:>9.1f}"
+                )
+
+if __name__ == "__main__":
+    main()
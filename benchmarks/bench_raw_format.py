@@ -0,0 +1,78 @@
+'''
+Compare the legacy per-page JSON files with the compressed NDJSON record file.
+
+Synthetic listing pages are parsed once, then written in both formats. The
+report shows the bytes on disk and the time to write and stream every record back.
+The records read from the NDJSON file are checked against the parsed records.
+
+Usage
+-----
+python -m benchmarks.bench_raw_format [--pages 200]
+'''
+import argparse
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from dlsite_analyzer.scraper import VoiceWorkScraper
+from dlsite_analyzer.utils import NDJSONWriter, iter_ndjson, load_json, save_json
+
+from tests.fixtures import build_listing_page
+
+def _directory_size(directory: Path) -> int:
+    '''
+    Sum the sizes of the files in a directory.
+    '''
+    return sum(path.stat().st_size for path in directory.iterdir())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200, help="number of synthetic pages")
+    args = parser.parse_args()
+
+    scraper = VoiceWorkScraper(parser="stream")
+    pages = [scraper.extract_voice_work_data(build_listing_page(page)) for page in range(1, args.pages + 1)]
+    scraper.close()
+    n_records = sum(len(voice_works) for voice_works in pages)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_dir = Path(tmp_dir) / "json"
+        ndjson_dir = Path(tmp_dir) / "ndjson"
+        json_dir.mkdir()
+        ndjson_dir.mkdir()
+
+        start = perf_counter()
+        for page, voice_works in enumerate(pages, start=1):
+            save_json(voice_works, json_dir / f"voice_works_page_{page}.json")
+        json_write = perf_counter() - start
+
+        start = perf_counter()
+        json_count = sum(len(load_json(path)) for path in sorted(json_dir.glob("*.json")))
+        json_read = perf_counter() - start
+
+        records_path = ndjson_dir / "voice_works.ndjson.gz"
+        start = perf_counter()
+        with NDJSONWriter(records_path) as writer:
+            for voice_works in pages:
+                writer.write_many(voice_works)
+        ndjson_write = perf_counter() - start
+
+        start = perf_counter()
+        ndjson_count = sum(1 for _ in iter_ndjson(records_path))
+        ndjson_read = perf_counter() - start
+
+        ndjson_records = list(iter_ndjson(records_path))
+        if json_count != n_records or ndjson_count != n_records or ndjson_records != [work for voice_works in pages for work in voice_works]:
+            raise AssertionError("Records read back differ from the records written.")
+
+        json_size = _directory_size(json_dir)
+        ndjson_size = _directory_size(ndjson_dir)
+
+    print(f"{args.pages} pages, {n_records} records")
+    print(f"{'format':<14}{'bytes':>12}{'write s':>10}{'read s':>10}{'records/s':>12}")
+    print(f"{'json':<14}{json_size:>12}{json_write:>10.3f}{json_read:>10.3f}{n_records / json_read:>12.0f}")
+    print(f"{'ndjson.gz':<14}{ndjson_size:>12}{ndjson_write:>10.3f}{ndjson_read:>10.3f}{n_records / ndjson_read:>12.0f}")
+    print(f"size ratio: {json_size / ndjson_size:.1f}x smaller")
+
+if __name__ == "__main__":
+    main()
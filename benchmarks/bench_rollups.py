@@ -0,0 +1,126 @@
+'''
+Benchmark the rollup tables against aggregating the voice works in pandas.
+
+Synthetic voice works are imported into two fresh databases, one with the rollup
+triggers dropped, to measure their cost on the import. A refresh pass then changes
+sales counts and prices, moves works to other circles, adds works and deletes a few;
+afterwards every rollup table must hold exactly what a full rebuild computes. Finally
+the top circles by sales are read with get_top and with a pandas groupby over the
+whole catalog, and both must name the same circles with the same totals.
+
+Usage
+-----
+python -m benchmarks.bench_rollups [--pages 200] [--reads 20]
+'''
+import argparse
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from dlsite_analyzer.database import (
+    SQLiteHandler,
+    VoiceWorksBulkImporter,
+    VoiceWorksViewHandler,
+    VoiceWorkRollupsTableHandler,
+)
+from dlsite_analyzer.database.constants import CIRCLE_ROLLUPS_TABLE, ROLLUP_SALES_COUNT_SUM
+from dlsite_analyzer.database.table_managers.voice_work_rollups import ROLLUP_DIMENSIONS
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from .bench_bulk_import import _create_database
+from tests.fixtures import build_listing_page
+
+def _drop_rollup_triggers(db_path: Path) -> None:
+    '''
+    Drop the triggers of every rollup table, leaving the tables as they are.
+    '''
+    with SQLiteHandler(db_path) as db_connection:
+        for table_name in ROLLUP_DIMENSIONS:
+            query = "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?"
+            for (trigger_name,) in db_connection.execute_query(query, (f"trg_{table_name}_%",)).fetchall():
+                db_connection.execute_query(f"DROP TRIGGER {trigger_name}")
+        db_connection.commit()
+
+def _timed_import(db_path: Path, works: list) -> float:
+    '''
+    Import the works with VoiceWorksBulkImporter and return the elapsed seconds.
+    '''
+    start = perf_counter()
+    with SQLiteHandler(db_path) as db_connection, VoiceWorksBulkImporter(db_connection) as importer:
+        importer.add_many(works)
+    return perf_counter() - start
+
+def _check_against_rebuild(db_path: Path) -> None:
+    '''
+    Check that every rollup table holds the same rows as a rebuild from the voice works.
+    '''
+    with SQLiteHandler(db_path) as db_connection:
+        for table_name in ROLLUP_DIMENSIONS:
+            query = f"SELECT * FROM {table_name} ORDER BY group_id"
+            incremental = db_connection.execute_query(query).fetchall()
+            VoiceWorkRollupsTableHandler(db_connection, table_name).rebuild()
+            if db_connection.execute_query(query).fetchall() != incremental:
+                raise AssertionError(f"{table_name} is out of sync with the voice works.")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200, help="number of synthetic pages")
+    parser.add_argument("--reads", type=int, default=20, help="top-K reads per variant")
+    args = parser.parse_args()
+
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in range(1, args.pages + 1) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+    initial_works = works[:len(works) * 9 // 10]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        plain_db_path = Path(tmp_dir) / "plain.db"
+        rollups_db_path = Path(tmp_dir) / "rollups.db"
+        _create_database(plain_db_path)
+        _drop_rollup_triggers(plain_db_path)
+        _create_database(rollups_db_path)
+
+        plain_import_seconds = _timed_import(plain_db_path, initial_works)
+        rollups_import_seconds = _timed_import(rollups_db_path, initial_works)
+        _check_against_rebuild(rollups_db_path)
+
+        rng = random.Random(0)
+        refreshed_works = [dict(work) for work in works]
+        for work in rng.sample(refreshed_works, len(refreshed_works) // 20):
+            work["sales_count"] = rng.choice([0, work["sales_count"] // 2, work["sales_count"] * 3])
+        for work in rng.sample(refreshed_works, len(refreshed_works) // 50):
+            work["price"] = rng.choice([110, 550, 2200])
+        makers = sorted({(work["maker_id"], work["maker"]) for work in refreshed_works})
+        for work in rng.sample(refreshed_works, len(refreshed_works) // 100):
+            work["maker_id"], work["maker"] = rng.choice(makers)
+        refresh_seconds = _timed_import(rollups_db_path, refreshed_works)
+        with SQLiteHandler(rollups_db_path) as db_connection:
+            deleted = [(work["product_id"],) for work in rng.sample(refreshed_works, 50)]
+            db_connection.executemany_query("DELETE FROM voice_works WHERE id = ?", deleted)
+        _check_against_rebuild(rollups_db_path)
+
+        with SQLiteHandler(rollups_db_path) as db_connection:
+            rollups_handler = VoiceWorkRollupsTableHandler(db_connection, CIRCLE_ROLLUPS_TABLE)
+            start = perf_counter()
+            for _ in range(args.reads):
+                top = rollups_handler.get_top(ROLLUP_SALES_COUNT_SUM, k=10)
+            rollups_seconds = (perf_counter() - start) / args.reads
+
+            view_handler = VoiceWorksViewHandler(db_connection)
+            start = perf_counter()
+            for _ in range(args.reads):
+                sales = view_handler.get_all_voice_works().groupby("circle", observed=True)["sales_count"].sum()
+                expected = sales.sort_values(ascending=False).head(10)
+            pandas_seconds = (perf_counter() - start) / args.reads
+
+    if top["name"].tolist() != expected.index.tolist() or top[ROLLUP_SALES_COUNT_SUM].tolist() != expected.tolist():
+        raise AssertionError("get_top returned different circles than the pandas groupby.")
+
+    print(f"{len(initial_works)} voice works imported, refresh of {len(works)} works in {refresh_seconds:.2f}s")
+    print(f"import without rollups: {plain_import_seconds:.2f}s, with rollups: {rollups_import_seconds:.2f}s")
+    print(f"top 10 circles by sales: pandas {pandas_seconds * 1000:.1f}ms, rollups {rollups_seconds * 1000:.2f}ms")
+    print(f"speedup: {pandas_seconds / rollups_seconds:.0f}x")
+
+if __name__ == "__main__":
+    main()
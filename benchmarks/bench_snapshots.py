@@ -0,0 +1,99 @@
+'''
+Benchmark the delta-encoded voice_work_snapshots store and its range queries.
+
+Synthetic crawls are recorded for --products products over --runs crawl runs, where
+each run changes the sales of --change-rate of the products. The report shows how
+many rows the delta encoding kept, the query plan of get_sales_gained, and its
+latency for adjacent runs and for the whole range. Each result is checked against
+a brute-force computation over the full history.
+
+Usage
+-----
+python -m benchmarks.bench_snapshots [--products 200000] [--runs 20] [--change-rate 0.2]
+'''
+import argparse
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from dlsite_analyzer import DatabaseInitializer
+from dlsite_analyzer.database import SQLiteHandler, VoiceWorkSnapshotsTableHandler
+
+def _record_runs(snapshots: VoiceWorkSnapshotsTableHandler, db_connection: SQLiteHandler, args) -> list:
+    '''
+    Record the synthetic crawls and return the full (undeduplicated) sales history per run.
+    '''
+    rng = random.Random(0)
+    sales = [rng.randint(0, 5000) for _ in range(args.products)]
+    history = []
+    for run_id in range(1, args.runs + 1):
+        if run_id > 1:
+            for index in rng.sample(range(args.products), int(args.products * args.change_rate)):
+                sales[index] += rng.randint(1, 50)
+        snapshots.record_snapshots([
+            {
+                "product_id": f"RJ{index:08d}",
+                "crawl_run_id": run_id,
+                "sales_count": sales[index],
+                "review_count": 0,
+                "price": 1100,
+                "points": 100,
+            }
+            for index in range(args.products)
+        ])
+        db_connection.commit()
+        history.append(list(sales))
+    return history
+
+def _expected_gains(history: list, start_run: int, end_run: int) -> dict:
+    '''
+    Compute the sales gained per product directly from the full history.
+    '''
+    start, end = history[start_run - 1], history[end_run - 1]
+    return {f"RJ{index:08d}": end[index] - start[index] for index in range(len(start)) if end[index] != start[index]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=200000, help="number of products")
+    parser.add_argument("--runs", type=int, default=20, help="number of crawl runs")
+    parser.add_argument("--change-rate", type=float, default=0.2, help="share of products whose sales change per run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "snapshots.db"
+        initializer = DatabaseInitializer(db_path)
+        initializer.initialize()
+        initializer.db_connection.close()
+
+        with SQLiteHandler(db_path) as db_connection:
+            snapshots = VoiceWorkSnapshotsTableHandler(db_connection)
+            start = perf_counter()
+            history = _record_runs(snapshots, db_connection, args)
+            record_seconds = perf_counter() - start
+            n_rows = db_connection.execute_query(f"SELECT COUNT(*) FROM {snapshots.table_name}").fetchone()[0]
+
+            print(f"{args.products} products x {args.runs} runs, {args.change_rate:.0%} change per run")
+            print(f"snapshot rows: {n_rows} (undeduplicated {args.products * args.runs}), recorded in {record_seconds:.1f}s")
+
+            plan = db_connection.execute_query(
+                "EXPLAIN QUERY PLAN SELECT DISTINCT product_id FROM voice_work_snapshots WHERE crawl_run_id > ? AND crawl_run_id <= ?",
+                (1, 2),
+            ).fetchall()
+            print("changed-product scan:", "; ".join(row[3] for row in plan))
+
+            print(f"{'range':<12}{'products':>10}{'ms':>10}")
+            for start_run, end_run in [(args.runs - 1, args.runs), (1, 2), (1, args.runs)]:
+                start = perf_counter()
+                gains = snapshots.get_sales_gained(start_run, end_run)
+                milliseconds = (perf_counter() - start) * 1000
+                if dict(zip(gains["product_id"], gains["sales_gained"])) != _expected_gains(history, start_run, end_run):
+                    raise AssertionError(f"Sales gained between runs {start_run} and {end_run} is wrong.")
+                print(f"{f'{start_run}->{end_run}':<12}{len(gains):>10}{milliseconds:>10.1f}")
+
+            start = perf_counter()
+            snapshots.get_sales_gained(1, args.runs, limit=10)
+            print(f"top 10 over the whole range: {(perf_counter() - start) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
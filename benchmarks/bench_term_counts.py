@@ -0,0 +1,157 @@
+'''
+Benchmark the term count tables against tokenizing every title for the wordcloud.
+
+Synthetic voice works are imported into two fresh databases, one with `index_terms`
+disabled, to measure the cost of the token cache and term counts on the import. A
+refresh pass then retitles some works, moves others to another circle or age rating
+and changes sales counts; only the retitled works may be sent to MeCab. After a few
+works are deleted and the counts are synced, the word counts of every age rating and
+of all works must equal tokenizing the titles from scratch, and reading them from the
+table is timed against that full tokenization.
+
+Usage
+-----
+python -m benchmarks.bench_term_counts [--pages 100] [--reads 5]
+'''
+import argparse
+import random
+import tempfile
+from itertools import chain
+from pathlib import Path
+from time import perf_counter
+
+import pandas as pd
+
+from dlsite_analyzer.config import MECAB_NEOLOGD_PATH, MECAB_USER_DIC_PATH
+from dlsite_analyzer.database import (
+    SQLiteHandler,
+    VoiceWorksBulkImporter,
+    VoiceWorksViewHandler,
+    VoiceWorkTermIndexer,
+    TermCountsTableHandler,
+)
+from dlsite_analyzer.database.constants import (
+    AGE_RATING_TERM_COUNTS_TABLE,
+    VOICE_WORKS_TITLE,
+    VOICE_WORKS_VIEW_AGE,
+)
+from dlsite_analyzer.scraper import VoiceWorkScraper
+from dlsite_analyzer.text import DEFAULT_TARGET_POS, MeCabTokenizer
+
+from .bench_bulk_import import _create_database
+from tests.fixtures import build_listing_page
+
+STOP_WORDS = ['さ', 'し', 'せ', 'れ']
+
+NEW_TITLE_WORDS = ["お姉さん", "幼なじみ", "メイド", "囁き", "睡眠導入", "ダミーヘッド", "甘々", "おやすみ"]
+
+def _timed_import(db_path: Path, works: list, index_terms: bool=True) -> tuple[float, int]:
+    '''
+    Import the works and return the elapsed seconds and the number of titles sent to MeCab.
+    '''
+    start = perf_counter()
+    with SQLiteHandler(db_path) as db_connection, VoiceWorksBulkImporter(db_connection, index_terms=index_terms) as importer:
+        importer.add_many(works)
+    return perf_counter() - start, importer._term_indexer.tokenized if index_terms else 0
+
+def _expected_counts(tokenizer: MeCabTokenizer, titles: list) -> pd.Series:
+    '''
+    Count the words of the titles from scratch, as the wordcloud notebook used to.
+    '''
+    return pd.Series(list(chain.from_iterable(tokenizer.tokenize_many(titles))), dtype=object).value_counts()
+
+def _check_counts(db_path: Path, tokenizer: MeCabTokenizer) -> None:
+    '''
+    Check the word counts of every age rating and of all works against a full tokenization.
+    '''
+    with SQLiteHandler(db_path) as db_connection:
+        works = VoiceWorksViewHandler(db_connection).query_voice_works(columns=[VOICE_WORKS_TITLE, VOICE_WORKS_VIEW_AGE])
+        term_counts = TermCountsTableHandler(db_connection, AGE_RATING_TERM_COUNTS_TABLE)
+        groups = {None: works} | {age: group for age, group in works.groupby(VOICE_WORKS_VIEW_AGE, observed=True)}
+        for age, group in groups.items():
+            expected = _expected_counts(tokenizer, list(group[VOICE_WORKS_TITLE]))
+            actual = term_counts.get_term_counts(
+                names=None if age is None else [age], target_pos=DEFAULT_TARGET_POS, stop_words=STOP_WORDS,
+            )
+            if actual.to_dict() != expected.to_dict():
+                raise AssertionError(f"The term counts of {age or 'all works'} differ from tokenizing the titles.")
+            if actual.tolist() != sorted(actual.tolist(), reverse=True):
+                raise AssertionError("get_term_counts did not return the most frequent terms first.")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100, help="number of synthetic pages")
+    parser.add_argument("--reads", type=int, default=5, help="word count reads per variant")
+    args = parser.parse_args()
+
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in range(1, args.pages + 1) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+    rng = random.Random(0)
+    for work in works:
+        work["title"] = f"{work['title']} {''.join(rng.sample(NEW_TITLE_WORDS, 2))}"
+    initial_works = works[:len(works) * 9 // 10]
+    dic_path = MECAB_NEOLOGD_PATH if MECAB_NEOLOGD_PATH.exists() else None
+    tokenizer = MeCabTokenizer(stop_words=STOP_WORDS, dic_path=dic_path, user_dic_path=MECAB_USER_DIC_PATH)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        plain_db_path = Path(tmp_dir) / "plain.db"
+        terms_db_path = Path(tmp_dir) / "terms.db"
+        _create_database(plain_db_path)
+        _create_database(terms_db_path)
+
+        plain_import_seconds, _ = _timed_import(plain_db_path, initial_works, index_terms=False)
+        terms_import_seconds, tokenized = _timed_import(terms_db_path, initial_works)
+        if tokenized != len(initial_works):
+            raise AssertionError(f"{tokenized} titles were tokenized on the first import of {len(initial_works)} works.")
+        _check_counts(terms_db_path, tokenizer)
+
+        refreshed_works = [dict(work) for work in works]
+        retitled = rng.sample(refreshed_works[:len(initial_works)], len(initial_works) // 50)
+        for work in retitled:
+            work["title"] = f"{work['title']} {rng.choice(NEW_TITLE_WORDS)}"
+        for work in rng.sample(refreshed_works, len(refreshed_works) // 20):
+            work["sales_count"] = work["sales_count"] * 2 + 1
+        makers = sorted({(work["maker_id"], work["maker"]) for work in refreshed_works})
+        for work in rng.sample(refreshed_works, len(refreshed_works) // 50):
+            work["maker_id"], work["maker"] = rng.choice(makers)
+        for work in rng.sample(refreshed_works, len(refreshed_works) // 50):
+            work["age_rating"] = rng.choice(["全年齢", "R-15", "R-18"])
+        refresh_seconds, tokenized = _timed_import(terms_db_path, refreshed_works)
+        expected_tokenized = len(retitled) + len(works) - len(initial_works)
+        if tokenized != expected_tokenized:
+            raise AssertionError(f"{tokenized} titles were tokenized on the refresh, expected {expected_tokenized}.")
+        _check_counts(terms_db_path, tokenizer)
+
+        with SQLiteHandler(terms_db_path) as db_connection:
+            deleted = [(work["product_id"],) for work in rng.sample(refreshed_works, 50)]
+            db_connection.executemany_query("DELETE FROM voice_works WHERE id = ?", deleted)
+            db_connection.commit()
+            indexer = VoiceWorkTermIndexer(db_connection, tokenizer=tokenizer)
+            indexer.sync()
+            if indexer.tokenized:
+                raise AssertionError(f"Syncing after deletes tokenized {indexer.tokenized} titles.")
+        _check_counts(terms_db_path, tokenizer)
+
+        with SQLiteHandler(terms_db_path) as db_connection:
+            term_counts = TermCountsTableHandler(db_connection, AGE_RATING_TERM_COUNTS_TABLE)
+            start = perf_counter()
+            for _ in range(args.reads):
+                term_counts.get_term_counts(target_pos=DEFAULT_TARGET_POS, stop_words=STOP_WORDS)
+            table_seconds = (perf_counter() - start) / args.reads
+
+            view_handler = VoiceWorksViewHandler(db_connection)
+            start = perf_counter()
+            for _ in range(args.reads):
+                titles = view_handler.query_voice_works(columns=[VOICE_WORKS_TITLE])[VOICE_WORKS_TITLE]
+                _expected_counts(tokenizer, list(titles))
+            tokenize_seconds = (perf_counter() - start) / args.reads
+
+    print(f"{len(initial_works)} voice works imported, dictionary: {dic_path or 'MeCab default'}")
+    print(f"import without term counts: {plain_import_seconds:.2f}s, with term counts: {terms_import_seconds:.2f}s")
+    print(f"refresh of {len(works)} works in {refresh_seconds:.2f}s, {tokenized} titles tokenized")
+    print(f"word counts of all works: tokenizing {tokenize_seconds * 1000:.1f}ms, term counts {table_seconds * 1000:.2f}ms")
+    print(f"speedup: {tokenize_seconds / table_seconds:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+'''
+Benchmark grouped word counts from a document-term matrix against re-tokenizing each group.
+
+The wordcloud notebook used to tokenize every title for the counts of all works and
+then again for each age rating, building a word list and a `value_counts` per call.
+DocumentTermMatrix tokenizes the titles once; the counts of all works and of each age
+rating, circle, voice actor and product format then come from sparse products with
+the group membership. Both must return the same counts. Titles and groups are
+synthetic; the NEologd dictionary is used if it is installed, otherwise MeCab's
+default dictionary.
+
+Usage
+-----
+python -m benchmarks.bench_term_matrix [--titles 20000]
+'''
+import argparse
+import random
+from itertools import chain
+from time import perf_counter
+
+import pandas as pd
+
+from dlsite_analyzer.config import MECAB_NEOLOGD_PATH, MECAB_USER_DIC_PATH
+from dlsite_analyzer.text import DocumentTermMatrix, MeCabTokenizer
+
+from .bench_tokenizer import STOP_WORDS, WORDS
+
+GROUP_COLUMNS = {
+    "age": ["全年齢", "R-15", "R-18"],
+    "circle": [f"サークル{index}" for index in range(500)],
+    "voice_actor": [f"声優{index}" for index in range(97)],
+    "product_format": ["ボイス・ASMR", "音楽", "動画"],
+}
+
+def _count_words(tokenizer: MeCabTokenizer, titles: list) -> pd.Series:
+    '''
+    Tokenize the titles and count the words, as the wordcloud notebook used to.
+    '''
+    return pd.Series(list(chain.from_iterable(tokenizer.tokenize_many(titles))), dtype=object).value_counts()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=20000, help="number of synthetic titles")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    works = pd.DataFrame({
+        "title": [f"{''.join(rng.sample(WORDS, 6))} {index}" for index in range(args.titles)],
+        **{column: [rng.choice(values) for _ in range(args.titles)] for column, values in GROUP_COLUMNS.items()},
+    })
+    dic_path = MECAB_NEOLOGD_PATH if MECAB_NEOLOGD_PATH.exists() else None
+    tokenizer = MeCabTokenizer(stop_words=STOP_WORDS, dic_path=dic_path, user_dic_path=MECAB_USER_DIC_PATH)
+
+    start = perf_counter()
+    expected = {"all": _count_words(tokenizer, list(works["title"]))}
+    for age, group in works.groupby("age"):
+        expected[age] = _count_words(tokenizer, list(group["title"]))
+    notebook_seconds = perf_counter() - start
+
+    start = perf_counter()
+    term_matrix = DocumentTermMatrix.from_texts(works["title"], max_workers=1, stop_words=STOP_WORDS, dic_path=dic_path)
+    build_seconds = perf_counter() - start
+    start = perf_counter()
+    counts = {"all": term_matrix.term_counts(), **term_matrix.group_counts(works["age"])}
+    age_seconds = perf_counter() - start
+
+    for key, word_count in expected.items():
+        if counts[key].to_dict() != word_count.to_dict():
+            raise AssertionError(f"The word counts of {key} differ from the notebook.")
+
+    print(f"{len(works)} titles, {len(term_matrix.vocabulary)} terms, dictionary: {dic_path or 'MeCab default'}")
+    print(f"notebook (all works and each age rating): {notebook_seconds:.2f}s")
+    print(f"term matrix: build {build_seconds:.2f}s, all works and each age rating {age_seconds * 1000:.1f}ms")
+    print(f"speedup: {notebook_seconds / (build_seconds + age_seconds):.2f}x")
+    for column in GROUP_COLUMNS:
+        start = perf_counter()
+        group_counts = term_matrix.group_counts(works[column])
+        counts_seconds = perf_counter() - start
+        start = perf_counter()
+        term_matrix.group_tfidf(works[column])
+        tfidf_seconds = perf_counter() - start
+        sample = rng.choice(sorted(group_counts))
+        if group_counts[sample].to_dict() != _count_words(tokenizer, list(works.loc[works[column] == sample, "title"])).to_dict():
+            raise AssertionError(f"The word counts of {sample} differ from tokenizing its titles.")
+        print(f"{column:<15}{len(group_counts):>5} groups: counts {counts_seconds * 1000:.1f}ms, TF-IDF {tfidf_seconds * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
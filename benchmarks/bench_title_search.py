@@ -0,0 +1,98 @@
+'''
+Benchmark the full-text title search against scanning the titles in pandas.
+
+Synthetic voice works get titles drawn from a small vocabulary and are imported into a
+fresh database, whose title search index the importer fills batch by batch. Each keyword is then
+searched with VoiceWorksViewHandler.search_titles and with str.contains over all titles
+loaded by get_all_voice_works, as the notebooks did. With the trigram fallback both must
+find the same works; with MeCab, the index matches whole words and may find fewer.
+
+Usage
+-----
+python -m benchmarks.bench_title_search [--pages 500] [--searches 20]
+'''
+import argparse
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from dlsite_analyzer.database import (
+    SQLiteHandler,
+    VoiceWorksBulkImporter,
+    VoiceWorksTitleSearchTableHandler,
+    VoiceWorksViewHandler,
+)
+from dlsite_analyzer.database.title_search import TRIGRAM_TOKENIZER
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from .bench_bulk_import import _create_database
+from tests.fixtures import build_listing_page
+
+WORDS = [
+    "【ASMR】", "癒やし", "耳かき", "添い寝", "囁き", "バイノーラル", "ダミーヘッド", "お姉さん",
+    "幼なじみ", "メイド", "耳舐め", "睡眠導入", "ＫＵＲＯＮＥＫＯ", "おやすみ", "甘々", "耳ふー",
+]
+
+KEYWORDS = ["耳かき", "ASMR", "添い寝 お姉さん", "kuroneko", "耳", "メイド 甘々"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500, help="number of synthetic pages")
+    parser.add_argument("--searches", type=int, default=20, help="repetitions of each search")
+    args = parser.parse_args()
+
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in range(1, args.pages + 1) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+    rng = random.Random(0)
+    for index, work in enumerate(works):
+        work["title"] = f"{''.join(rng.sample(WORDS, 4))} {index}"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "search.db"
+        _create_database(db_path)
+        start = perf_counter()
+        with SQLiteHandler(db_path) as db_connection, VoiceWorksBulkImporter(db_connection) as importer:
+            importer.add_many(works)
+        import_seconds = perf_counter() - start
+
+        with SQLiteHandler(db_path) as db_connection:
+            view_handler = VoiceWorksViewHandler(db_connection)
+            tokenizer = VoiceWorksTitleSearchTableHandler(db_connection).get_tokenizer()
+            print(f"{len(works)} voice works imported in {import_seconds:.2f}s, tokenizer: {tokenizer}")
+            print(f"{'keywords':<20}{'hits':>7}{'pandas ms':>11}{'fts ms':>9}{'top 100 ms':>12}{'speedup':>9}")
+            for keywords in KEYWORDS:
+                start = perf_counter()
+                for _ in range(args.searches):
+                    titles = view_handler.get_all_voice_works()[["id", "title"]]
+                    normalized = titles["title"].str.normalize("NFKC").str.lower()
+                    found = normalized.str.contains(keywords.split()[0].lower(), regex=False)
+                    for keyword in keywords.split()[1:]:
+                        found &= normalized.str.contains(keyword.lower(), regex=False)
+                    expected = set(titles.loc[found, "id"])
+                pandas_seconds = (perf_counter() - start) / args.searches
+
+                start = perf_counter()
+                for _ in range(args.searches):
+                    product_ids = view_handler.search_titles(keywords, limit=None)
+                search_seconds = (perf_counter() - start) / args.searches
+
+                start = perf_counter()
+                for _ in range(args.searches):
+                    top_ids = view_handler.search_titles(keywords, limit=100)
+                top_seconds = (perf_counter() - start) / args.searches
+
+                if tokenizer == TRIGRAM_TOKENIZER and set(product_ids) != expected:
+                    raise AssertionError(f"{keywords}: the index found different works than str.contains.")
+                if not set(product_ids) <= expected:
+                    raise AssertionError(f"{keywords}: the index found works whose title does not contain the keywords.")
+                if top_ids != product_ids[:100]:
+                    raise AssertionError(f"{keywords}: the limited search is not a prefix of the full ranking.")
+                print(
+                    f"{keywords:<20}{len(product_ids):>7}{pandas_seconds * 1000:>11.1f}"
+                    f"{search_seconds * 1000:>9.2f}{top_seconds * 1000:>12.2f}{pandas_seconds / search_seconds:>9.0f}"
+                )
+
+if __name__ == "__main__":
+    main()
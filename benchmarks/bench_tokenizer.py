@@ -0,0 +1,85 @@
+'''
+Benchmark the batch MeCab tokenizer against the per-title tokenizer of the wordcloud notebook.
+
+The notebook normalized each title with NFKC and two re.sub calls and walked the nodes
+splitting every feature string. MeCabTokenizer translates the brackets with one table
+and only reads the part of speech; tokenize_in_parallel shards the titles across
+worker processes with one Tagger each. Every variant must return the same tokens.
+Titles are synthetic unless --titles-file (one title per line) is given. The NEologd
+dictionary is used if it is installed, otherwise MeCab's default dictionary.
+
+Usage
+-----
+python -m benchmarks.bench_tokenizer [--titles 50000] [--titles-file FILE] [--workers 1 2 4]
+'''
+import argparse
+import os
+import random
+import re
+import unicodedata
+from pathlib import Path
+from time import perf_counter
+
+from dlsite_analyzer.config import MECAB_NEOLOGD_PATH, MECAB_USER_DIC_PATH
+from dlsite_analyzer.text import DEFAULT_TARGET_POS, create_tagger, tokenize_in_parallel
+
+STOP_WORDS = ['さ', 'し', 'せ', 'れ']
+
+WORDS = [
+    "【ASMR】", "癒やし", "の", "耳かき", "と", "添い寝", "囁き", "（バイノーラル）", "ダミーヘッド", "お姉さん",
+    "幼なじみ", "が", "メイド", "さんに", "甘やかされる", "『睡眠導入』", "ＫＵＲＯＮＥＫＯ", "おやすみ", "甘々",
+    "［CV:", "山田花子］", "～特典付き～", "優しく", "されちゃう", "「お帰りなさい」", "24時間",
+]
+
+def _notebook_tokenize(text: str, mecab, target_pos: list, stop_words: list) -> list:
+    '''
+    The tokenizer of the wordcloud notebook, kept as the baseline.
+    '''
+    text = unicodedata.normalize("NFKC", text).upper()
+    text = re.sub(r'[【】()（）『』「」]', '', text)
+    text = re.sub(r'[\[\]［］]', ' ', text)
+    node = mecab.parseToNode(text)
+    token_list = []
+    while node:
+        features = node.feature.split(',')
+        if features[0] in target_pos and node.surface not in stop_words:
+            token_list.append(node.surface)
+        node = node.next
+    return token_list
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, 8, cpu_count} & set(range(1, cpu_count + 1)))
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--titles", type=int, default=50000, help="number of synthetic titles")
+    parser.add_argument("--titles-file", type=Path, help="file of titles, one per line")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers, help="worker counts to benchmark")
+    args = parser.parse_args()
+
+    if args.titles_file:
+        titles = args.titles_file.read_text(encoding="UTF-8").splitlines()
+    else:
+        rng = random.Random(0)
+        titles = [f"{''.join(rng.sample(WORDS, 6))} {index}" for index in range(args.titles)]
+    dic_path = MECAB_NEOLOGD_PATH if MECAB_NEOLOGD_PATH.exists() else None
+
+    tagger = create_tagger(dic_path, MECAB_USER_DIC_PATH)
+    target_pos = list(DEFAULT_TARGET_POS)
+    start = perf_counter()
+    expected = [_notebook_tokenize(title, tagger, target_pos, STOP_WORDS) for title in titles]
+    notebook_seconds = perf_counter() - start
+
+    print(f"{len(titles)} titles, {cpu_count} CPU cores, dictionary: {dic_path or 'MeCab default'}")
+    print(f"{'mode':<12}{'seconds':>10}{'titles/s':>12}{'speedup':>10}")
+    print(f"{'notebook':<12}{notebook_seconds:>10.2f}{len(titles) / notebook_seconds:>12.0f}{1.0:>10.2f}")
+    for workers in args.workers:
+        start = perf_counter()
+        tokens = tokenize_in_parallel(titles, max_workers=workers, stop_words=STOP_WORDS, dic_path=dic_path)
+        seconds = perf_counter() - start
+        if tokens != expected:
+            raise AssertionError(f"The tokens with {workers} workers differ from the notebook tokenizer.")
+        print(f"{f'{workers} workers':<12}{seconds:>10.2f}{len(titles) / seconds:>12.0f}{notebook_seconds / seconds:>10.2f}")
+
+if __name__ == "__main__":
+    main()
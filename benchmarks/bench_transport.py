@@ -0,0 +1,113 @@
+'''
+Benchmark the per-page latency of a fresh connection per request versus the pooled SessionTransport.
+
+By default a local keep-alive HTTP server serves a synthetic listing page, so the result only
+reflects the TCP handshake. Pass --url to measure against a real HTTPS endpoint, where every
+fresh connection also pays for the TLS handshake.
+
+Usage
+-----
+python -m benchmarks.bench_transport [--requests 50] [--url URL]
+'''
+import argparse
+import statistics
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+
+import requests
+
+from dlsite_analyzer.scraper import SessionTransport
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.5938.132 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Connection": "keep-alive"
+}
+_PAGE_BODY = ("<html><body>" + "<li class='search_result_img_box_inner'>work</li>" * 100 + "</body></html>").encode()
+
+class _ListingHandler(BaseHTTPRequestHandler):
+    '''
+    Serve the same synthetic listing page over HTTP/1.1 keep-alive.
+    '''
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(_PAGE_BODY)))
+        self.end_headers()
+        self.wfile.write(_PAGE_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+def _start_local_server() -> tuple[ThreadingHTTPServer, str]:
+    '''
+    Start the local listing server on a free port.
+
+    Returns
+    -------
+    tuple[ThreadingHTTPServer, str]
+        The running server and its base URL.
+    '''
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ListingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+def _measure(get, url: str, n_requests: int) -> list:
+    '''
+    Measure the latency of each request in milliseconds.
+
+    Parameters
+    ----------
+    get : callable
+        Function sending a GET request for the given URL.
+    url : str
+        URL to request.
+    n_requests : int
+        Number of requests to send.
+
+    Returns
+    -------
+    list
+        Latency of each request in milliseconds.
+    '''
+    latencies = []
+    for _ in range(n_requests):
+        start = perf_counter()
+        response = get(url)
+        response.content
+        latencies.append((perf_counter() - start) * 1000)
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50, help="number of requests per transport")
+    parser.add_argument("--url", help="URL to benchmark instead of the local server")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = _start_local_server()
+
+    transport = SessionTransport()
+    try:
+        results = {
+            "requests.get (new connection)": _measure(lambda u: requests.get(u, headers=_HEADERS, timeout=30), url, args.requests),
+            "SessionTransport (pooled)": _measure(lambda u: transport.get(u, headers=_HEADERS), url, args.requests),
+        }
+    finally:
+        transport.close()
+        if server is not None:
+            server.shutdown()
+
+    print(f"{'transport':<32}{'mean ms':>10}{'median ms':>12}{'p95 ms':>10}")
+    for name, latencies in results.items():
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(f"{name:<32}{statistics.mean(latencies):>10.2f}{statistics.median(latencies):>12.2f}{p95:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+'''
+Benchmark the batch wordcloud renderer against rendering the categories one by one.
+
+The wordcloud notebook laid out and saved every category in turn, even when its word
+counts had not changed. render_wordclouds lays out the clouds in worker processes and
+caches each image under a hash of its word counts, font and size. The benchmark times
+a sequential render, a cold parallel render, a warm render where every category is
+cached, and a render after one category changed, which must lay out only that one.
+Images rendered twice from the same counts must be identical. Word counts are
+synthetic and the font bundled with wordcloud is used unless --font is given.
+
+Usage
+-----
+python -m benchmarks.bench_wordcloud [--categories 8] [--words 2000] [--font FILE] [--workers 4]
+'''
+import argparse
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from wordcloud import WordCloud
+from wordcloud.wordcloud import FONT_PATH
+
+from dlsite_analyzer.text import render_wordclouds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--categories", type=int, default=8, help="number of wordclouds")
+    parser.add_argument("--words", type=int, default=2000, help="distinct words per wordcloud")
+    parser.add_argument("--font", type=Path, default=Path(FONT_PATH), help="font file")
+    parser.add_argument("--workers", type=int, help="worker processes (default is the number of CPU cores)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = [f"word{index}" for index in range(args.words * 2)]
+    frequency_tables = {
+        f"category{category}": {word: rng.randint(1, 500) for word in rng.sample(vocabulary, args.words)}
+        for category in range(args.categories)
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        output_paths = {category: tmp_dir / "out" / f"{category}.png" for category in frequency_tables}
+
+        start = perf_counter()
+        for category, frequencies in frequency_tables.items():
+            wc = WordCloud(background_color='white', font_path=str(args.font), width=900, height=500)
+            wc.generate_from_frequencies(frequencies)
+            wc.to_file(str(tmp_dir / f"sequential_{category}.png"))
+        sequential_seconds = perf_counter() - start
+
+        def timed_render(cache_dir: Path) -> tuple[float, dict]:
+            start = perf_counter()
+            rendered = render_wordclouds(
+                frequency_tables, output_paths, args.font, max_workers=args.workers, cache_dir=cache_dir,
+            )
+            return perf_counter() - start, rendered
+
+        cold_seconds, rendered = timed_render(tmp_dir / "cache")
+        if not all(rendered.values()):
+            raise AssertionError("The cold render used cached images.")
+        images = {category: path.read_bytes() for category, path in output_paths.items()}
+
+        warm_seconds, rendered = timed_render(tmp_dir / "cache")
+        if any(rendered.values()):
+            raise AssertionError("The warm render laid out cached wordclouds again.")
+
+        changed = next(iter(frequency_tables))
+        frequency_tables[changed] = {**frequency_tables[changed], "newword": 1000}
+        changed_seconds, rendered = timed_render(tmp_dir / "cache")
+        if [category for category, was_rendered in rendered.items() if was_rendered] != [changed]:
+            raise AssertionError(f"Only {changed} should be rendered again, got {rendered}.")
+
+        timed_render(tmp_dir / "recache")
+        del images[changed]
+        if any(output_paths[category].read_bytes() != image for category, image in images.items()):
+            raise AssertionError("Rendering the same word counts twice produced different images.")
+
+    print(f"{args.categories} wordclouds of {args.words} words, font: {args.font.name}")
+    print(f"{'mode':<22}{'seconds':>10}{'speedup':>10}")
+    for mode, seconds in (
+        ("sequential", sequential_seconds),
+        ("parallel, cold cache", cold_seconds),
+        ("one category changed", changed_seconds),
+        ("warm cache", warm_seconds),
+    ):
+        print(f"{mode:<22}{seconds:>10.2f}{sequential_seconds / seconds:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,199 +1,494 @@
 import os
 import glob
-from time import sleep
+import json
+import zipfile
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional
 
 from tqdm import tqdm
 
-from .scraper import VoiceWorkScraper
-from .config import DATABASE_PATH, RAW_JSON_DATA_DIR, ARCHIVE_DIR
+from .scraper import (
+    VoiceWorkScraper,
+    ConcurrentPageFetcher,
+    CrawlManifest,
+    CrawlPipeline,
+    DeltaCrawlTracker,
+    SessionTransport,
+    StreamingListingParser,
+)
+from .scraper.crawl_manifest import records_file_name
+from .config import DATABASE_PATH, RAW_JSON_DATA_DIR, ARCHIVE_DIR, CRAWL_MANIFEST_FILENAME
 from .database_initializer import DatabaseInitializer
 from .database import (
     SQLiteHandler,
+    ConnectionManager,
+    VoiceWorksBulkImporter,
+    import_blocks_in_parallel,
+    VoiceWorksViewHandler,
     VoiceWorksTableHandler,
-    CirclesTableHandler,
-    ProductFormatTableHandler,
-    VoiceActorsTableHandler,
-    AgeRatingTableHandler,
-)
-from .database.constants import (
-    VOICE_WORKS_PRIMARY_KEY,
-    VOICE_WORKS_TITLE,
-    VOICE_WORKS_URL,
-    VOICE_WORKS_PRODUCT_FORMAT_ID,
-    VOICE_WORKS_CIRCLE_ID,
-    VOICE_WORKS_VOICE_ACTOR_ID,
-    VOICE_WORKS_PRICE,
-    VOICE_WORKS_POINTS,
-    VOICE_WORKS_SALES_COUNT,
-    VOICE_WORKS_REVIEW_COUNT,
-    VOICE_WORKS_AGE_ID,
-    VOICE_WORKS_FULL_IMAGE_URL,
-    CIRCLE_PRIMARY_KEY,
-    CIRCLE_NAME,
-    PRODUCT_FORMAT_NAME,
-    VOICE_ACTOR_NAME,
-    AGE_RATING_NAME,
+    VoiceWorkRollupsTableHandler,
+    VoiceWorkTermIndexer,
+    VoiceWorksTitleSearchTableHandler,
 )
+from .database.parallel_import import BLOCK_JSON, BLOCK_NDJSON
+from .database.table_managers.crawl_runs import CRAWL_RUN_KEY_FORMAT
+from .database.table_managers.voice_work_rollups import ROLLUP_DIMENSIONS
 from .utils import (
     Logger,
     load_json,
-    save_json,
     archive_and_zip_files,
-    cleanup
+    list_archive_members,
+    cleanup,
+    NDJSON_GZ_SUFFIX,
+    NDJSONWriter,
+    iter_ndjson,
+    iter_ndjson_blocks,
 )
 
 logger = Logger.get_logger(__name__)
 
-def archive_and_cleanup():
+def archive_and_cleanup(force: bool=False):
     '''
     Archives the previously collected tweet JSON files and cleans up the directory.
+
+    Parameters
+    ----------
+    force : bool
+        If True, archive even when the crawl manifest shows an unfinished crawl.
     '''
     if RAW_JSON_DATA_DIR.exists():
+        manifest_path = RAW_JSON_DATA_DIR / CRAWL_MANIFEST_FILENAME
+        if not force and not CrawlManifest(manifest_path).is_complete():
+            logger.warning("The last crawl has not finished. Resume it before archiving, or pass force=True.")
+            return
+
         tweet_file_paths = sorted(glob.iglob(os.path.join(RAW_JSON_DATA_DIR, "*.json")))
+        tweet_file_paths += sorted(glob.iglob(os.path.join(RAW_JSON_DATA_DIR, f"*{NDJSON_GZ_SUFFIX}")))
+        if manifest_path.exists():
+            tweet_file_paths.append(str(manifest_path))
         archive_and_zip_files(tweet_file_paths, output_dir=ARCHIVE_DIR)
         cleanup(RAW_JSON_DATA_DIR)
 
-def fetch_and_save_voice_works(save_dir: Path, max_retries: int=3, retry_delay: float=2.0) -> Optional[None]:
+def fetch_and_save_voice_works(
+    save_dir: Path,
+    max_retries: int=3,
+    retry_delay: float=2.0,
+    max_workers: int=4,
+    requests_per_second: float=0.5,
+    delta: bool=False,
+    overlap_pages: int=1,
+    retry_dead_letters: bool=False,
+    queue_size: int=8,
+    parser: str="bs4",
+) -> Optional[None]:
     '''
-    Fetch voice works data from a website and save each page as a JSON file.
+    Fetch voice works data from a website and append the records to a compressed NDJSON file.
+
+    Pages are fetched concurrently by up to `max_workers` threads, while a shared
+    token bucket keeps the overall request rate at `requests_per_second`.
+    Fetching, parsing and saving run as separate pipeline stages connected by
+    bounded queues, so network waits, parsing and disk writes overlap.
+    Progress is recorded in a crawl manifest inside `save_dir`, so an interrupted
+    crawl resumes with only the missing or failed pages.
+    Each crawl session appends one record per voice work to its own gzip-compressed
+    NDJSON file, which `import_voice_works_to_db` reads back as a stream.
 
     Parameters
     ----------
     save_dir : Path
-        Directory where JSON files will be saved.
+        Directory where the record files will be saved.
     max_retries : int
         Maximum number of retries for failed requests.
     retry_delay : float
         Time in seconds to wait before retrying a failed request.
+    max_workers : int
+        Maximum number of requests kept in flight at the same time.
+    requests_per_second : float
+        Global request rate limit shared by all workers.
+    delta : bool
+        If True, stop crawling once the listing reaches products already stored in the database.
+    overlap_pages : int
+        Number of extra pages fetched after the first page holding only known products (delta mode only).
+    retry_dead_letters : bool
+        If True, only retry the pages of the last crawl that exceeded `max_retries`.
+    queue_size : int
+        Maximum number of pages buffered between the fetch, parse and persist stages.
+    parser : str
+        Listing parser backend ("bs4", "lxml" or "stream"). With "stream", the fetch
+        workers parse each page while its body is downloading instead of waiting for it.
 
     Returns
     -------
     Optional[None]
         Returns None if the process completes successfully.
     '''
-    scraper = VoiceWorkScraper()
-    
-    # Fetch the first page and determine the total number of pages
-    for attempt in range(max_retries):
-        first_page_response = scraper.get_voice_works_response()
-        if first_page_response.status_code == 200:
-            break
-        logger.error(f"Failed to fetch the first page. Retrying ({attempt + 1}/{max_retries})...")
-        sleep(retry_delay)
-    else:
-        logger.error("Exceeded maximum retries for the first page.")
-        return None
+    tracker = DeltaCrawlTracker(_load_known_product_ids(), overlap_pages) if delta else None
+    manifest = CrawlManifest(save_dir / CRAWL_MANIFEST_FILENAME)
 
-    total_pages = scraper.get_total_pages(first_page_response.text)
-    logger.info(f"Total pages to process: {total_pages}")
+    transport = SessionTransport(pool_maxsize=max_workers)
+    scraper = VoiceWorkScraper(requests_per_second=requests_per_second, transport=transport, parser=parser)
+    fetcher = ConcurrentPageFetcher(
+        scraper,
+        max_workers=max_workers,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        on_attempt=manifest.record_attempt,
+        stream=isinstance(scraper.parser, StreamingListingParser),
+    )
+    try:
+        _crawl_voice_works(scraper, fetcher, save_dir, manifest, tracker, retry_dead_letters, queue_size)
+    finally:
+        scraper.close()
+
+def _load_known_product_ids() -> set:
+    '''
+    Load the IDs of the voice works already stored in the database.
 
+    Returns
+    -------
+    set
+        Known product IDs, or an empty set if the database does not exist yet.
+    '''
+    if not DATABASE_PATH.exists():
+        logger.warning("Database not found. Delta crawl falls back to a full crawl.")
+        return set()
+
+    with SQLiteHandler(DATABASE_PATH) as db_connection:
+        known_product_ids = VoiceWorksTableHandler(db_connection).get_all_product_ids()
+    logger.info(f"Loaded {len(known_product_ids)} known product IDs for delta crawl.")
+    return known_product_ids
+
+def _crawl_voice_works(
+    scraper: VoiceWorkScraper,
+    fetcher: ConcurrentPageFetcher,
+    save_dir: Path,
+    manifest: CrawlManifest,
+    tracker: Optional[DeltaCrawlTracker]=None,
+    retry_dead_letters: bool=False,
+    queue_size: int=8,
+) -> None:
+    '''
+    Crawl the listing pages and append the voice works to a compressed NDJSON file.
+
+    Parameters
+    ----------
+    scraper : VoiceWorkScraper
+        Scraper used to parse the pages.
+    fetcher : ConcurrentPageFetcher
+        Fetcher used to send the requests. In stream mode it returns parsed records instead of responses.
+    save_dir : Path
+        Directory where the record files will be saved.
+    manifest : CrawlManifest
+        Manifest recording the status of each page.
+    tracker : DeltaCrawlTracker, optional
+        Tracker deciding when a delta crawl can stop (None for a full crawl).
+    retry_dead_letters : bool
+        If True, only retry the dead-letter pages of the last crawl.
+    queue_size : int
+        Maximum number of pages buffered between the pipeline stages.
+    '''
     save_dir.mkdir(parents=True, exist_ok=True)
+    fetched_responses = []
+
+    if retry_dead_letters:
+        pages = manifest.dead_letter_pages()
+        if not pages:
+            logger.info("No dead-letter pages to retry.")
+            return
+        manifest.reopen()
+        logger.info(f"Retrying {len(pages)} dead-letter pages of crawl run {manifest.run_id}.")
+    elif manifest.is_resumable():
+        pages = manifest.pending_pages(save_dir)
+        logger.info(f"Resuming crawl run {manifest.run_id}: {len(pages)} of {manifest.total_pages} pages left.")
+    else:
+        manifest.start_run()
 
-    # Process each page
-    for page in tqdm(range(1, total_pages + 1), desc="Fetching pages"):
-        for attempt in range(max_retries):
-            response = scraper.get_voice_works_response(page)
-            if response.status_code == 200:
-                break
-            logger.error(f"Failed to fetch page {page}. Retrying ({attempt + 1}/{max_retries})...")
-            sleep(retry_delay)
+        # Fetch the first page and determine the total number of pages
+        first_page_response = fetcher.fetch_page(1)
+        if first_page_response is None:
+            manifest.mark_failed(1)
+            logger.error("Exceeded maximum retries for the first page.")
+            return
+
+        total_pages = scraper.get_total_pages(first_page_response.text)
+        manifest.set_total_pages(total_pages)
+        logger.info(f"Total pages to process: {total_pages}")
+
+        # The first page is already fetched, so only the remaining pages are requested
+        if fetcher.stream:
+            fetched_responses.append((1, scraper.extract_voice_work_data(first_page_response.text)))
         else:
-            logger.error(f"Exceeded maximum retries for page {page}. Skipping this page.")
-            continue
+            fetched_responses.append((1, first_page_response))
+        pages = range(2, total_pages + 1)
+
+    def iter_responses():
+        yield from fetched_responses
+        yield from fetcher.fetch_pages(pages)
 
-        voice_works = scraper.extract_voice_work_data(response.text)
-        save_file_path = save_dir / f"voice_works_page_{page}.json"
-        save_json(voice_works, save_file_path)
-        # logger.info(f"Page {page} data saved successfully.")
+    records_path = save_dir / records_file_name()
+    writer = NDJSONWriter(records_path)
 
-    logger.info("All pages processed and saved as JSON files.")
+    def persist(page: int, voice_works: Optional[list]) -> bool:
+        if voice_works is None:
+            manifest.mark_failed(page)
+            logger.error(f"Skipping page {page}.")
+            return False
 
-def _insert_voice_work_data(db_connection: SQLiteHandler, work: dict) -> None:
+        content_hash = writer.write_many(voice_works)
+        manifest.mark_done(page, content_hash, records_path.name)
+
+        if tracker and tracker.update(work['product_id'] for work in voice_works):
+            logger.info(f"Reached known products at page {page}. Stopping delta crawl.")
+            return True
+        return False
+
+    # Fetch, parse and save the pages in overlapping stages. A streaming fetcher already parsed the pages.
+    parse = None if fetcher.stream else scraper.extract_voice_work_data
+    pipeline = CrawlPipeline(parse, persist, queue_size=queue_size)
+    with writer, tqdm(total=len(fetched_responses) + len(pages), desc="Fetching pages") as progress:
+        pipeline.run(iter_responses(), progress)
+    for stage_stats in pipeline.stats:
+        logger.info(stage_stats.summary())
+
+    manifest.mark_completed()
+    if dead_letters := manifest.dead_letter_pages():
+        logger.warning(f"{len(dead_letters)} pages exceeded the maximum retries: {dead_letters}")
+    logger.info(f"All pages processed and saved to {records_path.name}.")
+
+def _iter_voice_work_records(record_file: str | BinaryIO) -> Iterator[dict]:
     '''
-    Insert a single voice work entry and its associated data into the database.
+    Stream the voice works stored in a record file.
 
     Parameters
     ----------
-    db_connection : SQLiteHandler
-        Database connection handler.
-    work : dict
-        Voice work data to be inserted.
+    record_file : str | BinaryIO
+        Path or binary file object of a compressed NDJSON record file, or of a legacy per-page JSON file.
+
+    Yields
+    ------
+    dict
+        Voice work data.
     '''
-    try:
-        age_rating_manager = AgeRatingTableHandler(db_connection)
-        circles_manager = CirclesTableHandler(db_connection)
-        product_format_manager = ProductFormatTableHandler(db_connection)
-        voice_actors_manager = VoiceActorsTableHandler(db_connection)
-        voice_works_manager = VoiceWorksTableHandler(db_connection)
-
-        # Insert or retrieve maker
-        circles_data = {CIRCLE_PRIMARY_KEY: work['maker_id'], CIRCLE_NAME: work['maker']}
-        circles_manager.insert(circles_data)
-
-        # Insert or retrieve product format
-        category_data = {PRODUCT_FORMAT_NAME: work['category']}
-        product_format_manager.insert(category_data)
-        category_id = product_format_manager.get_product_format_id(category_data[PRODUCT_FORMAT_NAME])
-
-        # Insert or retrieve author
-        author_data = {VOICE_ACTOR_NAME: work['author']}
-        author_id = voice_actors_manager.get_voice_actor_id(author_data[VOICE_ACTOR_NAME])
-        if author_id is None and author_data[VOICE_ACTOR_NAME]:
-            voice_actors_manager.insert(author_data)
-            author_id = voice_actors_manager.get_voice_actor_id(author_data[VOICE_ACTOR_NAME])
-
-        # Insert or retrieve age rating
-        age_rating_data = {AGE_RATING_NAME: work['age_rating']}
-        age_rating_id = age_rating_manager.get_age_rating_id(age_rating_data[AGE_RATING_NAME])
-        if age_rating_id is None:
-            age_rating_manager.insert(age_rating_data)
-            age_rating_id = age_rating_manager.get_age_rating_id(age_rating_data[AGE_RATING_NAME])
-
-        # Insert voice work
-        voice_work_entry = {
-            VOICE_WORKS_PRIMARY_KEY: work['product_id'],
-            VOICE_WORKS_TITLE: work['title'],
-            VOICE_WORKS_URL: work['url'],
-            VOICE_WORKS_PRODUCT_FORMAT_ID: category_id,
-            VOICE_WORKS_CIRCLE_ID: circles_data[CIRCLE_PRIMARY_KEY],
-            VOICE_WORKS_VOICE_ACTOR_ID: author_id,
-            VOICE_WORKS_PRICE: work['price'],
-            VOICE_WORKS_POINTS: work['points'],
-            VOICE_WORKS_SALES_COUNT: work['sales_count'],
-            VOICE_WORKS_REVIEW_COUNT: work['review_count'],
-            VOICE_WORKS_AGE_ID: age_rating_id,
-            VOICE_WORKS_FULL_IMAGE_URL: work['full_image_url'],
-        }
-        voice_works_manager.insert(voice_work_entry)
-    except Exception as e:
-        logger.error(f"Failed to insert voice work data: {e}")
+    name = str(getattr(record_file, 'name', record_file))
+    if name.endswith(NDJSON_GZ_SUFFIX):
+        yield from iter_ndjson(record_file)
+    elif isinstance(record_file, str):
+        yield from load_json(record_file)
+    else:
+        yield from json.load(record_file)
+
+def _is_record_file(name: str) -> bool:
+    '''
+    Check whether a file name belongs to a record file (hidden files such as the crawl manifest are excluded).
+    '''
+    file_name = os.path.basename(name)
+    return not file_name.startswith('.') and (file_name.endswith('.json') or file_name.endswith(NDJSON_GZ_SUFFIX))
+
+def _iter_record_sources(input_path: Path) -> Iterator[tuple[str, str | BinaryIO]]:
+    '''
+    Enumerate the record files in a directory or an archived crawl.
+
+    Parameters
+    ----------
+    input_path : Path
+        Directory where the record files are stored, or an archived crawl (.zip).
+
+    Yields
+    ------
+    tuple[str, str | BinaryIO]
+        Display name and the path or open archive member of each record file.
+    '''
+    if input_path.suffix == '.zip':
+        with zipfile.ZipFile(input_path) as archive:
+            member_names = [name for name in list_archive_members(archive) if _is_record_file(name)]
+            for member_name in tqdm(member_names, desc="Importing archived records to DB"):
+                with archive.open(member_name) as member:
+                    yield f"{input_path}:{member_name}", member
+    else:
+        record_paths = sorted(glob.glob(str(input_path / "*.json")))
+        record_paths += sorted(glob.glob(str(input_path / f"*{NDJSON_GZ_SUFFIX}")))
+        for record_path in tqdm(record_paths, desc="Importing records to DB"):
+            yield record_path, record_path
+
+def _iter_record_blocks(record_sources: Iterator[tuple[str, str | BinaryIO]]) -> Iterator[tuple[str, str, bytes]]:
+    '''
+    Read record files as raw blocks for the parallel decode workers.
+
+    Parameters
+    ----------
+    record_sources : Iterator[tuple[str, str | BinaryIO]]
+        Record files yielded by `_iter_record_sources`.
+
+    Yields
+    ------
+    tuple[str, str, bytes]
+        Name of the record file and block, block kind and raw contents: NDJSON files in blocks
+        of whole lines, legacy JSON files whole.
+
+    Raises
+    ------
+    RuntimeError
+        If a record file cannot be read. The message names the file.
+    '''
+    for name, record_file in record_sources:
+        try:
+            if name.endswith(NDJSON_GZ_SUFFIX):
+                for block_number, block in enumerate(iter_ndjson_blocks(record_file), 1):
+                    yield f"{name} (block {block_number})", BLOCK_NDJSON, block
+            elif isinstance(record_file, str):
+                with open(record_file, 'rb') as file:
+                    yield name, BLOCK_JSON, file.read()
+            else:
+                yield name, BLOCK_JSON, record_file.read()
+        except (OSError, zipfile.BadZipFile) as e:
+            raise RuntimeError(f"Failed to read {name}: {e}") from e
+
+def _read_crawl_run_key(input_path: Path) -> Optional[str]:
+    '''
+    Read the run ID from the crawl manifest saved with the record files.
+
+    Parameters
+    ----------
+    input_path : Path
+        Directory where the record files are stored, or an archived crawl (.zip).
+
+    Returns
+    -------
+    Optional[str]
+        The run ID, or None if there is no manifest.
+    '''
+    if input_path.suffix == '.zip':
+        with zipfile.ZipFile(input_path) as archive:
+            if CRAWL_MANIFEST_FILENAME not in archive.namelist():
+                return None
+            with archive.open(CRAWL_MANIFEST_FILENAME) as manifest_file:
+                return json.load(manifest_file).get("run_id")
 
-def import_voice_works_to_db(input_dir: Path) -> None:
+    manifest_path = input_path / CRAWL_MANIFEST_FILENAME
+    return CrawlManifest(manifest_path).run_id if manifest_path.exists() else None
+
+def import_voice_works_to_db(
+    input_path: Path,
+    max_workers: int=0,
+    batch_size: int=10000,
+    crawl_run_key: Optional[str]=None,
+) -> None:
     '''
-    Import voice works data from saved JSON files into the database.
+    Import voice works data from saved record files into the database.
+
+    Records are read one at a time and written in large batches by VoiceWorksBulkImporter,
+    so memory use does not grow with the size of the files.
+    Legacy per-page JSON files are imported as well. `input_path` may also be a ZIP file
+    created by `archive_and_cleanup`, whose members are read without extracting them to disk.
+
+    With `max_workers` set, the raw files are decoded and validated by a pool of worker
+    processes while a single writer thread owns the database connection, so large backfills
+    scale with the number of cores until the writer becomes the bottleneck.
+
+    The sales count, review count, price and points of every work are also recorded as
+    snapshots of the crawl run, taken from the crawl manifest saved with the records.
+    The voice works keep the values of the last crawl imported, so crawls should be
+    imported in chronological order. The snapshots are recorded correctly in any order.
 
     Parameters
     ----------
-    input_dir : Path
-        Directory where JSON files are stored.
+    input_path : Path
+        Directory where the record files are stored, or an archived crawl (.zip).
+    max_workers : int
+        Number of decode worker processes. 0 decodes on the importing thread.
+    batch_size : int
+        Number of voice works written and committed per batch.
+    crawl_run_key : str, optional
+        Run ID of the crawl (formatted like "2024-11-30-120000"). Defaults to the run ID in the
+        crawl manifest, or to the current time if there is no manifest.
     '''
-    json_paths = sorted(glob.glob(str(input_dir / "*.json")))
+    input_path = Path(input_path)
+    record_path = input_path
     try:
-        with SQLiteHandler(DATABASE_PATH) as db_connection:
-            for json_path in tqdm(json_paths, desc="Importing JSON to DB"):
-                voice_works = load_json(json_path)
-                for work in voice_works:
-                    _insert_voice_work_data(db_connection, work)
+        crawl_run_key = crawl_run_key or _read_crawl_run_key(input_path)
+        if crawl_run_key is None:
+            crawl_run_key = datetime.now().strftime(CRAWL_RUN_KEY_FORMAT)
+            logger.info(f"No crawl manifest found. Recording snapshots as crawl run {crawl_run_key}.")
+
+        if max_workers:
+            importer = import_blocks_in_parallel(
+                DATABASE_PATH,
+                _iter_record_blocks(_iter_record_sources(input_path)),
+                max_workers=max_workers,
+                batch_size=batch_size,
+                crawl_run_key=crawl_run_key,
+            )
+        else:
+            with ConnectionManager(DATABASE_PATH) as manager, manager.writer() as db_connection:
+                with VoiceWorksBulkImporter(db_connection, batch_size, crawl_run_key) as importer:
+                    for record_path, record_file in _iter_record_sources(input_path):
+                        importer.add_many(_iter_voice_work_records(record_file))
+        logger.info(
+            f"All records imported to the database ({importer.processed} imported, {importer.changed} new or changed, "
+            f"{importer.snapshots} snapshot rows written, {importer.skipped} skipped)."
+        )
     except Exception as e:
-        logger.error(f"Failed to process {json_path}: {e}")
+        logger.error(f"Failed to process {record_path}: {e}")
 
-    logger.info("All JSON data imported to the database.")
+def rebuild_materialized_views() -> None:
+    '''
+    Refill the materialized views from the base tables.
+
+    The triggers keep the materialized views current, so this is only needed to recover
+    from changes made while they were missing, e.g. by another version of the application.
+    '''
+    with ConnectionManager(DATABASE_PATH) as manager, manager.writer() as db_connection:
+        view_handler = VoiceWorksViewHandler(db_connection)
+        if not view_handler.has_materialized_view():
+            logger.warning("The voice works view is not materialized. Nothing to rebuild.")
+            return
+        view_handler.rebuild_materialized_view()
+    logger.info("Materialized views rebuilt.")
+
+def rebuild_rollups() -> None:
+    '''
+    Recompute the rollups of circles, voice actors, product formats and age ratings.
+
+    The triggers keep the rollups current, so this is only needed to recover from
+    changes made while they were missing.
+    '''
+    with ConnectionManager(DATABASE_PATH) as manager, manager.writer() as db_connection:
+        for table_name in ROLLUP_DIMENSIONS:
+            VoiceWorkRollupsTableHandler(db_connection, table_name).rebuild()
+    logger.info("Rollups rebuilt.")
+
+def rebuild_term_counts() -> None:
+    '''
+    Count the title terms per age rating, circle and product format again.
+
+    Imports keep the term counts current, so this is only needed after works were changed
+    without the importer or with `index_terms` disabled. Cached tokens of unchanged
+    titles are reused, so only new titles are analyzed with MeCab.
+    '''
+    with ConnectionManager(DATABASE_PATH) as manager, manager.writer() as db_connection:
+        VoiceWorkTermIndexer(db_connection).rebuild()
+    logger.info("Term counts rebuilt.")
+
+def sync_title_search() -> None:
+    '''
+    Index the titles of the voice works missing from the title search index.
+
+    Imports keep the index current. Works inserted or retitled by other SQLite clients
+    are only removed from the index by the triggers, so this adds them back, along with
+    any other work that has no entry.
+    '''
+    with ConnectionManager(DATABASE_PATH) as manager, manager.writer() as db_connection:
+        indexed = VoiceWorksTitleSearchTableHandler(db_connection).index_missing()
+    logger.info(f"Title search index synced ({indexed} titles indexed).")
 
 __all__ = [
     'archive_and_cleanup',
     'DatabaseInitializer',
     'fetch_and_save_voice_works',
     'import_voice_works_to_db',
+    'rebuild_materialized_views',
+    'rebuild_rollups',
+    'rebuild_term_counts',
+    'sync_title_search',
 ]
\ No newline at end of file
@@ -21,9 +21,19 @@ MECAB_USER_DIC_PATH = DATA_DIR / 'user_dict.dic'
 RAW_JSON_DATA_DIR = DATA_DIR / 'raw_json'
 RAW_JSON_DATA_DIR.mkdir(exist_ok=True)
 
+# クロールの進捗を記録するマニフェストのファイル名(クロールデータの保存ディレクトリ内に作成)
+CRAWL_MANIFEST_FILENAME = '.crawl_manifest.json'
+
 # アーカイブデータの保存ディレクトリ
 ARCHIVE_DIR = DATA_DIR / 'archives'
 ARCHIVE_DIR.mkdir(exist_ok=True)
 
+# ワードクラウドの保存ディレクトリ
+WORDCLOUD_DIR = DATA_DIR / 'wordcloud'
+WORDCLOUD_DIR.mkdir(exist_ok=True)
+
+# 描画済みのワードクラウドのキャッシュディレクトリ
+WORDCLOUD_CACHE_DIR = WORDCLOUD_DIR / '.cache'
+
 # データベースのパス
 DATABASE_PATH = DATA_DIR / 'dlsite_works.db'
\ No newline at end of file
@@ -1,19 +1,48 @@
 from .common import SQLiteHandler
+from .connection_manager import ConnectionManager
+from .dataframe_loader import iter_dataframe_chunks, read_dataframe
+from .query_plan import explain_query_plan, find_full_scans, verify_query_plan
+from .bulk_import import VoiceWorksBulkImporter, validate_voice_work
+from .term_index import VoiceWorkTermIndexer
+from .parallel_import import SingleWriterImport, import_blocks_in_parallel
 from .view_managers import VoiceWorksViewHandler
 from .table_managers import (
     VoiceWorksTableHandler,
     CirclesTableHandler,
     ProductFormatTableHandler,
     VoiceActorsTableHandler,
-    AgeRatingTableHandler
+    AgeRatingTableHandler,
+    CrawlRunsTableHandler,
+    VoiceWorkSnapshotsTableHandler,
+    VoiceWorkRollupsTableHandler,
+    VoiceWorksTitleSearchTableHandler,
+    VoiceWorkTokensTableHandler,
+    TermCountsTableHandler
 )
 
 __all__ = [
     'SQLiteHandler',
+    'ConnectionManager',
+    'iter_dataframe_chunks',
+    'read_dataframe',
+    'explain_query_plan',
+    'find_full_scans',
+    'verify_query_plan',
+    'VoiceWorksBulkImporter',
+    'validate_voice_work',
+    'VoiceWorkTermIndexer',
+    'SingleWriterImport',
+    'import_blocks_in_parallel',
     'VoiceWorksViewHandler',
     'VoiceWorksTableHandler',
     'CirclesTableHandler',
     'ProductFormatTableHandler',
     'VoiceActorsTableHandler',
-    'AgeRatingTableHandler'
+    'AgeRatingTableHandler',
+    'CrawlRunsTableHandler',
+    'VoiceWorkSnapshotsTableHandler',
+    'VoiceWorkRollupsTableHandler',
+    'VoiceWorksTitleSearchTableHandler',
+    'VoiceWorkTokensTableHandler',
+    'TermCountsTableHandler'
 ]
\ No newline at end of file
@@ -0,0 +1,375 @@
+from typing import Iterable, Optional
+
+from .common import SQLiteHandler, row_fingerprint
+from .term_index import WORK_GROUP_COLUMNS, VoiceWorkTermIndexer
+from .table_managers import (
+    CirclesTableHandler,
+    CrawlRunsTableHandler,
+    VoiceWorksTableHandler,
+    VoiceWorkSnapshotsTableHandler,
+    VoiceWorksTitleSearchTableHandler,
+)
+from .constants import (
+    VOICE_WORKS_PRIMARY_KEY,
+    VOICE_WORKS_TITLE,
+    VOICE_WORKS_URL,
+    VOICE_WORKS_PRODUCT_FORMAT_ID,
+    VOICE_WORKS_CIRCLE_ID,
+    VOICE_WORKS_VOICE_ACTOR_ID,
+    VOICE_WORKS_PRICE,
+    VOICE_WORKS_POINTS,
+    VOICE_WORKS_SALES_COUNT,
+    VOICE_WORKS_REVIEW_COUNT,
+    VOICE_WORKS_AGE_ID,
+    VOICE_WORKS_FULL_IMAGE_URL,
+    VOICE_WORKS_FINGERPRINT,
+    CIRCLES_TABLE,
+    CIRCLE_PRIMARY_KEY,
+    CIRCLE_NAME,
+    PRODUCT_FORMAT_TABLE,
+    PRODUCT_FORMAT_PRIMARY_KEY,
+    PRODUCT_FORMAT_NAME,
+    VOICE_ACTORS_TABLE,
+    VOICE_ACTOR_PRIMARY_KEY,
+    VOICE_ACTOR_NAME,
+    AGE_RATING_TABLE,
+    AGE_RATING_PRIMARY_KEY,
+    AGE_RATING_NAME,
+    SNAPSHOT_PRODUCT_ID,
+    SNAPSHOT_CRAWL_RUN_ID,
+    SNAPSHOT_SALES_COUNT,
+    SNAPSHOT_REVIEW_COUNT,
+    SNAPSHOT_PRICE,
+    SNAPSHOT_POINTS,
+)
+from ..utils import Logger
+
+logger = Logger.get_logger(__name__)
+
+VOICE_WORKS_COLUMNS = (
+    VOICE_WORKS_PRIMARY_KEY,
+    VOICE_WORKS_TITLE,
+    VOICE_WORKS_URL,
+    VOICE_WORKS_PRODUCT_FORMAT_ID,
+    VOICE_WORKS_CIRCLE_ID,
+    VOICE_WORKS_VOICE_ACTOR_ID,
+    VOICE_WORKS_PRICE,
+    VOICE_WORKS_POINTS,
+    VOICE_WORKS_SALES_COUNT,
+    VOICE_WORKS_REVIEW_COUNT,
+    VOICE_WORKS_AGE_ID,
+    VOICE_WORKS_FULL_IMAGE_URL,
+)
+
+# Positions in a voice_works row of the values VoiceWorkTermIndexer.update takes
+_TERM_INDEX_POSITIONS = tuple(
+    VOICE_WORKS_COLUMNS.index(column)
+    for column in (VOICE_WORKS_PRIMARY_KEY, VOICE_WORKS_TITLE, *WORK_GROUP_COLUMNS)
+)
+
+# Fields of a scraped voice work record
+VOICE_WORK_TEXT_FIELDS = (
+    'product_id', 'title', 'url', 'category', 'maker_id', 'maker', 'author', 'age_rating', 'full_image_url',
+)
+VOICE_WORK_INT_FIELDS = ('price', 'points', 'sales_count', 'review_count')
+
+def validate_voice_work(work: dict) -> dict:
+    '''
+    Check that a scraped voice work record can be imported.
+
+    Parameters
+    ----------
+    work : dict
+        Voice work data.
+
+    Returns
+    -------
+    dict
+        The same record, with numeric fields (including text such as "1,100") converted to int.
+
+    Raises
+    ------
+    ValueError
+        If a field is missing, the product ID or age rating is empty, or a numeric field is not a number.
+    '''
+    if not isinstance(work, dict):
+        raise ValueError(f"Expected a voice work object, got {type(work).__name__}.")
+    missing = [field for field in VOICE_WORK_TEXT_FIELDS + VOICE_WORK_INT_FIELDS if field not in work]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    if not work['product_id']:
+        raise ValueError("The product ID cannot be empty.")
+    if not work['age_rating']:
+        raise ValueError("The age rating name cannot be empty.")
+
+    for field in VOICE_WORK_INT_FIELDS:
+        if type(work[field]) is not int:
+            try:
+                work[field] = int(str(work[field]).replace(',', ''))
+            except ValueError:
+                raise ValueError(f"The field {field} is not a number: {work[field]!r}")
+    return work
+
+class VoiceWorksBulkImporter:
+    '''
+    Imports scraped voice works in batches.
+
+    The circles, product formats, voice actors and age ratings already in the database are
+    loaded into in-memory maps once, so each work is resolved to its foreign keys without a
+    query. Only a dimension value seen for the first time costs a single INSERT. Circle and
+    voice work rows are buffered and written with `executemany`, committing once per batch.
+
+    Rows are upserted: a voice work already in the table is rewritten only when its content
+    fingerprint changed, so a refresh touches only the works whose sales, reviews or price
+    moved. When the works belong to a crawl run, their sales count, review count, price and
+    points are also recorded in voice_work_snapshots, which keeps a row only when a value
+    changed since the product's previous snapshot.
+
+    With `index_terms`, each batch also updates the token cache and the term counts
+    through VoiceWorkTermIndexer, which only analyzes new or retitled works. New and
+    retitled works are also added to the title search index after each batch.
+
+    The result matches upserting the works one by one with the table handlers: an empty
+    author falls back to the voice actor stored with an empty name, and records rejected
+    by `validate_voice_work` are skipped.
+    '''
+    def __init__(
+        self,
+        db_connection: SQLiteHandler,
+        batch_size: int=10000,
+        crawl_run_key: Optional[str]=None,
+        index_terms: bool=True,
+    ):
+        '''
+        Initialize the importer and load the dimension-id maps.
+
+        Parameters
+        ----------
+        db_connection : SQLiteHandler
+            Database connection handler.
+        batch_size : int
+            Number of voice works written and committed per batch.
+        crawl_run_key : str, optional
+            Run ID of the crawl the works come from. Snapshots are recorded only when it is given.
+        index_terms : bool
+            Whether to update the term counts of the titles. Skipped with a warning if MeCab is not installed.
+        '''
+        self.db_connection = db_connection
+        self.batch_size = batch_size
+        self.processed = 0
+        self.changed = 0
+        self.snapshots = 0
+        self.skipped = 0
+
+        self._circle_names = dict(self._fetch(f"SELECT {CIRCLE_PRIMARY_KEY}, {CIRCLE_NAME} FROM {CIRCLES_TABLE}"))
+        self._product_format_ids = self._load_id_map(PRODUCT_FORMAT_TABLE, PRODUCT_FORMAT_PRIMARY_KEY, PRODUCT_FORMAT_NAME)
+        self._voice_actor_ids = self._load_id_map(VOICE_ACTORS_TABLE, VOICE_ACTOR_PRIMARY_KEY, VOICE_ACTOR_NAME)
+        self._age_rating_ids = self._load_id_map(AGE_RATING_TABLE, AGE_RATING_PRIMARY_KEY, AGE_RATING_NAME)
+
+        self._circle_rows = []
+        self._voice_work_rows = []
+        self._snapshot_rows = []
+        self._upsert_circles_query = CirclesTableHandler(db_connection).build_upsert_query([CIRCLE_PRIMARY_KEY, CIRCLE_NAME])
+        self._upsert_voice_works_query = VoiceWorksTableHandler(db_connection).build_upsert_query(
+            [*VOICE_WORKS_COLUMNS, VOICE_WORKS_FINGERPRINT]
+        )
+
+        self.crawl_run_id = None
+        if crawl_run_key is not None:
+            self.crawl_run_id = CrawlRunsTableHandler(db_connection).register_run(crawl_run_key)
+            self._snapshots = VoiceWorkSnapshotsTableHandler(db_connection)
+
+        self._title_search = VoiceWorksTitleSearchTableHandler(db_connection)
+        if self._title_search.get_tokenizer() is None:
+            self._title_search = None
+
+        self._term_indexer = None
+        if index_terms:
+            try:
+                self._term_indexer = VoiceWorkTermIndexer(db_connection)
+            except ImportError as e:
+                logger.warning(f"Term counts are not updated: {e}")
+
+    def __enter__(self) -> 'VoiceWorksBulkImporter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        '''
+        Write the remaining buffered rows unless an exception is propagating.
+        '''
+        if exc_type is None:
+            self.flush()
+
+    def add_many(self, works: Iterable[dict]) -> None:
+        '''
+        Queue voice works for import, writing a batch whenever `batch_size` works are buffered.
+
+        Parameters
+        ----------
+        works : Iterable[dict]
+            Voice work data, such as a parsed page or a stream of records.
+        '''
+        for work in works:
+            self.add(work)
+
+    def add(self, work: dict) -> None:
+        '''
+        Queue a single voice work for import.
+
+        Works rejected by `validate_voice_work` are logged and skipped.
+
+        Parameters
+        ----------
+        work : dict
+            Voice work data.
+        '''
+        try:
+            row = self._to_row(validate_voice_work(work))
+        except ValueError as e:
+            logger.error(f"Failed to insert voice work data: {e}")
+            self.skipped += 1
+            return
+
+        self._voice_work_rows.append((*row, row_fingerprint(row[1:])))
+        if self.crawl_run_id is not None:
+            self._snapshot_rows.append({
+                SNAPSHOT_PRODUCT_ID: work['product_id'],
+                SNAPSHOT_CRAWL_RUN_ID: self.crawl_run_id,
+                SNAPSHOT_SALES_COUNT: work['sales_count'],
+                SNAPSHOT_REVIEW_COUNT: work['review_count'],
+                SNAPSHOT_PRICE: work['price'],
+                SNAPSHOT_POINTS: work['points'],
+            })
+        if len(self._voice_work_rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        '''
+        Write the buffered rows with executemany and commit them.
+        '''
+        try:
+            if self._circle_rows:
+                self.db_connection.executemany_query(self._upsert_circles_query, self._circle_rows)
+            if self._voice_work_rows:
+                cursor = self.db_connection.executemany_query(self._upsert_voice_works_query, self._voice_work_rows)
+                self.changed += cursor.rowcount
+                if self._title_search is not None:
+                    self._title_search.index_missing(row[0] for row in self._voice_work_rows)
+            if self._snapshot_rows:
+                self.snapshots += self._snapshots.record_snapshots(self._snapshot_rows)
+            if self._term_indexer is not None and self._voice_work_rows:
+                self._term_indexer.update(
+                    tuple(row[position] for position in _TERM_INDEX_POSITIONS) for row in self._voice_work_rows
+                )
+            self.db_connection.commit()
+        except Exception as e:
+            raise RuntimeError(f"Failed to write voice works batch: {e}")
+
+        self.processed += len(self._voice_work_rows)
+        self._circle_rows.clear()
+        self._voice_work_rows.clear()
+        self._snapshot_rows.clear()
+
+    def _to_row(self, work: dict) -> tuple:
+        '''
+        Resolve the dimension IDs of a voice work and build its voice_works row.
+
+        Parameters
+        ----------
+        work : dict
+            Voice work data checked by `validate_voice_work`.
+
+        Returns
+        -------
+        tuple
+            Row values in the order of VOICE_WORKS_COLUMNS, which matches the fingerprint column order.
+        '''
+        age_rating_name = work['age_rating']
+        circle_id = work['maker_id']
+        if self._circle_names.get(circle_id) != work['maker']:
+            self._circle_names[circle_id] = work['maker']
+            self._circle_rows.append((circle_id, work['maker']))
+
+        author = work['author']
+        voice_actor_id = self._voice_actor_ids.get(author)
+        if voice_actor_id is None and author:
+            voice_actor_id = self._insert_dimension(self._voice_actor_ids, VOICE_ACTORS_TABLE, VOICE_ACTOR_NAME, author)
+
+        product_format_id = self._product_format_ids.get(work['category'])
+        if product_format_id is None:
+            product_format_id = self._insert_dimension(self._product_format_ids, PRODUCT_FORMAT_TABLE, PRODUCT_FORMAT_NAME, work['category'])
+
+        age_id = self._age_rating_ids.get(age_rating_name)
+        if age_id is None:
+            age_id = self._insert_dimension(self._age_rating_ids, AGE_RATING_TABLE, AGE_RATING_NAME, age_rating_name)
+
+        return (
+            work['product_id'],
+            work['title'],
+            work['url'],
+            product_format_id,
+            circle_id,
+            voice_actor_id,
+            work['price'],
+            work['points'],
+            work['sales_count'],
+            work['review_count'],
+            age_id,
+            work['full_image_url'],
+        )
+
+    def _insert_dimension(self, id_map: dict, table_name: str, name_column: str, name: str) -> int:
+        '''
+        Insert a dimension value seen for the first time and cache its ID.
+
+        Parameters
+        ----------
+        id_map : dict
+            Name-to-ID map of the dimension table.
+        table_name : str
+            Name of the dimension table.
+        name_column : str
+            Name of the unique name column.
+        name : str
+            Value to insert.
+
+        Returns
+        -------
+        int
+            ID assigned to the new value.
+        '''
+        try:
+            cursor = self.db_connection.execute_query(f"INSERT INTO {table_name} ({name_column}) VALUES (?)", (name,))
+        except Exception as e:
+            raise RuntimeError(f"Failed to insert into {table_name}: {e}")
+        id_map[name] = cursor.lastrowid
+        return cursor.lastrowid
+
+    def _load_id_map(self, table_name: str, primary_key: str, name_column: str) -> dict:
+        '''
+        Load a name-to-ID map of a dimension table.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the dimension table.
+        primary_key : str
+            Name of the ID column.
+        name_column : str
+            Name of the unique name column.
+
+        Returns
+        -------
+        dict
+            Map from name to ID.
+        '''
+        return {name: row_id for row_id, name in self._fetch(f"SELECT {primary_key}, {name_column} FROM {table_name}")}
+
+    def _fetch(self, query: str) -> list:
+        '''
+        Execute a query and return all rows.
+        '''
+        try:
+            return self.db_connection.execute_query(query).fetchall()
+        except Exception as e:
+            raise RuntimeError(f"Failed to load dimension table: {e}")
@@ -1,11 +1,13 @@
+import hashlib
+import json
 import sqlite3
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 class SQLiteHandler:
     '''
     Handles SQLite database operations with context management.
     '''
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, connection: Optional[sqlite3.Connection]=None):
         '''
         Initialize the database connection.
 
@@ -13,8 +15,13 @@ class SQLiteHandler:
         ----------
         db_path : str
             Path to the SQLite database file.
+        connection : sqlite3.Connection, optional
+            Existing connection to use instead of opening a new one, e.g. one lent by a
+            ConnectionManager. Such a connection is never closed by this handler.
         '''
-        self._connection = sqlite3.connect(db_path) # データベース接続
+        self.db_path = db_path
+        self._owns_connection = connection is None
+        self._connection = connection or sqlite3.connect(db_path) # データベース接続
         self._cursor = self._connection.cursor() # カーソル
 
     def __enter__(self) -> 'SQLiteHandler':
@@ -32,7 +39,7 @@ class SQLiteHandler:
             self.commit()
         else:
             self._connection.rollback()
-        self._connection.close()
+        self.close()
 
     def execute_query(self, query: str, params: tuple=None) -> sqlite3.Cursor:
         '''
@@ -70,23 +77,120 @@ class SQLiteHandler:
         '''
         return self._cursor.executemany(query, params)
     
+    def open_cursor(self) -> sqlite3.Cursor:
+        '''
+        Open a separate cursor, whose results stay readable while other queries run on the connection.
+
+        Returns
+        -------
+        sqlite3.Cursor
+            A new cursor, to be closed by the caller.
+        '''
+        return self._connection.cursor()
+
     def commit(self) -> None:
         '''
         Commit the current transaction.
         '''
         self._connection.commit()
     
+    def rollback(self) -> None:
+        '''
+        Roll back the current transaction.
+        '''
+        self._connection.rollback()
+
     def close(self) -> None:
         '''
-        Close the database connection.
+        Close the database connection unless it was lent by the caller.
         '''
-        self._connection.close()
+        if self._owns_connection:
+            self._connection.close()
+
+def row_fingerprint(values: Iterable) -> str:
+    '''
+    Compute a short content fingerprint of a row.
+
+    Parameters
+    ----------
+    values : Iterable
+        Column values in a fixed column order.
+
+    Returns
+    -------
+    str
+        16-digit hexadecimal BLAKE2b digest of the values.
+    '''
+    encoded = json.dumps(list(values), ensure_ascii=False, separators=(',', ':')).encode('UTF-8')
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+class IndexDefinition:
+    '''
+    Declaration of a secondary index of a table.
+    '''
+    def __init__(self, columns: list, name: Optional[str]=None, unique: bool=False, where: Optional[str]=None):
+        '''
+        Declare an index.
+
+        Parameters
+        ----------
+        columns : list
+            Indexed columns in order, optionally followed by ASC or DESC. Trailing columns
+            that are only read, never searched, make the index covering for a query.
+        name : str, optional
+            Name of the index (default is idx_<table>_<columns>).
+        unique : bool
+            Whether the index enforces uniqueness.
+        where : str, optional
+            Condition of a partial index, which stores only the rows matching it. Queries
+            use the index only when their WHERE clause implies the condition.
+        '''
+        self.columns = list(columns)
+        self.name = name
+        self.unique = unique
+        self.where = where
+
+    def get_name(self, table_name: str) -> str:
+        '''
+        Name of the index on the given table.
+        '''
+        return self.name or f"idx_{table_name}_{'_'.join(column.split()[0] for column in self.columns)}"
+
+    def build_create_query(self, table_name: str) -> str:
+        '''
+        Build the CREATE INDEX statement of the index on the given table.
+
+        Parameters
+        ----------
+        table_name : str
+            Name of the indexed table.
+
+        Returns
+        -------
+        str
+            The CREATE INDEX statement.
+        '''
+        unique = "UNIQUE " if self.unique else ""
+        where = f" WHERE {self.where}" if self.where else ""
+        return (
+            f"CREATE {unique}INDEX IF NOT EXISTS {self.get_name(table_name)} "
+            f"ON {table_name} ({', '.join(self.columns)}){where}"
+        )
 
 class TableHandlerInterface:
     '''
     Generic handler for managing database tables.
     '''
-    def __init__(self, db_connection: SQLiteHandler, table_name: str, columns_with_types: dict, primary_key: str, foreign_keys: list=None):
+    def __init__(
+        self,
+        db_connection: SQLiteHandler,
+        table_name: str,
+        columns_with_types: dict,
+        primary_key: str,
+        foreign_keys: list=None,
+        fingerprint_column: Optional[str]=None,
+        indexes: Optional[list]=None,
+    ):
         '''
         Initialize a handler for a specific database table.
 
@@ -102,12 +206,19 @@ class TableHandlerInterface:
             Name of the primary key column.
         foreign_keys : list, optional
             List of foreign key constraints (default is None).
+        fingerprint_column : str, optional
+            Column storing the content fingerprint used by `upsert` to detect changed rows (default is None).
+        indexes : list, optional
+            IndexDefinition of every secondary index the table needs (default is None).
+            The primary key is indexed by SQLite itself and must not be declared.
         '''
         self.db_connection = db_connection
         self.table_name = table_name
         self.columns_with_types = columns_with_types
         self.primary_key = primary_key
         self.foreign_keys = foreign_keys or []
+        self.fingerprint_column = fingerprint_column
+        self.indexes = indexes or []
     
     def create_table(self) -> None:
         '''
@@ -125,16 +236,64 @@ class TableHandlerInterface:
         self.db_connection.execute_query(query)
         self.db_connection.commit()
     
+    def add_missing_columns(self) -> None:
+        '''
+        Add the columns declared by the handler that an existing table does not have yet.
+        '''
+        existing_columns = set(self._get_columns())
+        for column, dtype in self.columns_with_types.items():
+            if column not in existing_columns:
+                self.db_connection.execute_query(f"ALTER TABLE {self.table_name} ADD COLUMN {column} {dtype}")
+        self.db_connection.commit()
+
+    def migrate_column_types(self) -> None:
+        '''
+        Rebuild the table if the declared type of a column differs from the existing table.
+
+        SQLite cannot change the type of a column in place, so the old table is renamed,
+        the table is created again with the declared schema, and the rows are copied over.
+        Indexes of the old table are dropped with it and must be created again afterwards.
+        '''
+        query = f"PRAGMA table_info({self.table_name})"
+        existing_types = {row[1]: row[2].upper() for row in self.db_connection.execute_query(query).fetchall()}
+        changed = [
+            column for column, dtype in self.columns_with_types.items()
+            if column in existing_types and existing_types[column] != dtype.split()[0].upper()
+        ]
+        if not changed:
+            return
+
+        old_table_name = f"{self.table_name}_old"
+        columns = ', '.join(column for column in self.columns_with_types if column in existing_types)
+        # Legacy mode keeps views referring to the table name instead of following the rename
+        self.db_connection.execute_query("PRAGMA legacy_alter_table = ON")
+        try:
+            self.db_connection.execute_query(f"ALTER TABLE {self.table_name} RENAME TO {old_table_name}")
+            self.create_table()
+            self.db_connection.execute_query(
+                f"INSERT INTO {self.table_name} ({columns}) SELECT {columns} FROM {old_table_name}"
+            )
+            self.db_connection.execute_query(f"DROP TABLE {old_table_name}")
+            self.db_connection.commit()
+        finally:
+            self.db_connection.execute_query("PRAGMA legacy_alter_table = OFF")
+
     def create_index(self) -> None:
         '''
-        Create an index on the primary key.
+        Create the declared indexes.
+
+        The index on the primary key created by earlier versions duplicates the one SQLite
+        keeps for the key, so it is dropped to save its write cost.
         '''
-        query = f"""
-        CREATE INDEX IF NOT EXISTS idx_{self.table_name}_{self.primary_key}
-        ON {self.table_name} ({self.primary_key})
-        """
-        self.db_connection.execute_query(query)
+        self.db_connection.execute_query(f"DROP INDEX IF EXISTS idx_{self.table_name}_{self.primary_key}")
+        for index in self.indexes:
+            self.db_connection.execute_query(index.build_create_query(self.table_name))
         self.db_connection.commit()
+
+    def create_triggers(self) -> None:
+        '''
+        Create the triggers the table depends on. Tables without triggers do nothing.
+        '''
     
     def insert(self, record: dict) -> None:
         '''
@@ -150,6 +309,77 @@ class TableHandlerInterface:
         query = f"INSERT OR IGNORE INTO {self.table_name} ({columns}) VALUES ({placeholders})"
         self.db_connection.execute_query(query, tuple(record.values()))
     
+    @property
+    def fingerprint_columns(self) -> list:
+        '''
+        Columns covered by the content fingerprint (all columns except the primary key and the fingerprint itself).
+        '''
+        return [column for column in self.columns_with_types if column not in (self.primary_key, self.fingerprint_column)]
+
+    def fingerprint(self, record: dict) -> str:
+        '''
+        Compute the content fingerprint of a record.
+
+        Parameters
+        ----------
+        record : dict
+            Dictionary of column data.
+
+        Returns
+        -------
+        str
+            Fingerprint of the values in `fingerprint_columns` order.
+        '''
+        return row_fingerprint(record.get(column) for column in self.fingerprint_columns)
+
+    def build_upsert_query(self, columns: list) -> str:
+        '''
+        Build an INSERT that rewrites an existing row only when its content changed.
+
+        With a fingerprint column, the existing row is updated only when the fingerprints
+        differ; otherwise every non-key column is compared.
+
+        Parameters
+        ----------
+        columns : list
+            Columns in the order of the query parameters, including the primary key.
+
+        Returns
+        -------
+        str
+            The UPSERT statement.
+        '''
+        update_columns = [column for column in columns if column != self.primary_key]
+        assignments = ', '.join(f"{column} = excluded.{column}" for column in update_columns)
+        if self.fingerprint_column in update_columns:
+            changed = f"{self.table_name}.{self.fingerprint_column} IS NOT excluded.{self.fingerprint_column}"
+        else:
+            changed = ' OR '.join(f"{self.table_name}.{column} IS NOT excluded.{column}" for column in update_columns)
+
+        return (
+            f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT ({self.primary_key}) DO UPDATE SET {assignments} WHERE {changed}"
+        )
+
+    def upsert(self, record: dict) -> int:
+        '''
+        Insert a row, or rewrite the existing row only when its content changed.
+
+        Parameters
+        ----------
+        record : dict
+            Dictionary of column data, including the primary key.
+
+        Returns
+        -------
+        int
+            1 if the row was inserted or updated, 0 if it was unchanged.
+        '''
+        if self.fingerprint_column:
+            record = {**record, self.fingerprint_column: self.fingerprint(record)}
+        query = self.build_upsert_query(list(record.keys()))
+        return self.db_connection.execute_query(query, tuple(record.values())).rowcount
+
     def fetch_all(self) -> dict:
         '''
         Fetch all rows from the table.
@@ -0,0 +1,222 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .common import SQLiteHandler
+from ..utils import Logger
+
+logger = Logger.get_logger(__name__)
+
+class ConnectionManager:
+    '''
+    Manages the SQLite connections of one database in WAL mode.
+
+    The manager keeps a single writer connection, serialized by a lock, and a pool of
+    read-only connections that are handed to one thread at a time. In WAL mode readers
+    do not block the writer and the writer does not block readers, so analysis code
+    can read while the crawler or an import writes. Every `reader()` block runs in one
+    read transaction and therefore sees a consistent snapshot of the database, even if
+    commits happen in the meantime.
+    '''
+    def __init__(
+        self,
+        db_path: str,
+        synchronous: str="NORMAL",
+        cache_size: int=-65536,
+        mmap_size: int=268435456,
+        temp_store: str="MEMORY",
+        busy_timeout: float=30.0,
+        max_readers: int=4,
+    ):
+        '''
+        Initialize the connection manager. Connections are opened on first use.
+
+        Parameters
+        ----------
+        db_path : str
+            Path to the SQLite database file.
+        synchronous : str
+            PRAGMA synchronous of every connection. NORMAL is durable against application
+            crashes in WAL mode; FULL also survives power loss.
+        cache_size : int
+            PRAGMA cache_size; negative values are KiB (the default is 64 MiB per connection).
+        mmap_size : int
+            PRAGMA mmap_size in bytes; 0 disables memory-mapped I/O.
+        temp_store : str
+            PRAGMA temp_store (DEFAULT, FILE or MEMORY) used for sorts and temporary indexes.
+        busy_timeout : float
+            Seconds a connection waits for a lock before failing.
+        max_readers : int
+            Maximum number of pooled read-only connections.
+        '''
+        self.db_path = db_path
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.mmap_size = mmap_size
+        self.temp_store = temp_store
+        self.busy_timeout = busy_timeout
+        self.max_readers = max_readers
+        self._writer_connection = None
+        self._writer_lock = threading.RLock()
+        self._idle_readers = queue.LifoQueue()
+        self._reader_connections = []
+        self._readers_lock = threading.Lock()
+
+    def __enter__(self) -> 'ConnectionManager':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        '''
+        Close every connection on exiting the context.
+        '''
+        self.close()
+
+    def _configure(self, connection: sqlite3.Connection) -> sqlite3.Connection:
+        '''
+        Apply the per-connection pragmas.
+        '''
+        connection.execute(f"PRAGMA synchronous = {self.synchronous}")
+        connection.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        connection.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        connection.execute(f"PRAGMA temp_store = {self.temp_store}")
+        return connection
+
+    def _open_writer(self) -> sqlite3.Connection:
+        '''
+        Open the writer connection and switch the database to WAL mode.
+        '''
+        connection = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+        journal_mode = connection.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        if journal_mode.lower() != 'wal':
+            logger.warning(f"WAL mode is not available for {self.db_path}, using {journal_mode} journal mode.")
+        return self._configure(connection)
+
+    def _open_reader(self) -> sqlite3.Connection:
+        '''
+        Open a read-only connection in autocommit mode, so transactions are explicit.
+        '''
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        connection = sqlite3.connect(
+            uri, uri=True, timeout=self.busy_timeout, check_same_thread=False, isolation_level=None,
+        )
+        return self._configure(connection)
+
+    @contextmanager
+    def writer(self) -> Iterator[SQLiteHandler]:
+        '''
+        Lend the writer connection to the calling thread.
+
+        Other threads asking for the writer wait until the block exits. The block runs in
+        a transaction that is committed on exit, or rolled back if an exception is raised;
+        the handler may also commit on its own, e.g. once per batch.
+
+        Yields
+        ------
+        SQLiteHandler
+            A handler on the writer connection.
+        '''
+        with self._writer_lock:
+            if self._writer_connection is None:
+                self._writer_connection = self._open_writer()
+            db_connection = SQLiteHandler(self.db_path, connection=self._writer_connection)
+            try:
+                db_connection.execute_query('BEGIN IMMEDIATE')
+                yield db_connection
+                db_connection.commit()
+            except BaseException:
+                db_connection.rollback()
+                raise
+
+    @contextmanager
+    def reader(self, timeout: Optional[float]=None) -> Iterator[SQLiteHandler]:
+        '''
+        Lend a read-only connection from the pool to the calling thread.
+
+        A new connection is opened while fewer than `max_readers` exist; otherwise the
+        call waits for one to be returned. All queries in the block see the database as
+        of their first read, and writes are rejected.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Seconds to wait for a free connection (default is to wait indefinitely).
+
+        Yields
+        ------
+        SQLiteHandler
+            A handler on a read-only connection.
+
+        Raises
+        ------
+        RuntimeError
+            If no connection became free within `timeout`.
+        '''
+        connection = self._acquire_reader(timeout)
+        try:
+            db_connection = SQLiteHandler(self.db_path, connection=connection)
+            db_connection.execute_query('BEGIN')
+            try:
+                yield db_connection
+            finally:
+                db_connection.rollback()
+        finally:
+            self._idle_readers.put(connection)
+
+    def _acquire_reader(self, timeout: Optional[float]) -> sqlite3.Connection:
+        '''
+        Take an idle read-only connection, opening one if the pool is not full.
+        '''
+        try:
+            return self._idle_readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._readers_lock:
+            if len(self._reader_connections) < self.max_readers:
+                connection = self._open_reader()
+                self._reader_connections.append(connection)
+                return connection
+
+        try:
+            return self._idle_readers.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError(f"No read-only connection became free within {timeout} seconds.")
+
+    def checkpoint(self, mode: str="PASSIVE") -> tuple:
+        '''
+        Copy the write-ahead log back into the database file.
+
+        Parameters
+        ----------
+        mode : str
+            PASSIVE, FULL, RESTART or TRUNCATE.
+
+        Returns
+        -------
+        tuple
+            (busy, log frames, checkpointed frames) as reported by SQLite.
+        '''
+        with self._writer_lock:
+            if self._writer_connection is None:
+                self._writer_connection = self._open_writer()
+            return self._writer_connection.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+    def close(self) -> None:
+        '''
+        Close the writer and every pooled read-only connection.
+
+        Connections that are still lent out are closed as well, so call this only after
+        all reader and writer blocks have exited.
+        '''
+        with self._writer_lock:
+            if self._writer_connection is not None:
+                self._writer_connection.close()
+                self._writer_connection = None
+        with self._readers_lock:
+            for connection in self._reader_connections:
+                connection.close()
+            self._reader_connections = []
+            self._idle_readers = queue.LifoQueue()
@@ -12,6 +12,7 @@ VOICE_WORKS_SALES_COUNT = 'sales_count'
 VOICE_WORKS_REVIEW_COUNT = 'review_count'
 VOICE_WORKS_AGE_ID = 'age_id'
 VOICE_WORKS_FULL_IMAGE_URL = 'full_image_url'
+VOICE_WORKS_FINGERPRINT = 'fingerprint'
 
 # Constants for the Circles Table
 CIRCLES_TABLE = 'circles'
@@ -33,9 +34,65 @@ AGE_RATING_TABLE = 'age_ratings'
 AGE_RATING_PRIMARY_KEY = 'id'
 AGE_RATING_NAME = 'name'
 
+# Constants for the Crawl Runs Table
+CRAWL_RUNS_TABLE = 'crawl_runs'
+CRAWL_RUN_PRIMARY_KEY = 'id'
+CRAWL_RUN_KEY = 'run_key'
+CRAWL_RUN_CRAWLED_AT = 'crawled_at'
+
+# Constants for the Voice Work Snapshots Table
+VOICE_WORK_SNAPSHOTS_TABLE = 'voice_work_snapshots'
+SNAPSHOT_PRODUCT_ID = 'product_id'
+SNAPSHOT_CRAWL_RUN_ID = 'crawl_run_id'
+SNAPSHOT_SALES_COUNT = 'sales_count'
+SNAPSHOT_REVIEW_COUNT = 'review_count'
+SNAPSHOT_PRICE = 'price'
+SNAPSHOT_POINTS = 'points'
+
+# Constants for the Rollup Tables
+CIRCLE_ROLLUPS_TABLE = 'circle_rollups'
+VOICE_ACTOR_ROLLUPS_TABLE = 'voice_actor_rollups'
+PRODUCT_FORMAT_ROLLUPS_TABLE = 'product_format_rollups'
+AGE_RATING_ROLLUPS_TABLE = 'age_rating_rollups'
+ROLLUP_GROUP_ID = 'group_id'
+ROLLUP_WORK_COUNT = 'work_count'
+ROLLUP_SALES_COUNT_SUM = 'sales_count_sum'
+ROLLUP_REVIEW_COUNT_SUM = 'review_count_sum'
+ROLLUP_PRICE_SUM = 'price_sum'
+ROLLUP_REVENUE_SUM = 'revenue_sum'
+ROLLUP_PRICE_MIN = 'price_min'
+ROLLUP_PRICE_MAX = 'price_max'
+ROLLUP_SALES_COUNT_MAX = 'sales_count_max'
+
+# Constants for the Voice Works Title Search Table
+VOICE_WORKS_TITLE_SEARCH_TABLE = 'voice_works_title_search'
+TITLE_SEARCH_PRODUCT_ID = 'product_id'
+TITLE_SEARCH_TITLE = 'title'
+
+# Constants for the Voice Work Tokens Table
+VOICE_WORK_TOKENS_TABLE = 'voice_work_tokens'
+TOKENS_PRODUCT_ID = 'product_id'
+TOKENS_TITLE_HASH = 'title_hash'
+TOKENS_TOKENS = 'tokens'
+TOKENS_AGE_ID = 'age_id'
+TOKENS_CIRCLE_ID = 'circle_id'
+TOKENS_PRODUCT_FORMAT_ID = 'product_format_id'
+
+# Constants for the Term Count Tables
+AGE_RATING_TERM_COUNTS_TABLE = 'age_rating_term_counts'
+CIRCLE_TERM_COUNTS_TABLE = 'circle_term_counts'
+PRODUCT_FORMAT_TERM_COUNTS_TABLE = 'product_format_term_counts'
+TERM_COUNT_GROUP_ID = 'group_id'
+TERM_COUNT_TERM = 'term'
+TERM_COUNT_POS = 'pos'
+TERM_COUNT_FREQUENCY = 'frequency'
+
 # Constants for the Voice Works View
 VOICE_WORKS_VIEW = 'voice_works_view'
 VOICE_WORKS_PRODUCT_FORMAT_VIEW = 'product_format'
 VOICE_WORKS_VIEW_CIRCLE = 'circle'
 VOICE_WORKS_VIEW_VOICE_ACTOR = 'voice_actor'
-VOICE_WORKS_VIEW_AGE = 'age'
\ No newline at end of file
+VOICE_WORKS_VIEW_AGE = 'age'
+
+# Constants for the Materialized Voice Works View
+VOICE_WORKS_MATERIALIZED_VIEW = 'voice_works_view_materialized'
\ No newline at end of file
@@ -0,0 +1,118 @@
+from typing import Iterator, Optional
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .common import SQLiteHandler
+
+# Default number of rows fetched per chunk
+DEFAULT_CHUNK_SIZE = 50000
+
+def _build_chunk(rows: list, columns: list, dtypes: dict) -> pd.DataFrame:
+    '''
+    Build a DataFrame from fetched rows, converting each column straight to its dtype.
+    '''
+    if not rows:
+        return pd.DataFrame({column: pd.Series([], dtype=dtypes.get(column, object)) for column in columns})
+    return pd.DataFrame({
+        column: pd.Series(values, dtype=dtypes.get(column))
+        for column, values in zip(columns, zip(*rows))
+    })
+
+def iter_dataframe_chunks(
+    db_connection: SQLiteHandler,
+    query: str,
+    params: Optional[tuple]=None,
+    dtypes: Optional[dict]=None,
+    chunk_size: int=DEFAULT_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    '''
+    Run a query and yield its result as DataFrames of at most `chunk_size` rows.
+
+    Only one chunk of Python tuples exists at a time, and each column is converted to its
+    dtype directly. Categorical columns get the categories of their own chunk; use
+    `read_dataframe` for a single frame with shared categories. The query runs on a
+    cursor of its own, so other queries can use the connection between chunks.
+
+    Parameters
+    ----------
+    db_connection : SQLiteHandler
+        Database connection handler.
+    query : str
+        The SQL query to execute.
+    params : tuple, optional
+        Parameters for the query.
+    dtypes : dict, optional
+        Dtype per column name, e.g. "category" or "Int32". Other columns are inferred.
+    chunk_size : int
+        Maximum number of rows per chunk.
+
+    Yields
+    ------
+    pd.DataFrame
+        The next chunk of the result. Nothing is yielded for an empty result.
+    '''
+    dtypes = dtypes or {}
+    cursor = db_connection.open_cursor()
+    try:
+        cursor.execute(query, params or ())
+        columns = [description[0] for description in cursor.description]
+        while rows := cursor.fetchmany(chunk_size):
+            yield _build_chunk(rows, columns, dtypes)
+    finally:
+        cursor.close()
+
+def read_dataframe(
+    db_connection: SQLiteHandler,
+    query: str,
+    params: Optional[tuple]=None,
+    dtypes: Optional[dict]=None,
+    chunk_size: int=DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    '''
+    Run a query and load its result into one DataFrame with explicit dtypes.
+
+    The result is read in chunks, so the rows are never held as Python tuples and as a
+    DataFrame at the same time. Categorical columns of the chunks are merged into one
+    set of sorted categories.
+
+    Parameters
+    ----------
+    db_connection : SQLiteHandler
+        Database connection handler.
+    query : str
+        The SQL query to execute.
+    params : tuple, optional
+        Parameters for the query.
+    dtypes : dict, optional
+        Dtype per column name, e.g. "category" or "Int32". Other columns are inferred.
+    chunk_size : int
+        Number of rows fetched at a time.
+
+    Returns
+    -------
+    pd.DataFrame
+        The result of the query, empty with the query's columns if there are no rows.
+    '''
+    dtypes = dtypes or {}
+    chunks = list(iter_dataframe_chunks(db_connection, query, params, dtypes, chunk_size))
+    if not chunks:
+        cursor = db_connection.open_cursor()
+        try:
+            columns = [description[0] for description in cursor.execute(query, params or ()).description]
+        finally:
+            cursor.close()
+        return _build_chunk([], columns, dtypes)
+    if len(chunks) == 1:
+        return chunks[0]
+
+    data = {}
+    for column, dtype in chunks[0].dtypes.items():
+        parts = [chunk[column] for chunk in chunks]
+        if isinstance(dtype, pd.CategoricalDtype):
+            data[column] = pd.Series(union_categoricals(parts, sort_categories=True), name=column)
+        else:
+            data[column] = pd.concat(parts, ignore_index=True)
+        for chunk in chunks:
+            del chunk[column]
+    return pd.DataFrame(data)
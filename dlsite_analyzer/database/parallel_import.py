@@ -0,0 +1,223 @@
+import json
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, Optional
+
+from .bulk_import import VoiceWorksBulkImporter, validate_voice_work
+from .connection_manager import ConnectionManager
+from ..utils import Logger, decode_ndjson_lines
+
+logger = Logger.get_logger(__name__)
+
+# Kinds of raw record blocks handed to the decode workers
+BLOCK_NDJSON = 'ndjson'
+BLOCK_JSON = 'json'
+
+# Marks the end of the writer queue
+_SENTINEL = object()
+
+def _decode_block(source: str, kind: str, data: bytes) -> tuple[list, int]:
+    '''
+    Decode and validate a block of raw records in a worker process.
+
+    Parameters
+    ----------
+    source : str
+        Name of the record file and block, used in error messages.
+    kind : str
+        BLOCK_NDJSON for NDJSON lines, BLOCK_JSON for a legacy per-page JSON file.
+    data : bytes
+        Raw contents of the block.
+
+    Returns
+    -------
+    tuple[list, int]
+        Valid voice works and the number of invalid records.
+    '''
+    try:
+        records = decode_ndjson_lines(data) if kind == BLOCK_NDJSON else json.loads(data)
+    except ValueError as e:
+        logger.error(f"Failed to decode {source}: {e}")
+        return [], 1
+
+    works = []
+    invalid = 0
+    for record in records:
+        try:
+            works.append(validate_voice_work(record))
+        except ValueError as e:
+            logger.error(f"Failed to insert voice work data from {source}: {e}")
+            invalid += 1
+    return works, invalid
+
+class SingleWriterImport:
+    '''
+    Owns the only database connection of an import on a dedicated writer thread.
+
+    Other threads hand over validated voice works through a bounded queue, and the writer
+    imports them with VoiceWorksBulkImporter, committing once per batch. Keeping every
+    write on one connection avoids lock contention, and the bounded queue makes producers
+    wait when the writer falls behind.
+    '''
+    def __init__(self, db_path: str, batch_size: int=10000, queue_size: int=8, crawl_run_key: Optional[str]=None):
+        '''
+        Initialize the writer.
+
+        Parameters
+        ----------
+        db_path : str
+            Path to the SQLite database file.
+        batch_size : int
+            Number of voice works written and committed per batch.
+        queue_size : int
+            Maximum number of work lists waiting for the writer.
+        crawl_run_key : str, optional
+            Run ID of the crawl the works come from, used to record snapshots.
+        '''
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.crawl_run_key = crawl_run_key
+        self.processed = 0
+        self.changed = 0
+        self.snapshots = 0
+        self.skipped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._source = None
+        self._thread = threading.Thread(target=self._run, name="import-writer", daemon=True)
+
+    def __enter__(self) -> 'SingleWriterImport':
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        '''
+        Wait for the writer to drain the queue, and re-raise its error if it failed.
+        '''
+        self._put(_SENTINEL)
+        self._thread.join()
+        if self._error is not None and exc_type is None:
+            raise RuntimeError(self._error_message())
+
+    def submit(self, works: list, source: Optional[str]=None) -> None:
+        '''
+        Queue voice works for the writer, waiting while the queue is full.
+
+        Parameters
+        ----------
+        works : list
+            Validated voice work data.
+        source : str, optional
+            Name of the record file and block the works come from, used in error messages.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer has failed.
+        '''
+        self._put((source, works))
+        if self._error is not None:
+            raise RuntimeError(self._error_message())
+
+    def _put(self, item) -> None:
+        '''
+        Put an item on the queue unless the writer has stopped.
+        '''
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self) -> None:
+        '''
+        Writer thread: import every queued work list until the sentinel arrives.
+        '''
+        try:
+            with ConnectionManager(self.db_path) as manager, manager.writer() as db_connection:
+                with VoiceWorksBulkImporter(db_connection, self.batch_size, self.crawl_run_key) as importer:
+                    while (item := self._queue.get()) is not _SENTINEL:
+                        self._source, works = item
+                        importer.add_many(works)
+            self.processed = importer.processed
+            self.changed = importer.changed
+            self.snapshots = importer.snapshots
+            self.skipped = importer.skipped
+        except Exception as e:
+            self._error = e
+            logger.error(self._error_message())
+
+    def _error_message(self) -> str:
+        '''
+        Describe the writer error with the block the writer was importing when it failed.
+        '''
+        if self._source is None:
+            return f"Import writer failed: {self._error}"
+        return f"Import writer failed on {self._source}: {self._error}"
+
+def _submit_decoded(writer: SingleWriterImport, source: str, future: Future) -> int:
+    '''
+    Hand the voice works of a decoded block to the writer and return its number of invalid records.
+    '''
+    try:
+        works, invalid = future.result()
+    except Exception as e:
+        raise RuntimeError(f"Failed to decode {source}: {e}") from e
+    writer.submit(works, source)
+    return invalid
+
+def import_blocks_in_parallel(
+    db_path: str,
+    blocks: Iterable[tuple[str, str, bytes]],
+    max_workers: Optional[int]=None,
+    batch_size: int=10000,
+    queue_size: int=8,
+    crawl_run_key: Optional[str]=None,
+) -> SingleWriterImport:
+    '''
+    Decode and validate raw record blocks in a process pool and import them through a single writer.
+
+    Blocks are decoded in parallel with at most twice `max_workers` blocks in flight, and
+    their voice works are handed to the writer in input order. Throughput grows with the
+    number of workers until the writer thread becomes the bottleneck.
+
+    Parameters
+    ----------
+    db_path : str
+        Path to the SQLite database file.
+    blocks : Iterable[tuple[str, str, bytes]]
+        Name of the record file and block, block kind (BLOCK_NDJSON or BLOCK_JSON) and raw contents.
+    max_workers : int, optional
+        Number of decode worker processes (default is the number of CPU cores).
+    batch_size : int
+        Number of voice works written and committed per batch.
+    queue_size : int
+        Maximum number of decoded blocks waiting for the writer.
+    crawl_run_key : str, optional
+        Run ID of the crawl the blocks come from, used to record snapshots.
+
+    Returns
+    -------
+    SingleWriterImport
+        The finished writer, holding the import counts. Records rejected by the workers are added to `skipped`.
+    '''
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_workers * 2
+    in_flight = deque()
+    invalid = 0
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor, SingleWriterImport(db_path, batch_size, queue_size, crawl_run_key) as writer:
+        for source, kind, data in blocks:
+            in_flight.append((source, executor.submit(_decode_block, source, kind, data)))
+            if len(in_flight) >= max_in_flight:
+                invalid += _submit_decoded(writer, *in_flight.popleft())
+
+        while in_flight:
+            invalid += _submit_decoded(writer, *in_flight.popleft())
+
+    writer.skipped += invalid
+    return writer
@@ -0,0 +1,109 @@
+import re
+from typing import Iterable, Optional
+
+from .common import SQLiteHandler
+
+# Plan step reading a table row by row, in rowid order or in the order of an index
+_SCAN_PATTERN = re.compile(r"^SCAN (\w+)(?: AS \w+)?(?: USING (COVERING )?INDEX (\w+))?$")
+
+# LIMIT clause ending a query
+_LIMIT_PATTERN = re.compile(r"\bLIMIT\s+(?:\?|\d+)(?:\s+OFFSET\s+(?:\?|\d+))?\s*$", re.IGNORECASE)
+
+def explain_query_plan(db_connection: SQLiteHandler, query: str, params: Optional[tuple]=None) -> list:
+    '''
+    Retrieve the query plan SQLite chooses for a query.
+
+    Parameters
+    ----------
+    db_connection : SQLiteHandler
+        Database connection handler.
+    query : str
+        The SQL query to explain.
+    params : tuple, optional
+        Parameters for the query. Their values do not change the plan, but every
+        placeholder needs one.
+
+    Returns
+    -------
+    list
+        Detail text of every plan step, e.g. "SEARCH voice_works USING INDEX ...".
+    '''
+    res = db_connection.execute_query(f"EXPLAIN QUERY PLAN {query}", params)
+    return [row[3] for row in res.fetchall()]
+
+def find_full_scans(db_connection: SQLiteHandler, plan: list, allowed_tables: Iterable=(), limited: bool=False) -> list:
+    '''
+    Find the tables a query plan reads in full.
+
+    A scan in the order of an index ("SCAN ... USING INDEX") still visits every row, so it
+    is reported too, unless the index covers the query ("USING COVERING INDEX") or the
+    query has a LIMIT that stops the scan early. Scans of subqueries and CTEs are not
+    reported.
+
+    Parameters
+    ----------
+    db_connection : SQLiteHandler
+        Database connection handler, used to tell tables from subqueries.
+    plan : list
+        Plan steps returned by `explain_query_plan`.
+    allowed_tables : Iterable, optional
+        Tables the query is expected to read in full.
+    limited : bool
+        Whether the query ends with a LIMIT.
+
+    Returns
+    -------
+    list
+        Names of the fully scanned tables, in plan order.
+    '''
+    res = db_connection.execute_query("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = {row[0] for row in res.fetchall()} - set(allowed_tables)
+    full_scans = []
+    for match in map(_SCAN_PATTERN.match, plan):
+        if not match or match.group(1) not in tables:
+            continue
+        table, covering, index = match.groups()
+        if index is not None and (covering or limited):
+            continue
+        full_scans.append(table)
+    return full_scans
+
+def verify_query_plan(
+    db_connection: SQLiteHandler,
+    query: str,
+    params: Optional[tuple]=None,
+    allowed_tables: Iterable=(),
+) -> list:
+    '''
+    Check that a query reads no table in full, except the allowed ones.
+
+    Scans in index order are accepted only with a covering index or when the query ends
+    with a LIMIT (see `find_full_scans`).
+
+    Parameters
+    ----------
+    db_connection : SQLiteHandler
+        Database connection handler.
+    query : str
+        The SQL query to check.
+    params : tuple, optional
+        Parameters for the query.
+    allowed_tables : Iterable, optional
+        Tables the query is expected to read in full.
+
+    Returns
+    -------
+    list
+        The query plan.
+
+    Raises
+    ------
+    RuntimeError
+        If the plan contains a full table scan.
+    '''
+    plan = explain_query_plan(db_connection, query, params)
+    limited = _LIMIT_PATTERN.search(query.strip()) is not None
+    full_scans = find_full_scans(db_connection, plan, allowed_tables, limited)
+    if full_scans:
+        raise RuntimeError(f"Full scan of {', '.join(full_scans)} in query plan: {'; '.join(plan)}")
+    return plan
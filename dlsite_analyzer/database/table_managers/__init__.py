@@ -1,13 +1,25 @@
 from .age_rating import AgeRatingTableHandler
 from .circles import CirclesTableHandler
+from .crawl_runs import CrawlRunsTableHandler
 from .product_format import ProductFormatTableHandler
 from .voice_authors import VoiceActorsTableHandler
 from .voice_works import VoiceWorksTableHandler
+from .voice_work_snapshots import VoiceWorkSnapshotsTableHandler
+from .voice_work_rollups import VoiceWorkRollupsTableHandler
+from .voice_works_title_search import VoiceWorksTitleSearchTableHandler
+from .voice_work_tokens import VoiceWorkTokensTableHandler
+from .term_counts import TermCountsTableHandler
 
 __all__ = [
     'AgeRatingTableHandler',
     'CirclesTableHandler',
+    'CrawlRunsTableHandler',
     'ProductFormatTableHandler',
     'VoiceActorsTableHandler',
-    'VoiceWorksTableHandler'
+    'VoiceWorksTableHandler',
+    'VoiceWorkSnapshotsTableHandler',
+    'VoiceWorkRollupsTableHandler',
+    'VoiceWorksTitleSearchTableHandler',
+    'VoiceWorkTokensTableHandler',
+    'TermCountsTableHandler'
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from ..common import SQLiteHandler, TableHandlerInterface
+from ..common import SQLiteHandler, TableHandlerInterface, IndexDefinition
 from ..constants import CIRCLES_TABLE, CIRCLE_PRIMARY_KEY, CIRCLE_NAME
 
 class CirclesTableHandler(TableHandlerInterface):
@@ -22,4 +22,5 @@ class CirclesTableHandler(TableHandlerInterface):
             CIRCLE_PRIMARY_KEY: "TEXT PRIMARY KEY",
             CIRCLE_NAME: "TEXT NOT NULL",
         }
-        super().__init__(db_connection, table_name, columns_with_types, CIRCLE_PRIMARY_KEY)
+        indexes = [IndexDefinition([CIRCLE_NAME])]
+        super().__init__(db_connection, table_name, columns_with_types, CIRCLE_PRIMARY_KEY, indexes=indexes)
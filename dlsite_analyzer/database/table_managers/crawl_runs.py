@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pandas as pd
+from ..common import SQLiteHandler, TableHandlerInterface
+from ..constants import (
+    CRAWL_RUNS_TABLE,
+    CRAWL_RUN_PRIMARY_KEY,
+    CRAWL_RUN_KEY,
+    CRAWL_RUN_CRAWLED_AT,
+)
+
+# Format of the run IDs written to the crawl manifest
+CRAWL_RUN_KEY_FORMAT = "%Y-%m-%d-%H%M%S"
+
+class CrawlRunsTableHandler(TableHandlerInterface):
+    '''
+    A handler for managing the Crawl Runs table in the database.
+
+    The ID of a crawl run is the Unix time at which the crawl started, so run IDs
+    sort chronologically no matter in which order the crawls are imported.
+    '''
+    def __init__(self, db_connection: SQLiteHandler):
+        '''
+        Initialize the CrawlRunsTableHandler.
+
+        Parameters
+        ----------
+        db_connection : SQLiteHandler
+            A database connection handler.
+        '''
+        table_name = CRAWL_RUNS_TABLE
+        columns_with_types = {
+            CRAWL_RUN_PRIMARY_KEY: "INTEGER PRIMARY KEY",
+            CRAWL_RUN_KEY: "TEXT UNIQUE NOT NULL",
+            CRAWL_RUN_CRAWLED_AT: "TEXT NOT NULL",
+        }
+        super().__init__(db_connection, table_name, columns_with_types, CRAWL_RUN_PRIMARY_KEY)
+
+    def register_run(self, run_key: str) -> int:
+        '''
+        Register a crawl run if it is not registered yet.
+
+        Parameters
+        ----------
+        run_key : str
+            Run ID of the crawl manifest, formatted as CRAWL_RUN_KEY_FORMAT.
+
+        Returns
+        -------
+        int
+            The ID of the crawl run.
+
+        Raises
+        ------
+        ValueError
+            If the run key does not match CRAWL_RUN_KEY_FORMAT.
+        '''
+        crawled_at = datetime.strptime(run_key, CRAWL_RUN_KEY_FORMAT)
+        run_id = int(crawled_at.timestamp())
+        self.insert({
+            CRAWL_RUN_PRIMARY_KEY: run_id,
+            CRAWL_RUN_KEY: run_key,
+            CRAWL_RUN_CRAWLED_AT: crawled_at.isoformat(timespec="seconds"),
+        })
+        return run_id
+
+    def get_all_runs(self) -> pd.DataFrame:
+        '''
+        Retrieve all crawl runs in chronological order.
+
+        Returns
+        -------
+        pd.DataFrame
+            A DataFrame containing the crawl runs.
+        '''
+        query = f"SELECT * FROM {self.table_name} ORDER BY {self.primary_key}"
+        try:
+            res = self.db_connection.execute_query(query)
+            return pd.DataFrame(res.fetchall(), columns=self.columns_with_types.keys())
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch crawl runs: {e}")
@@ -0,0 +1,168 @@
+from typing import Iterable, Optional
+
+import pandas as pd
+from ..common import SQLiteHandler, TableHandlerInterface
+from ..constants import (
+    VOICE_WORKS_CIRCLE_ID,
+    VOICE_WORKS_PRODUCT_FORMAT_ID,
+    VOICE_WORKS_AGE_ID,
+    CIRCLES_TABLE, CIRCLE_PRIMARY_KEY, CIRCLE_NAME,
+    PRODUCT_FORMAT_TABLE, PRODUCT_FORMAT_PRIMARY_KEY, PRODUCT_FORMAT_NAME,
+    AGE_RATING_TABLE, AGE_RATING_PRIMARY_KEY, AGE_RATING_NAME,
+    AGE_RATING_TERM_COUNTS_TABLE,
+    CIRCLE_TERM_COUNTS_TABLE,
+    PRODUCT_FORMAT_TERM_COUNTS_TABLE,
+    TERM_COUNT_GROUP_ID,
+    TERM_COUNT_TERM,
+    TERM_COUNT_POS,
+    TERM_COUNT_FREQUENCY,
+)
+
+# Term count tables with the voice works column they group by, its type, and the table naming the groups
+TERM_COUNT_DIMENSIONS = {
+    AGE_RATING_TERM_COUNTS_TABLE: (VOICE_WORKS_AGE_ID, "INTEGER", AGE_RATING_TABLE, AGE_RATING_PRIMARY_KEY, AGE_RATING_NAME),
+    CIRCLE_TERM_COUNTS_TABLE: (VOICE_WORKS_CIRCLE_ID, "TEXT", CIRCLES_TABLE, CIRCLE_PRIMARY_KEY, CIRCLE_NAME),
+    PRODUCT_FORMAT_TERM_COUNTS_TABLE: (
+        VOICE_WORKS_PRODUCT_FORMAT_ID, "INTEGER", PRODUCT_FORMAT_TABLE, PRODUCT_FORMAT_PRIMARY_KEY, PRODUCT_FORMAT_NAME,
+    ),
+}
+
+class TermCountsTableHandler(TableHandlerInterface):
+    '''
+    A handler for managing a table of title term frequencies per group of voice works.
+
+    The table holds how often each word (with its part of speech) occurs in the titles of
+    the works of each age rating, circle or product format. VoiceWorkTermIndexer applies
+    the changes of every import as deltas, so word counts for a wordcloud are read from
+    this table instead of analyzing the titles again.
+    '''
+    def __init__(self, db_connection: SQLiteHandler, table_name: str=AGE_RATING_TERM_COUNTS_TABLE):
+        '''
+        Initialize the TermCountsTableHandler.
+
+        Parameters
+        ----------
+        db_connection : SQLiteHandler
+            A database connection handler.
+        table_name : str
+            One of the tables in TERM_COUNT_DIMENSIONS, default is the age rating term counts.
+        '''
+        if table_name not in TERM_COUNT_DIMENSIONS:
+            raise ValueError(f"Unknown term count table: {table_name}")
+        self.group_column, group_type, self.group_table, self.group_primary_key, self.group_name = TERM_COUNT_DIMENSIONS[table_name]
+
+        columns_with_types = {
+            TERM_COUNT_GROUP_ID: f"{group_type} NOT NULL",
+            TERM_COUNT_TERM: "TEXT NOT NULL",
+            TERM_COUNT_POS: "TEXT NOT NULL",
+            TERM_COUNT_FREQUENCY: "INTEGER NOT NULL",
+        }
+        super().__init__(db_connection, table_name, columns_with_types, TERM_COUNT_GROUP_ID)
+
+    def create_table(self) -> None:
+        '''
+        Create the table clustered by (group_id, term, pos).
+
+        WITHOUT ROWID stores the terms of a group contiguously, so the counts of a group
+        are read with a single range scan.
+        '''
+        columns = ', '.join([f"{col} {dtype}" for col, dtype in self.columns_with_types.items()])
+        query = f'''
+        CREATE TABLE IF NOT EXISTS {self.table_name} (
+            {columns}, PRIMARY KEY ({TERM_COUNT_GROUP_ID}, {TERM_COUNT_TERM}, {TERM_COUNT_POS})
+        ) WITHOUT ROWID
+        '''
+        self.db_connection.execute_query(query)
+        self.db_connection.commit()
+
+    def apply_deltas(self, deltas: dict) -> None:
+        '''
+        Add frequency deltas to the table, removing the terms whose frequency drops to zero.
+
+        Parameters
+        ----------
+        deltas : dict
+            Map from (group ID, term, part of speech) to the change of its frequency.
+        '''
+        key = f"{TERM_COUNT_GROUP_ID}, {TERM_COUNT_TERM}, {TERM_COUNT_POS}"
+        upsert_query = (
+            f"INSERT INTO {self.table_name} ({key}, {TERM_COUNT_FREQUENCY}) VALUES (?, ?, ?, ?) "
+            f"ON CONFLICT ({key}) DO UPDATE SET {TERM_COUNT_FREQUENCY} = {TERM_COUNT_FREQUENCY} + excluded.{TERM_COUNT_FREQUENCY}"
+        )
+        delete_query = (
+            f"DELETE FROM {self.table_name} WHERE {TERM_COUNT_GROUP_ID} = ? AND {TERM_COUNT_TERM} = ? "
+            f"AND {TERM_COUNT_POS} = ? AND {TERM_COUNT_FREQUENCY} <= 0"
+        )
+        changes = [(*group_term, delta) for group_term, delta in deltas.items() if delta]
+        try:
+            self.db_connection.executemany_query(upsert_query, changes)
+            self.db_connection.executemany_query(delete_query, [change[:3] for change in changes if change[3] < 0])
+        except Exception as e:
+            raise RuntimeError(f"Failed to update {self.table_name}: {e}")
+
+    def clear(self) -> None:
+        '''
+        Delete every term count.
+        '''
+        try:
+            self.db_connection.execute_query(f"DELETE FROM {self.table_name}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to clear {self.table_name}: {e}")
+
+    def get_term_counts(
+        self,
+        names: Optional[Iterable[str]]=None,
+        target_pos: Optional[Iterable[str]]=None,
+        stop_words: Iterable[str]=(),
+        limit: Optional[int]=None,
+    ) -> pd.Series:
+        '''
+        Retrieve the term frequencies of some groups, or of all works.
+
+        Parameters
+        ----------
+        names : Iterable[str], optional
+            Names of the age ratings, circles or product formats to sum (default is every group).
+        target_pos : Iterable[str], optional
+            Parts of speech to keep, e.g. ["名詞", "動詞", "形容詞"] (default is every part of speech).
+        stop_words : Iterable[str]
+            Terms to leave out.
+        limit : int, optional
+            Maximum number of terms.
+
+        Returns
+        -------
+        pd.Series
+            Frequency per term, most frequent first, like `value_counts` of the tokens.
+            A term tagged with several parts of speech is counted once with their sum.
+        '''
+        conditions = []
+        params = []
+        for column, values in ((TERM_COUNT_POS, target_pos), (TERM_COUNT_TERM, stop_words)):
+            values = list(values or ())
+            if values:
+                negation = "NOT " if column == TERM_COUNT_TERM else ""
+                conditions.append(f"{column} {negation}IN ({', '.join('?' for _ in values)})")
+                params += values
+        if names is not None:
+            names = list(names)
+            conditions.append(
+                f"{TERM_COUNT_GROUP_ID} IN (SELECT {self.group_primary_key} FROM {self.group_table} "
+                f"WHERE {self.group_name} IN ({', '.join('?' for _ in names)}))"
+            )
+            params += names
+
+        query = f"SELECT {TERM_COUNT_TERM}, SUM({TERM_COUNT_FREQUENCY}) AS {TERM_COUNT_FREQUENCY} FROM {self.table_name}"
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        query += f" GROUP BY {TERM_COUNT_TERM} ORDER BY {TERM_COUNT_FREQUENCY} DESC, {TERM_COUNT_TERM}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        try:
+            rows = self.db_connection.execute_query(query, tuple(params)).fetchall()
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch term counts from {self.table_name}: {e}")
+        return pd.Series(
+            [frequency for _, frequency in rows], index=[term for term, _ in rows], name=TERM_COUNT_FREQUENCY, dtype="int64",
+        )
@@ -0,0 +1,300 @@
+from typing import Optional
+
+import pandas as pd
+from ..common import SQLiteHandler, TableHandlerInterface, IndexDefinition
+from ..dataframe_loader import read_dataframe
+from ..constants import (
+    VOICE_WORKS_TABLE,
+    VOICE_WORKS_CIRCLE_ID,
+    VOICE_WORKS_VOICE_ACTOR_ID,
+    VOICE_WORKS_PRODUCT_FORMAT_ID,
+    VOICE_WORKS_AGE_ID,
+    VOICE_WORKS_PRICE,
+    VOICE_WORKS_SALES_COUNT,
+    VOICE_WORKS_REVIEW_COUNT,
+    CIRCLES_TABLE, CIRCLE_PRIMARY_KEY, CIRCLE_NAME,
+    VOICE_ACTORS_TABLE, VOICE_ACTOR_PRIMARY_KEY, VOICE_ACTOR_NAME,
+    PRODUCT_FORMAT_TABLE, PRODUCT_FORMAT_PRIMARY_KEY, PRODUCT_FORMAT_NAME,
+    AGE_RATING_TABLE, AGE_RATING_PRIMARY_KEY, AGE_RATING_NAME,
+    CIRCLE_ROLLUPS_TABLE,
+    VOICE_ACTOR_ROLLUPS_TABLE,
+    PRODUCT_FORMAT_ROLLUPS_TABLE,
+    AGE_RATING_ROLLUPS_TABLE,
+    ROLLUP_GROUP_ID,
+    ROLLUP_WORK_COUNT,
+    ROLLUP_SALES_COUNT_SUM,
+    ROLLUP_REVIEW_COUNT_SUM,
+    ROLLUP_PRICE_SUM,
+    ROLLUP_REVENUE_SUM,
+    ROLLUP_PRICE_MIN,
+    ROLLUP_PRICE_MAX,
+    ROLLUP_SALES_COUNT_MAX,
+)
+
+# Rollup tables with the voice works column they group by, its type, and the table naming the groups
+ROLLUP_DIMENSIONS = {
+    CIRCLE_ROLLUPS_TABLE: (VOICE_WORKS_CIRCLE_ID, "TEXT", CIRCLES_TABLE, CIRCLE_PRIMARY_KEY, CIRCLE_NAME),
+    VOICE_ACTOR_ROLLUPS_TABLE: (
+        VOICE_WORKS_VOICE_ACTOR_ID, "INTEGER", VOICE_ACTORS_TABLE, VOICE_ACTOR_PRIMARY_KEY, VOICE_ACTOR_NAME,
+    ),
+    PRODUCT_FORMAT_ROLLUPS_TABLE: (
+        VOICE_WORKS_PRODUCT_FORMAT_ID, "INTEGER", PRODUCT_FORMAT_TABLE, PRODUCT_FORMAT_PRIMARY_KEY, PRODUCT_FORMAT_NAME,
+    ),
+    AGE_RATING_ROLLUPS_TABLE: (VOICE_WORKS_AGE_ID, "INTEGER", AGE_RATING_TABLE, AGE_RATING_PRIMARY_KEY, AGE_RATING_NAME),
+}
+
+# Additive metrics and the voice works columns whose product each one sums
+ROLLUP_SUMS = {
+    ROLLUP_SALES_COUNT_SUM: (VOICE_WORKS_SALES_COUNT,),
+    ROLLUP_REVIEW_COUNT_SUM: (VOICE_WORKS_REVIEW_COUNT,),
+    ROLLUP_PRICE_SUM: (VOICE_WORKS_PRICE,),
+    ROLLUP_REVENUE_SUM: (VOICE_WORKS_PRICE, VOICE_WORKS_SALES_COUNT),
+}
+
+# Extreme metrics with the voice works column and the aggregate function
+ROLLUP_EXTREMES = {
+    ROLLUP_PRICE_MIN: (VOICE_WORKS_PRICE, "MIN"),
+    ROLLUP_PRICE_MAX: (VOICE_WORKS_PRICE, "MAX"),
+    ROLLUP_SALES_COUNT_MAX: (VOICE_WORKS_SALES_COUNT, "MAX"),
+}
+
+# Metrics groups can be ranked by
+ROLLUP_METRICS = (ROLLUP_WORK_COUNT, *ROLLUP_SUMS, *ROLLUP_EXTREMES)
+
+def _product(columns: tuple, row: str="") -> str:
+    '''
+    Build the product of voice works columns, optionally of the NEW or OLD row of a trigger.
+    '''
+    return ' * '.join(f"{row}.{column}" if row else column for column in columns)
+
+class VoiceWorkRollupsTableHandler(TableHandlerInterface):
+    '''
+    A handler for managing a rollup table of voice works in the database.
+
+    A rollup table keeps one row of pre-aggregated metrics per circle, voice actor,
+    product format or age rating: the number of works, the sums of sales, reviews,
+    prices and estimated revenue (price x sales), and the extremes of price and sales.
+    Triggers on the voice works table apply every insert, update and delete as a delta,
+    so imports keep the rollups current, and summaries are read from a table with one
+    row per group instead of aggregating the whole catalog.
+    '''
+    def __init__(self, db_connection: SQLiteHandler, table_name: str=CIRCLE_ROLLUPS_TABLE):
+        '''
+        Initialize the VoiceWorkRollupsTableHandler.
+
+        Parameters
+        ----------
+        db_connection : SQLiteHandler
+            A database connection handler.
+        table_name : str
+            One of the rollup tables in ROLLUP_DIMENSIONS, default is the circle rollups.
+        '''
+        if table_name not in ROLLUP_DIMENSIONS:
+            raise ValueError(f"Unknown rollup table: {table_name}")
+        self.group_column, group_type, self.group_table, self.group_primary_key, self.group_name = ROLLUP_DIMENSIONS[table_name]
+
+        columns_with_types = {
+            ROLLUP_GROUP_ID: f"{group_type} PRIMARY KEY",
+            ROLLUP_WORK_COUNT: "INTEGER NOT NULL",
+            **{column: "INTEGER NOT NULL" for column in ROLLUP_SUMS},
+            **{column: "INTEGER" for column in ROLLUP_EXTREMES},
+        }
+        indexes = [IndexDefinition([ROLLUP_SALES_COUNT_SUM]), IndexDefinition([ROLLUP_REVENUE_SUM])]
+        super().__init__(db_connection, table_name, columns_with_types, ROLLUP_GROUP_ID, indexes=indexes)
+
+    def create_table(self) -> None:
+        '''
+        Create the table, filled from the voice works already stored.
+        '''
+        query = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+        exists = self.db_connection.execute_query(query, (self.table_name,)).fetchone() is not None
+        super().create_table()
+        if not exists:
+            self.rebuild()
+
+    def create_triggers(self) -> None:
+        '''
+        Create the triggers applying changes of the voice works table to the rollups.
+        '''
+        for query in self._build_trigger_queries():
+            self.db_connection.execute_query(query)
+        self.db_connection.commit()
+
+    def _build_trigger_queries(self) -> list:
+        '''
+        Build the triggers applying inserted, updated and deleted works to their groups.
+
+        Sums are updated as deltas. A minimum or maximum cannot be updated that way when
+        the value of the extreme work gets worse or the work leaves the group, so only then
+        is it recomputed from the works of the group. Groups without works are removed.
+
+        Returns
+        -------
+        list
+            CREATE TRIGGER statements.
+        '''
+        group_column = self.group_column
+        values_changed = ' OR '.join(
+            f"OLD.{column} IS NOT NEW.{column}" for column in (VOICE_WORKS_PRICE, VOICE_WORKS_SALES_COUNT, VOICE_WORKS_REVIEW_COUNT)
+        )
+
+        def trigger(name: str, event: str, condition: str, body: list) -> str:
+            statements = ' '.join(f"{statement};" for statement in body)
+            return (
+                f"CREATE TRIGGER IF NOT EXISTS trg_{self.table_name}_{name} AFTER {event} ON {VOICE_WORKS_TABLE} "
+                f"WHEN {condition} BEGIN {statements} END"
+            )
+
+        def recompute(column: str, row: str) -> str:
+            source, function = ROLLUP_EXTREMES[column]
+            return f"(SELECT {function}({source}) FROM {VOICE_WORKS_TABLE} WHERE {group_column} = {row}.{group_column})"
+
+        def improves(column: str, value: str) -> str:
+            _, function = ROLLUP_EXTREMES[column]
+            return f"{value} IS NOT NULL AND ({column} IS NULL OR {value} {'<' if function == 'MIN' else '>'} {column})"
+
+        def add(row: str) -> str:
+            sums = {column: f"COALESCE({_product(sources, row)}, 0)" for column, sources in ROLLUP_SUMS.items()}
+            extremes = {column: f"{row}.{source}" for column, (source, _) in ROLLUP_EXTREMES.items()}
+            columns = [ROLLUP_GROUP_ID, ROLLUP_WORK_COUNT, *sums, *extremes]
+            values = [f"{row}.{group_column}", "1", *sums.values(), *extremes.values()]
+            assignments = [
+                f"{ROLLUP_WORK_COUNT} = {ROLLUP_WORK_COUNT} + 1",
+                *(f"{column} = {column} + excluded.{column}" for column in sums),
+                *(
+                    f"{column} = CASE WHEN {improves(column, f'excluded.{column}')} THEN excluded.{column} ELSE {column} END"
+                    for column in ROLLUP_EXTREMES
+                ),
+            ]
+            return (
+                f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({', '.join(values)}) "
+                f"ON CONFLICT ({ROLLUP_GROUP_ID}) DO UPDATE SET {', '.join(assignments)}"
+            )
+
+        def remove(row: str) -> list:
+            group = f"{ROLLUP_GROUP_ID} = {row}.{group_column}"
+            subtractions = [
+                f"{ROLLUP_WORK_COUNT} = {ROLLUP_WORK_COUNT} - 1",
+                *(f"{column} = {column} - COALESCE({_product(sources, row)}, 0)" for column, sources in ROLLUP_SUMS.items()),
+            ]
+            recomputed = [f"{column} = {recompute(column, row)}" for column in ROLLUP_EXTREMES]
+            was_extreme = ' OR '.join(f"{row}.{source} IS {column}" for column, (source, _) in ROLLUP_EXTREMES.items())
+            return [
+                f"UPDATE {self.table_name} SET {', '.join(subtractions)} WHERE {group}",
+                f"UPDATE {self.table_name} SET {', '.join(recomputed)} WHERE {group} AND ({was_extreme})",
+                f"DELETE FROM {self.table_name} WHERE {group} AND {ROLLUP_WORK_COUNT} <= 0",
+            ]
+
+        def update_in_place() -> str:
+            assignments = [
+                *(
+                    f"{column} = {column} + COALESCE({_product(sources, 'NEW')}, 0) - COALESCE({_product(sources, 'OLD')}, 0)"
+                    for column, sources in ROLLUP_SUMS.items()
+                ),
+                *(
+                    f"{column} = CASE WHEN {improves(column, f'NEW.{source}')} THEN NEW.{source} "
+                    f"WHEN OLD.{source} IS {column} AND NEW.{source} IS NOT OLD.{source} THEN {recompute(column, 'NEW')} "
+                    f"ELSE {column} END"
+                    for column, (source, _) in ROLLUP_EXTREMES.items()
+                ),
+            ]
+            return f"UPDATE {self.table_name} SET {', '.join(assignments)} WHERE {ROLLUP_GROUP_ID} = NEW.{group_column}"
+
+        moved = f"OLD.{group_column} IS NOT NEW.{group_column}"
+        return [
+            trigger("insert", "INSERT", f"NEW.{group_column} IS NOT NULL", [add("NEW")]),
+            trigger("delete", "DELETE", f"OLD.{group_column} IS NOT NULL", remove("OLD")),
+            trigger("move_out", "UPDATE", f"OLD.{group_column} IS NOT NULL AND {moved}", remove("OLD")),
+            trigger("move_in", "UPDATE", f"NEW.{group_column} IS NOT NULL AND {moved}", [add("NEW")]),
+            trigger(
+                "update", "UPDATE",
+                f"NEW.{group_column} IS NOT NULL AND NOT ({moved}) AND ({values_changed})",
+                [update_in_place()],
+            ),
+        ]
+
+    def rebuild(self) -> None:
+        '''
+        Recompute every group from the voice works table, e.g. to recover from edits made while the triggers were missing.
+        '''
+        sums = ', '.join(f"COALESCE(SUM({_product(sources)}), 0)" for sources in ROLLUP_SUMS.values())
+        extremes = ', '.join(f"{function}({source})" for source, function in ROLLUP_EXTREMES.values())
+        query = f'''
+        INSERT INTO {self.table_name} ({', '.join(self.columns_with_types)})
+        SELECT {self.group_column}, COUNT(*), {sums}, {extremes}
+        FROM {VOICE_WORKS_TABLE}
+        WHERE {self.group_column} IS NOT NULL
+        GROUP BY {self.group_column}
+        '''
+        try:
+            self.db_connection.execute_query(f"DELETE FROM {self.table_name}")
+            self.db_connection.execute_query(query)
+            self.db_connection.commit()
+        except Exception as e:
+            raise RuntimeError(f"Failed to rebuild {self.table_name}: {e}")
+
+    def _build_summary_query(self, condition: str="", order_by: Optional[str]=None) -> str:
+        '''
+        Build the query reading the rollups with the group names and the mean price and sales.
+        '''
+        return f'''
+        SELECT
+            rollups.{ROLLUP_GROUP_ID},
+            groups.{self.group_name},
+            {', '.join(f"rollups.{column}" for column in ROLLUP_METRICS)},
+            CAST(rollups.{ROLLUP_PRICE_SUM} AS REAL) / rollups.{ROLLUP_WORK_COUNT} AS price_mean,
+            CAST(rollups.{ROLLUP_SALES_COUNT_SUM} AS REAL) / rollups.{ROLLUP_WORK_COUNT} AS sales_count_mean
+        FROM {self.table_name} AS rollups
+        LEFT JOIN {self.group_table} AS groups ON groups.{self.group_primary_key} = rollups.{ROLLUP_GROUP_ID}
+        {f"WHERE {condition}" if condition else ""}
+        {f"ORDER BY rollups.{order_by} DESC, rollups.{ROLLUP_GROUP_ID}" if order_by else ""}
+        '''
+
+    def get_top(self, metric: str=ROLLUP_SALES_COUNT_SUM, k: int=10) -> pd.DataFrame:
+        '''
+        Retrieve the groups with the highest value of a metric.
+
+        Parameters
+        ----------
+        metric : str
+            One of ROLLUP_METRICS, default is the total sales count.
+        k : int
+            Number of groups.
+
+        Returns
+        -------
+        pd.DataFrame
+            The top groups with their names and all metrics, highest first.
+
+        Raises
+        ------
+        ValueError
+            If the metric is unknown.
+        '''
+        if metric not in ROLLUP_METRICS:
+            raise ValueError(f"Unknown rollup metric: {metric}")
+        query = f"{self._build_summary_query(order_by=metric)} LIMIT ?"
+        try:
+            return read_dataframe(self.db_connection, query, (k,))
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch top groups from {self.table_name}: {e}")
+
+    def get_summary(self, names: Optional[list]=None) -> pd.DataFrame:
+        '''
+        Retrieve the metrics of every group, or of the groups with the given names.
+
+        Parameters
+        ----------
+        names : list, optional
+            Names of the circles, voice actors, product formats or age ratings.
+
+        Returns
+        -------
+        pd.DataFrame
+            Group ID, name, all metrics and the mean price and sales count of each group.
+        '''
+        condition = f"groups.{self.group_name} IN ({', '.join('?' for _ in names)})" if names else ""
+        try:
+            return read_dataframe(self.db_connection, self._build_summary_query(condition), tuple(names or ()))
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch summary from {self.table_name}: {e}")
@@ -0,0 +1,265 @@
+from typing import Optional
+
+import pandas as pd
+from ..common import SQLiteHandler, TableHandlerInterface, IndexDefinition
+from ..constants import (
+    VOICE_WORK_SNAPSHOTS_TABLE,
+    SNAPSHOT_PRODUCT_ID,
+    SNAPSHOT_CRAWL_RUN_ID,
+    SNAPSHOT_SALES_COUNT,
+    SNAPSHOT_REVIEW_COUNT,
+    SNAPSHOT_PRICE,
+    SNAPSHOT_POINTS,
+    VOICE_WORKS_TABLE,
+    VOICE_WORKS_PRIMARY_KEY,
+    CRAWL_RUNS_TABLE,
+    CRAWL_RUN_PRIMARY_KEY,
+)
+
+# Columns holding the values tracked per crawl run
+SNAPSHOT_VALUE_COLUMNS = (SNAPSHOT_SALES_COUNT, SNAPSHOT_REVIEW_COUNT, SNAPSHOT_PRICE, SNAPSHOT_POINTS)
+
+class VoiceWorkSnapshotsTableHandler(TableHandlerInterface):
+    '''
+    A handler for managing the Voice Work Snapshots table in the database.
+
+    The table keeps the sales count, review count, price and points of each product per
+    crawl run, keyed by (product_id, crawl_run_id). It is delta-encoded: a row is written
+    only when at least one value differs from the product's previous snapshot, so the
+    table grows with the number of changes rather than the number of crawls. The values
+    of a product at a crawl run are those of its latest snapshot at or before that run.
+    '''
+    def __init__(self, db_connection: SQLiteHandler):
+        '''
+        Initialize the VoiceWorkSnapshotsTableHandler.
+
+        Parameters
+        ----------
+        db_connection : SQLiteHandler
+            A database connection handler.
+        '''
+        table_name = VOICE_WORK_SNAPSHOTS_TABLE
+        columns_with_types = {
+            SNAPSHOT_PRODUCT_ID: "TEXT NOT NULL",
+            SNAPSHOT_CRAWL_RUN_ID: "INTEGER NOT NULL",
+            SNAPSHOT_SALES_COUNT: "INTEGER",
+            SNAPSHOT_REVIEW_COUNT: "INTEGER",
+            SNAPSHOT_PRICE: "INTEGER",
+            SNAPSHOT_POINTS: "INTEGER",
+        }
+        foreign_keys = [
+            f"FOREIGN KEY ({SNAPSHOT_PRODUCT_ID}) REFERENCES {VOICE_WORKS_TABLE} ({VOICE_WORKS_PRIMARY_KEY})",
+            f"FOREIGN KEY ({SNAPSHOT_CRAWL_RUN_ID}) REFERENCES {CRAWL_RUNS_TABLE} ({CRAWL_RUN_PRIMARY_KEY})",
+        ]
+        indexes = [
+            # Products that changed in a range of runs
+            IndexDefinition(
+                [SNAPSHOT_CRAWL_RUN_ID, SNAPSHOT_PRODUCT_ID],
+                name=f"idx_{table_name}_{SNAPSHOT_CRAWL_RUN_ID}",
+            ),
+        ]
+        super().__init__(db_connection, table_name, columns_with_types, SNAPSHOT_PRODUCT_ID, foreign_keys, indexes=indexes)
+
+    def create_table(self) -> None:
+        '''
+        Create the table clustered by (product_id, crawl_run_id).
+
+        WITHOUT ROWID stores the rows in primary key order, so the snapshots of a product
+        are contiguous and the latest snapshot before a run is found with a single seek.
+        '''
+        columns = ', '.join([f"{col} {dtype}" for col, dtype in self.columns_with_types.items()])
+        constraints = ', '.join([f"PRIMARY KEY ({SNAPSHOT_PRODUCT_ID}, {SNAPSHOT_CRAWL_RUN_ID})", *self.foreign_keys])
+
+        query = f'''
+        CREATE TABLE IF NOT EXISTS {self.table_name} (
+            {columns}, {constraints}
+        ) WITHOUT ROWID
+        '''
+        self.db_connection.execute_query(query)
+        self.db_connection.commit()
+
+    def build_record_query(self) -> str:
+        '''
+        Build the statement that records a snapshot only when its values changed.
+
+        The statement takes the named parameters product_id, crawl_run_id, sales_count,
+        review_count, price and points. It writes nothing when the latest earlier snapshot
+        of the product has the same values.
+
+        Returns
+        -------
+        str
+            The INSERT statement.
+        '''
+        columns = (SNAPSHOT_PRODUCT_ID, SNAPSHOT_CRAWL_RUN_ID, *SNAPSHOT_VALUE_COLUMNS)
+        unchanged = ' AND '.join(f"previous.{column} IS :{column}" for column in SNAPSHOT_VALUE_COLUMNS)
+        return f'''
+        INSERT OR REPLACE INTO {self.table_name} ({', '.join(columns)})
+        SELECT {', '.join(f':{column}' for column in columns)}
+        WHERE NOT EXISTS (
+            SELECT 1 FROM (
+                SELECT {', '.join(SNAPSHOT_VALUE_COLUMNS)}
+                FROM {self.table_name}
+                WHERE {SNAPSHOT_PRODUCT_ID} = :{SNAPSHOT_PRODUCT_ID} AND {SNAPSHOT_CRAWL_RUN_ID} < :{SNAPSHOT_CRAWL_RUN_ID}
+                ORDER BY {SNAPSHOT_CRAWL_RUN_ID} DESC
+                LIMIT 1
+            ) AS previous
+            WHERE {unchanged}
+        )
+        '''
+
+    def build_prune_query(self) -> str:
+        '''
+        Build the statement that deletes the next snapshot of a product when it repeats the values of a run.
+
+        The statement takes the same named parameters as `build_record_query`. It only
+        deletes anything when a later crawl run was recorded first: the product's next
+        snapshot after that run is redundant if its values are the ones just recorded.
+
+        Returns
+        -------
+        str
+            The DELETE statement.
+        '''
+        unchanged = ' AND '.join(f"{column} IS :{column}" for column in SNAPSHOT_VALUE_COLUMNS)
+        return f'''
+        DELETE FROM {self.table_name}
+        WHERE {SNAPSHOT_PRODUCT_ID} = :{SNAPSHOT_PRODUCT_ID}
+            AND {SNAPSHOT_CRAWL_RUN_ID} = (
+                SELECT MIN({SNAPSHOT_CRAWL_RUN_ID}) FROM {self.table_name}
+                WHERE {SNAPSHOT_PRODUCT_ID} = :{SNAPSHOT_PRODUCT_ID} AND {SNAPSHOT_CRAWL_RUN_ID} > :{SNAPSHOT_CRAWL_RUN_ID}
+            )
+            AND {unchanged}
+        '''
+
+    def record_snapshots(self, snapshots: list) -> int:
+        '''
+        Record the snapshots of one crawl run, skipping products whose values did not change.
+
+        Crawl runs may be recorded in any order. When a run is recorded after a later one,
+        the later snapshots repeating its values are deleted, so the encoding stays minimal.
+
+        Parameters
+        ----------
+        snapshots : list
+            Dictionaries with the keys product_id, crawl_run_id, sales_count, review_count, price and points.
+
+        Returns
+        -------
+        int
+            Number of snapshot rows written.
+        '''
+        try:
+            written = self.db_connection.executemany_query(self.build_record_query(), snapshots).rowcount
+            self.db_connection.executemany_query(self.build_prune_query(), snapshots)
+            return written
+        except Exception as e:
+            raise RuntimeError(f"Failed to record snapshots: {e}")
+
+    def get_values_at(self, crawl_run_id: int) -> pd.DataFrame:
+        '''
+        Retrieve the values of every product as of a crawl run.
+
+        Parameters
+        ----------
+        crawl_run_id : int
+            ID of the crawl run.
+
+        Returns
+        -------
+        pd.DataFrame
+            Product ID, the ID of the run the values were recorded in, and the values.
+        '''
+        query = f'''
+        SELECT {SNAPSHOT_PRODUCT_ID}, MAX({SNAPSHOT_CRAWL_RUN_ID}) AS {SNAPSHOT_CRAWL_RUN_ID}, {', '.join(SNAPSHOT_VALUE_COLUMNS)}
+        FROM {self.table_name}
+        WHERE {SNAPSHOT_CRAWL_RUN_ID} <= ?
+        GROUP BY {SNAPSHOT_PRODUCT_ID}
+        '''
+        try:
+            res = self.db_connection.execute_query(query, (crawl_run_id,))
+            return pd.DataFrame(res.fetchall(), columns=[SNAPSHOT_PRODUCT_ID, SNAPSHOT_CRAWL_RUN_ID, *SNAPSHOT_VALUE_COLUMNS])
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch snapshot values: {e}")
+
+    def get_history(self, product_id: str) -> pd.DataFrame:
+        '''
+        Retrieve the recorded snapshots of a product in chronological order.
+
+        Parameters
+        ----------
+        product_id : str
+            Product ID of the voice work.
+
+        Returns
+        -------
+        pd.DataFrame
+            The snapshots of the product, one row per change.
+        '''
+        query = f"SELECT * FROM {self.table_name} WHERE {SNAPSHOT_PRODUCT_ID} = ? ORDER BY {SNAPSHOT_CRAWL_RUN_ID}"
+        try:
+            res = self.db_connection.execute_query(query, (product_id,))
+            return pd.DataFrame(res.fetchall(), columns=self.columns_with_types.keys())
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch snapshot history: {e}")
+
+    def get_sales_gained(self, start_run_id: int, end_run_id: int, limit: Optional[int]=None) -> pd.DataFrame:
+        '''
+        Compute the sales and reviews gained per product between two crawl runs.
+
+        Only products with a snapshot after `start_run_id` can have changed, so the range is
+        resolved through the (crawl_run_id, product_id) index, and the values at both runs
+        with one primary key seek each. The cost grows with the number of changes in the
+        range, not with the size of the table.
+
+        Parameters
+        ----------
+        start_run_id : int
+            ID of the earlier crawl run.
+        end_run_id : int
+            ID of the later crawl run.
+        limit : int, optional
+            Return only the products with the largest sales gain.
+
+        Returns
+        -------
+        pd.DataFrame
+            Product ID, sales and review counts at both runs and the gains, ordered by sales gained.
+            Products first seen after `start_run_id` have no start values and no gains.
+        '''
+        def value_at(alias: str, run_parameter: str) -> str:
+            return f'''
+            {self.table_name} AS {alias}
+                ON {alias}.{SNAPSHOT_PRODUCT_ID} = changed.{SNAPSHOT_PRODUCT_ID}
+                AND {alias}.{SNAPSHOT_CRAWL_RUN_ID} = (
+                    SELECT MAX({SNAPSHOT_CRAWL_RUN_ID}) FROM {self.table_name}
+                    WHERE {SNAPSHOT_PRODUCT_ID} = changed.{SNAPSHOT_PRODUCT_ID} AND {SNAPSHOT_CRAWL_RUN_ID} <= {run_parameter}
+                )'''
+
+        query = f'''
+        SELECT
+            changed.{SNAPSHOT_PRODUCT_ID},
+            start_.{SNAPSHOT_SALES_COUNT} AS sales_start,
+            end_.{SNAPSHOT_SALES_COUNT} AS sales_end,
+            end_.{SNAPSHOT_SALES_COUNT} - start_.{SNAPSHOT_SALES_COUNT} AS sales_gained,
+            start_.{SNAPSHOT_REVIEW_COUNT} AS reviews_start,
+            end_.{SNAPSHOT_REVIEW_COUNT} AS reviews_end,
+            end_.{SNAPSHOT_REVIEW_COUNT} - start_.{SNAPSHOT_REVIEW_COUNT} AS reviews_gained
+        FROM (
+            SELECT DISTINCT {SNAPSHOT_PRODUCT_ID}
+            FROM {self.table_name}
+            WHERE {SNAPSHOT_CRAWL_RUN_ID} > :start AND {SNAPSHOT_CRAWL_RUN_ID} <= :end
+        ) AS changed
+        INNER JOIN {value_at("end_", ":end")}
+        LEFT JOIN {value_at("start_", ":start")}
+        ORDER BY sales_gained IS NULL, sales_gained DESC
+        {"LIMIT :limit" if limit is not None else ""}
+        '''
+        columns = [
+            SNAPSHOT_PRODUCT_ID, 'sales_start', 'sales_end', 'sales_gained', 'reviews_start', 'reviews_end', 'reviews_gained',
+        ]
+        try:
+            res = self.db_connection.execute_query(query, {"start": start_run_id, "end": end_run_id, "limit": limit})
+            return pd.DataFrame(res.fetchall(), columns=columns)
+        except Exception as e:
+            raise RuntimeError(f"Failed to compute sales gained: {e}")
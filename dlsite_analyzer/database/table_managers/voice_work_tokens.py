@@ -0,0 +1,121 @@
+from typing import Iterable
+
+from ..common import SQLiteHandler, TableHandlerInterface
+from ..constants import (
+    VOICE_WORK_TOKENS_TABLE,
+    TOKENS_PRODUCT_ID,
+    TOKENS_TITLE_HASH,
+    TOKENS_TOKENS,
+    TOKENS_AGE_ID,
+    TOKENS_CIRCLE_ID,
+    TOKENS_PRODUCT_FORMAT_ID,
+)
+
+# Columns recording the groups whose term counts include the tokens of a work
+TOKENS_GROUP_COLUMNS = (TOKENS_AGE_ID, TOKENS_CIRCLE_ID, TOKENS_PRODUCT_FORMAT_ID)
+
+# Maximum number of product IDs bound in one IN list
+_LOOKUP_BATCH_SIZE = 500
+
+def serialize_tokens(tokens: Iterable[tuple]) -> str:
+    '''
+    Serialize (surface, part of speech) pairs. MeCab surfaces never contain tabs or newlines.
+    '''
+    return '\n'.join(f"{surface}\t{pos}" for surface, pos in tokens)
+
+def deserialize_tokens(text: str) -> list:
+    '''
+    Read (surface, part of speech) pairs written by `serialize_tokens`.
+    '''
+    return [tuple(line.split('\t')) for line in text.split('\n')] if text else []
+
+class VoiceWorkTokensTableHandler(TableHandlerInterface):
+    '''
+    A handler for managing the token cache of voice work titles.
+
+    Each product keeps the words of its title with their parts of speech, keyed by a
+    hash of the normalized title and the dictionary version, so a title is analyzed
+    again only when it or the dictionary changes. The row also records the age rating,
+    circle and product format the tokens were counted under in the term count tables.
+    '''
+    def __init__(self, db_connection: SQLiteHandler):
+        '''
+        Initialize the VoiceWorkTokensTableHandler.
+
+        Parameters
+        ----------
+        db_connection : SQLiteHandler
+            A database connection handler.
+        '''
+        table_name = VOICE_WORK_TOKENS_TABLE
+        columns_with_types = {
+            TOKENS_PRODUCT_ID: "TEXT PRIMARY KEY",
+            TOKENS_TITLE_HASH: "TEXT NOT NULL",
+            TOKENS_TOKENS: "TEXT NOT NULL",
+            TOKENS_AGE_ID: "INTEGER",
+            TOKENS_CIRCLE_ID: "TEXT",
+            TOKENS_PRODUCT_FORMAT_ID: "INTEGER",
+        }
+        super().__init__(db_connection, table_name, columns_with_types, TOKENS_PRODUCT_ID)
+
+    def fetch_many(self, product_ids: Iterable[str]) -> dict:
+        '''
+        Retrieve the cached rows of the given products.
+
+        Parameters
+        ----------
+        product_ids : Iterable[str]
+            Product IDs to look up.
+
+        Returns
+        -------
+        dict
+            Map from product ID to (title hash, serialized tokens, age ID, circle ID, product format ID).
+        '''
+        product_ids = list(dict.fromkeys(product_ids))
+        columns = ', '.join(self.columns_with_types)
+        rows = {}
+        try:
+            for start in range(0, len(product_ids), _LOOKUP_BATCH_SIZE):
+                batch = product_ids[start:start + _LOOKUP_BATCH_SIZE]
+                query = f"SELECT {columns} FROM {self.table_name} WHERE {TOKENS_PRODUCT_ID} IN ({', '.join('?' for _ in batch)})"
+                rows.update((row[0], row[1:]) for row in self.db_connection.execute_query(query, tuple(batch)).fetchall())
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch cached tokens: {e}")
+        return rows
+
+    def upsert_many(self, rows: list) -> None:
+        '''
+        Insert or replace cached rows.
+
+        Parameters
+        ----------
+        rows : list
+            Tuples of (product ID, title hash, serialized tokens, age ID, circle ID, product format ID).
+        '''
+        columns = ', '.join(self.columns_with_types)
+        query = f"INSERT OR REPLACE INTO {self.table_name} ({columns}) VALUES ({', '.join('?' for _ in self.columns_with_types)})"
+        try:
+            self.db_connection.executemany_query(query, rows)
+        except Exception as e:
+            raise RuntimeError(f"Failed to write cached tokens: {e}")
+
+    def delete_many(self, product_ids: Iterable[str]) -> None:
+        '''
+        Delete the cached rows of the given products.
+        '''
+        query = f"DELETE FROM {self.table_name} WHERE {TOKENS_PRODUCT_ID} = ?"
+        try:
+            self.db_connection.executemany_query(query, [(product_id,) for product_id in product_ids])
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete cached tokens: {e}")
+
+    def reset_groups(self) -> None:
+        '''
+        Mark every cached row as not counted, keeping the tokens, e.g. before the term counts are rebuilt.
+        '''
+        assignments = ', '.join(f"{column} = NULL" for column in TOKENS_GROUP_COLUMNS)
+        try:
+            self.db_connection.execute_query(f"UPDATE {self.table_name} SET {assignments}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to reset cached token groups: {e}")
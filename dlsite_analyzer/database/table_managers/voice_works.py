@@ -1,5 +1,8 @@
+from typing import Iterator
+
 import pandas as pd
-from ..common import SQLiteHandler, TableHandlerInterface
+from ..common import SQLiteHandler, TableHandlerInterface, IndexDefinition
+from ..dataframe_loader import DEFAULT_CHUNK_SIZE, iter_dataframe_chunks, read_dataframe
 from ..constants import (
     VOICE_WORKS_TABLE,
     VOICE_WORKS_PRIMARY_KEY,
@@ -14,12 +17,25 @@ from ..constants import (
     VOICE_WORKS_REVIEW_COUNT,
     VOICE_WORKS_AGE_ID,
     VOICE_WORKS_FULL_IMAGE_URL,
+    VOICE_WORKS_FINGERPRINT,
     CIRCLES_TABLE,
     PRODUCT_FORMAT_TABLE,
     VOICE_ACTORS_TABLE,
     AGE_RATING_TABLE,
 )
 
+# Dtypes of the loaded table. Sales counts are 64-bit so that revenue (price x sales) cannot overflow.
+VOICE_WORKS_DTYPES = {
+    VOICE_WORKS_PRODUCT_FORMAT_ID: "Int32",
+    VOICE_WORKS_CIRCLE_ID: "category",
+    VOICE_WORKS_VOICE_ACTOR_ID: "Int32",
+    VOICE_WORKS_PRICE: "Int32",
+    VOICE_WORKS_POINTS: "Int32",
+    VOICE_WORKS_SALES_COUNT: "Int64",
+    VOICE_WORKS_REVIEW_COUNT: "Int32",
+    VOICE_WORKS_AGE_ID: "Int32",
+}
+
 class VoiceWorksTableHandler(TableHandlerInterface):
     '''
     A handler for managing the Voice Works table in the database.
@@ -39,7 +55,8 @@ class VoiceWorksTableHandler(TableHandlerInterface):
             VOICE_WORKS_TITLE: "TEXT NOT NULL",
             VOICE_WORKS_URL: "TEXT NOT NULL",
             VOICE_WORKS_PRODUCT_FORMAT_ID: "INTEGER",
-            VOICE_WORKS_CIRCLE_ID: "INTEGER",
+            # Same type as the circle ID, so the join with the circles table can use its key
+            VOICE_WORKS_CIRCLE_ID: "TEXT",
             VOICE_WORKS_VOICE_ACTOR_ID: "INTEGER",
             VOICE_WORKS_PRICE: "INTEGER",
             VOICE_WORKS_POINTS: "INTEGER",
@@ -47,6 +64,7 @@ class VoiceWorksTableHandler(TableHandlerInterface):
             VOICE_WORKS_REVIEW_COUNT: "INTEGER",
             VOICE_WORKS_AGE_ID: "INTEGER",
             VOICE_WORKS_FULL_IMAGE_URL: "TEXT",
+            VOICE_WORKS_FINGERPRINT: "TEXT",
         }
         foreign_keys = [
             f"FOREIGN KEY ({VOICE_WORKS_PRODUCT_FORMAT_ID}) REFERENCES {PRODUCT_FORMAT_TABLE} ({VOICE_WORKS_PRODUCT_FORMAT_ID})",
@@ -54,20 +72,81 @@ class VoiceWorksTableHandler(TableHandlerInterface):
             f"FOREIGN KEY ({VOICE_WORKS_VOICE_ACTOR_ID}) REFERENCES {VOICE_ACTORS_TABLE} ({VOICE_WORKS_VOICE_ACTOR_ID})",
             f"FOREIGN KEY ({VOICE_WORKS_AGE_ID}) REFERENCES {AGE_RATING_TABLE} ({VOICE_WORKS_AGE_ID})"
         ]
-        super().__init__(db_connection, table_name, columns_with_types, VOICE_WORKS_PRIMARY_KEY, foreign_keys)
+        indexes = [
+            # Works of a circle, ranked by sales
+            IndexDefinition([VOICE_WORKS_CIRCLE_ID, VOICE_WORKS_SALES_COUNT]),
+            IndexDefinition([VOICE_WORKS_VOICE_ACTOR_ID]),
+            IndexDefinition([VOICE_WORKS_PRODUCT_FORMAT_ID]),
+            # Covering index for sales rankings and totals per age rating
+            IndexDefinition([VOICE_WORKS_AGE_ID, VOICE_WORKS_SALES_COUNT, VOICE_WORKS_PRICE]),
+            IndexDefinition([VOICE_WORKS_SALES_COUNT]),
+            IndexDefinition([VOICE_WORKS_PRICE]),
+            # Only reviewed works, for review analyses
+            IndexDefinition(
+                [VOICE_WORKS_REVIEW_COUNT],
+                name=f"idx_{VOICE_WORKS_TABLE}_reviewed",
+                where=f"{VOICE_WORKS_REVIEW_COUNT} > 0",
+            ),
+        ]
+        super().__init__(
+            db_connection, table_name, columns_with_types, VOICE_WORKS_PRIMARY_KEY, foreign_keys,
+            fingerprint_column=VOICE_WORKS_FINGERPRINT, indexes=indexes,
+        )
 
-    def get_all_voice_works(self) -> pd.DataFrame:
+    def get_all_voice_works(self, chunk_size: int=DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
         '''
         Retrieve all voice works information from the table.
 
+        The rows are read in chunks and converted to the dtypes in VOICE_WORKS_DTYPES.
+
+        Parameters
+        ----------
+        chunk_size : int
+            Number of rows fetched at a time.
+
         Returns
         -------
         pd.DataFrame
             A DataFrame containing all voice works information.
         '''
-        query = f"SELECT * FROM {self.table_name}"
+        query = f"SELECT {', '.join(self.columns_with_types)} FROM {self.table_name}"
         try:
-            res = self.db_connection.execute_query(query)
-            return pd.DataFrame(res.fetchall(), columns=self.columns_with_types.keys())
+            return read_dataframe(self.db_connection, query, dtypes=VOICE_WORKS_DTYPES, chunk_size=chunk_size)
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch voice works data: {e}")
+
+    def iter_voice_works(self, chunk_size: int=DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        '''
+        Iterate over all voice works information in chunks, for processing in bounded memory.
+
+        Parameters
+        ----------
+        chunk_size : int
+            Maximum number of voice works per chunk.
+
+        Yields
+        ------
+        pd.DataFrame
+            The next chunk, with the dtypes in VOICE_WORKS_DTYPES. Categories are per chunk.
+        '''
+        query = f"SELECT {', '.join(self.columns_with_types)} FROM {self.table_name}"
+        try:
+            yield from iter_dataframe_chunks(self.db_connection, query, dtypes=VOICE_WORKS_DTYPES, chunk_size=chunk_size)
         except Exception as e:
             raise RuntimeError(f"Failed to fetch voice works data: {e}")
+
+    def get_all_product_ids(self) -> set:
+        '''
+        Retrieve the IDs of all voice works stored in the table.
+
+        Returns
+        -------
+        set
+            A set of product IDs.
+        '''
+        query = f"SELECT {self.primary_key} FROM {self.table_name}"
+        try:
+            res = self.db_connection.execute_query(query)
+            return {row[0] for row in res}
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch voice work IDs: {e}")
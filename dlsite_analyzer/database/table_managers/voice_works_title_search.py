@@ -0,0 +1,226 @@
+import unicodedata
+from typing import Iterable, Optional
+
+from ..common import SQLiteHandler, TableHandlerInterface
+from ..title_search import MECAB_TOKENIZER, TRIGRAM_TOKENIZER, get_title_search_tokenizer, segment_title
+from ..constants import (
+    VOICE_WORKS_TITLE_SEARCH_TABLE,
+    TITLE_SEARCH_PRODUCT_ID,
+    TITLE_SEARCH_TITLE,
+    VOICE_WORKS_TABLE,
+    VOICE_WORKS_PRIMARY_KEY,
+    VOICE_WORKS_TITLE,
+)
+from ...utils import Logger
+
+logger = Logger.get_logger(__name__)
+
+# Maximum number of product IDs bound in one IN list
+_LOOKUP_BATCH_SIZE = 500
+
+# SQL function called by the triggers of earlier versions, which indexed titles inside SQLite
+_LEGACY_TITLE_SEARCH_FUNCTION = 'title_search_text'
+
+class VoiceWorksTitleSearchTableHandler(TableHandlerInterface):
+    '''
+    A handler for managing the full-text index of voice work titles.
+
+    The index is an FTS5 table whose rowid is the rowid of the voice work. With MeCab and
+    the NEologd dictionary, it stores the titles segmented into words and indexes each
+    word; otherwise it indexes the trigrams of the titles.
+
+    Titles are segmented in Python, so the triggers on the voice works table only remove
+    the entries of retitled and deleted works, and any SQLite client can write to the
+    table. `index_missing` then indexes the works that have no entry. VoiceWorksBulkImporter
+    calls it for every batch; works written by other clients are indexed on the next call
+    without product IDs.
+    '''
+    def __init__(self, db_connection: SQLiteHandler):
+        '''
+        Initialize the VoiceWorksTitleSearchTableHandler.
+
+        Parameters
+        ----------
+        db_connection : SQLiteHandler
+            A database connection handler.
+        '''
+        table_name = VOICE_WORKS_TITLE_SEARCH_TABLE
+        columns_with_types = {
+            TITLE_SEARCH_TITLE: "",
+            TITLE_SEARCH_PRODUCT_ID: "UNINDEXED",
+        }
+        super().__init__(db_connection, table_name, columns_with_types, TITLE_SEARCH_PRODUCT_ID)
+
+    def get_tokenizer(self) -> Optional[str]:
+        '''
+        Retrieve the tokenizer the existing table was created with.
+
+        Returns
+        -------
+        str or None
+            The FTS5 tokenizer, or None if the table does not exist.
+        '''
+        query = "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?"
+        row = self.db_connection.execute_query(query, (self.table_name,)).fetchone()
+        if row is None:
+            return None
+        return TRIGRAM_TOKENIZER if f"'{TRIGRAM_TOKENIZER}'" in row[0] else MECAB_TOKENIZER
+
+    def create_table(self) -> None:
+        '''
+        Create the FTS5 table with the tokenizer available on this machine.
+
+        A table created with the other tokenizer, e.g. before MeCab was installed, is
+        dropped and created again. Its rows are filled by `create_triggers`.
+        '''
+        tokenizer = get_title_search_tokenizer()
+        existing_tokenizer = self.get_tokenizer()
+        if existing_tokenizer is not None and existing_tokenizer != tokenizer:
+            logger.info(f"Recreating {self.table_name} with the {tokenizer} tokenizer.")
+            self.db_connection.execute_query(f"DROP TABLE {self.table_name}")
+            self._drop_triggers()
+
+        columns = ', '.join(f"{column} {option}".strip() for column, option in self.columns_with_types.items())
+        query = f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table_name} USING fts5({columns}, tokenize='{tokenizer}')"
+        self.db_connection.execute_query(query)
+        self.db_connection.commit()
+
+    def add_missing_columns(self) -> None:
+        '''
+        Virtual tables cannot be altered; the columns are fixed when the table is created.
+        '''
+
+    def migrate_column_types(self) -> None:
+        '''
+        FTS5 columns have no types, so there is nothing to migrate.
+        '''
+
+    def create_triggers(self) -> None:
+        '''
+        Create the triggers removing the entries of retitled and deleted voice works.
+
+        If any trigger was missing, changes to the voice works may not have been indexed
+        (the table is new, or the voice works table was rebuilt with new rowids), so the
+        index is rebuilt. Triggers of earlier versions, which called an SQL function only
+        this application registered, are replaced.
+        '''
+        queries = self._build_trigger_queries()
+        query = "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE ? AND sql LIKE ?"
+        legacy = self.db_connection.execute_query(
+            query, (f"trg_{self.table_name}_%", f"%{_LEGACY_TITLE_SEARCH_FUNCTION}%")
+        ).fetchone()[0]
+        if not legacy and len(self._get_trigger_names()) == len(queries):
+            return
+        self._drop_triggers()
+        for query in queries:
+            self.db_connection.execute_query(query)
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        '''
+        Index the titles of every voice work again.
+        '''
+        try:
+            self.db_connection.execute_query(f"DELETE FROM {self.table_name}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to rebuild {self.table_name}: {e}")
+        self.index_missing()
+        self.db_connection.commit()
+
+    def index_missing(self, product_ids: Optional[Iterable[str]]=None) -> int:
+        '''
+        Index the titles of the voice works that have no entry in the index.
+
+        Without product IDs, every work is checked, and entries left behind by works that no
+        longer exist are removed. This picks up works written by other SQLite clients.
+
+        Parameters
+        ----------
+        product_ids : Iterable[str], optional
+            Product IDs of the works to check, e.g. the works of an import batch.
+
+        Returns
+        -------
+        int
+            Number of titles indexed.
+        '''
+        tokenizer = self.get_tokenizer()
+        missing = (
+            f"SELECT rowid, {VOICE_WORKS_TITLE}, {VOICE_WORKS_PRIMARY_KEY} FROM {VOICE_WORKS_TABLE} AS works "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {self.table_name} WHERE {self.table_name}.rowid = works.rowid)"
+        )
+        try:
+            if product_ids is None:
+                self.db_connection.execute_query(
+                    f"DELETE FROM {self.table_name} WHERE rowid NOT IN (SELECT rowid FROM {VOICE_WORKS_TABLE})"
+                )
+                rows = self.db_connection.execute_query(missing).fetchall()
+            else:
+                product_ids = list(dict.fromkeys(product_ids))
+                rows = []
+                for start in range(0, len(product_ids), _LOOKUP_BATCH_SIZE):
+                    batch = product_ids[start:start + _LOOKUP_BATCH_SIZE]
+                    query = f"{missing} AND {VOICE_WORKS_PRIMARY_KEY} IN ({', '.join('?' for _ in batch)})"
+                    rows += self.db_connection.execute_query(query, tuple(batch)).fetchall()
+
+            query = f"INSERT INTO {self.table_name} (rowid, {TITLE_SEARCH_TITLE}, {TITLE_SEARCH_PRODUCT_ID}) VALUES (?, ?, ?)"
+            self.db_connection.executemany_query(
+                query, [(rowid, self._index_text(title, tokenizer), product_id) for rowid, title, product_id in rows]
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to index titles in {self.table_name}: {e}")
+        return len(rows)
+
+    @staticmethod
+    def _index_text(title: Optional[str], tokenizer: str) -> Optional[str]:
+        '''
+        Build the text indexed for a title: segmented into words for the MeCab tokenizer, only normalized for trigrams.
+        '''
+        if tokenizer == MECAB_TOKENIZER:
+            return segment_title(title)
+        return None if title is None else unicodedata.normalize("NFKC", title)
+
+    def _get_trigger_names(self) -> list:
+        '''
+        Retrieve the names of the triggers maintaining the index.
+        '''
+        query = "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?"
+        res = self.db_connection.execute_query(query, (f"trg_{self.table_name}_%",))
+        return [row[0] for row in res.fetchall()]
+
+    def _drop_triggers(self) -> None:
+        '''
+        Drop the triggers maintaining the index.
+        '''
+        for trigger_name in self._get_trigger_names():
+            self.db_connection.execute_query(f"DROP TRIGGER IF EXISTS {trigger_name}")
+
+    def _build_trigger_queries(self) -> list:
+        '''
+        Build the triggers removing the entries of inserted, retitled and deleted voice works.
+
+        An inserted work may reuse the rowid of a work whose entry was left behind, so
+        its entry is removed as well. The triggers use plain SQL only.
+
+        Returns
+        -------
+        list
+            CREATE TRIGGER statements.
+        '''
+        def trigger(event: str, body: list, condition: str="") -> str:
+            statements = ' '.join(f"{statement};" for statement in body)
+            when = f" WHEN {condition}" if condition else ""
+            return (
+                f"CREATE TRIGGER IF NOT EXISTS trg_{self.table_name}_{event.split()[0].lower()} "
+                f"AFTER {event} ON {VOICE_WORKS_TABLE}{when} BEGIN {statements} END"
+            )
+
+        delete = f"DELETE FROM {self.table_name} WHERE rowid = OLD.rowid"
+        return [
+            trigger("INSERT", [f"DELETE FROM {self.table_name} WHERE rowid = NEW.rowid"]),
+            trigger(
+                f"UPDATE OF {VOICE_WORKS_TITLE}, {VOICE_WORKS_PRIMARY_KEY}", [delete],
+                f"OLD.{VOICE_WORKS_TITLE} IS NOT NEW.{VOICE_WORKS_TITLE} OR OLD.{VOICE_WORKS_PRIMARY_KEY} IS NOT NEW.{VOICE_WORKS_PRIMARY_KEY}",
+            ),
+            trigger("DELETE", [delete]),
+        ]
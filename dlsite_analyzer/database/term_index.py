@@ -0,0 +1,178 @@
+import hashlib
+from collections import Counter
+from typing import Iterable, Optional
+
+from .common import SQLiteHandler
+from .table_managers.term_counts import TERM_COUNT_DIMENSIONS, TermCountsTableHandler
+from .table_managers.voice_work_tokens import (
+    VoiceWorkTokensTableHandler,
+    deserialize_tokens,
+    serialize_tokens,
+)
+from .constants import (
+    VOICE_WORKS_TABLE,
+    VOICE_WORKS_PRIMARY_KEY,
+    VOICE_WORKS_TITLE,
+    VOICE_WORKS_AGE_ID,
+    VOICE_WORKS_CIRCLE_ID,
+    VOICE_WORKS_PRODUCT_FORMAT_ID,
+    VOICE_WORK_TOKENS_TABLE,
+    TOKENS_PRODUCT_ID,
+)
+from ..config import MECAB_NEOLOGD_PATH, MECAB_USER_DIC_PATH
+
+# Voice works columns of the groups a work is counted under, in the order of TOKENS_GROUP_COLUMNS
+WORK_GROUP_COLUMNS = (VOICE_WORKS_AGE_ID, VOICE_WORKS_CIRCLE_ID, VOICE_WORKS_PRODUCT_FORMAT_ID)
+
+class VoiceWorkTermIndexer:
+    '''
+    Keeps the token cache and the term count tables in step with the voice works.
+
+    `update` takes the current state of some works. A title is sent to MeCab only if the
+    hash of its normalized text and the dictionary version is not cached yet; otherwise
+    the cached tokens are reused. The term counts of the age rating, circle and product
+    format a work was counted under are then moved to its current groups as deltas, so
+    the cost of an import grows with the number of changed works, not the catalog.
+    '''
+    def __init__(self, db_connection: SQLiteHandler, tokenizer: Optional[object]=None):
+        '''
+        Initialize the indexer.
+
+        Parameters
+        ----------
+        db_connection : SQLiteHandler
+            Database connection handler.
+        tokenizer : MeCabTokenizer, optional
+            Tokenizer analyzing the titles (default uses the NEologd dictionary if it is
+            installed, and MeCab's default dictionary otherwise).
+
+        Raises
+        ------
+        ImportError
+            If no tokenizer is given and MeCab is not installed.
+        '''
+        from ..text.tokenizer import MeCabTokenizer, normalize_text
+        if tokenizer is None:
+            dic_path = MECAB_NEOLOGD_PATH if MECAB_NEOLOGD_PATH.exists() else None
+            tokenizer = MeCabTokenizer(dic_path=dic_path, user_dic_path=MECAB_USER_DIC_PATH)
+        self.db_connection = db_connection
+        self.tokenizer = tokenizer
+        self.dictionary_version = tokenizer.dictionary_version
+        self.tokenized = 0
+        self._normalize_text = normalize_text
+
+        self._tokens = VoiceWorkTokensTableHandler(db_connection)
+        self._term_counts = {table_name: TermCountsTableHandler(db_connection, table_name) for table_name in TERM_COUNT_DIMENSIONS}
+        # Position of each term count table's group among the groups of a work
+        self._group_positions = {
+            table_name: WORK_GROUP_COLUMNS.index(group_column)
+            for table_name, (group_column, *_) in TERM_COUNT_DIMENSIONS.items()
+        }
+
+    def title_hash(self, title: str) -> str:
+        '''
+        Compute the cache key of a title: a hash of its normalized text and the dictionary version.
+        '''
+        key = f"{self.dictionary_version}\0{self._normalize_text(title)}".encode('UTF-8')
+        return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+    def update(self, works: Iterable[tuple]) -> None:
+        '''
+        Bring the token cache and term counts up to date with the given works.
+
+        Parameters
+        ----------
+        works : Iterable[tuple]
+            Tuples of (product ID, title, age ID, circle ID, product format ID) holding the
+            current values of the works. A product may appear more than once; the last one wins.
+        '''
+        works = list(works)
+        cached = self._tokens.fetch_many(work[0] for work in works)
+        deltas = {table_name: Counter() for table_name in self._term_counts}
+        changed_rows = {}
+        for product_id, title, *groups in works:
+            groups = tuple(groups)
+            title_hash = self.title_hash(title or '')
+            previous = cached.get(product_id)
+            if previous is not None and previous[0] == title_hash and previous[2:] == groups:
+                continue
+
+            if previous is not None and previous[0] == title_hash:
+                tokens = previous[1]
+            else:
+                tokens = serialize_tokens(self.tokenizer.tag(title or ''))
+                self.tokenized += 1
+            if previous is not None:
+                self._add_counts(deltas, previous[2:], deserialize_tokens(previous[1]), -1)
+            self._add_counts(deltas, groups, deserialize_tokens(tokens), 1)
+
+            cached[product_id] = (title_hash, tokens, *groups)
+            changed_rows[product_id] = (product_id, *cached[product_id])
+
+        self._apply(deltas)
+        self._tokens.upsert_many(list(changed_rows.values()))
+
+    def remove(self, product_ids: Iterable[str]) -> None:
+        '''
+        Remove deleted works from the term counts and the token cache.
+
+        Parameters
+        ----------
+        product_ids : Iterable[str]
+            Product IDs of the removed works.
+        '''
+        cached = self._tokens.fetch_many(product_ids)
+        deltas = {table_name: Counter() for table_name in self._term_counts}
+        for title_hash, tokens, *groups in cached.values():
+            self._add_counts(deltas, tuple(groups), deserialize_tokens(tokens), -1)
+        self._apply(deltas)
+        self._tokens.delete_many(cached)
+
+    def sync(self) -> None:
+        '''
+        Bring the token cache and term counts up to date with the whole voice works table,
+        including works changed or deleted outside the importer.
+        '''
+        group_columns = ', '.join(WORK_GROUP_COLUMNS)
+        try:
+            works = self.db_connection.execute_query(
+                f"SELECT {VOICE_WORKS_PRIMARY_KEY}, {VOICE_WORKS_TITLE}, {group_columns} FROM {VOICE_WORKS_TABLE}"
+            ).fetchall()
+            deleted = self.db_connection.execute_query(
+                f"SELECT {TOKENS_PRODUCT_ID} FROM {VOICE_WORK_TOKENS_TABLE} WHERE {TOKENS_PRODUCT_ID} NOT IN "
+                f"(SELECT {VOICE_WORKS_PRIMARY_KEY} FROM {VOICE_WORKS_TABLE})"
+            ).fetchall()
+        except Exception as e:
+            raise RuntimeError(f"Failed to read voice works for the term counts: {e}")
+        self.remove(row[0] for row in deleted)
+        self.update(works)
+        self.db_connection.commit()
+
+    def rebuild(self) -> None:
+        '''
+        Count the terms of every work again, reusing the cached tokens of unchanged titles.
+        '''
+        for term_counts in self._term_counts.values():
+            term_counts.clear()
+        self._tokens.reset_groups()
+        self.sync()
+
+    def _add_counts(self, deltas: dict, groups: tuple, tokens: list, sign: int) -> None:
+        '''
+        Add the tokens of a work, with a sign, to the deltas of each of its groups.
+        '''
+        for table_name, position in self._group_positions.items():
+            group_id = groups[position]
+            if group_id is None:
+                continue
+            delta = deltas[table_name]
+            for surface, pos in tokens:
+                delta[(group_id, surface, pos)] += sign
+
+    def _apply(self, deltas: dict) -> None:
+        '''
+        Write the deltas to the term count tables.
+        '''
+        for table_name, delta in deltas.items():
+            if delta:
+                self._term_counts[table_name].apply_deltas(delta)
@@ -0,0 +1,111 @@
+import unicodedata
+from typing import Optional
+
+from ..config import MECAB_NEOLOGD_PATH, MECAB_USER_DIC_PATH
+from ..utils import Logger
+
+logger = Logger.get_logger(__name__)
+
+# FTS5 tokenizers of the title search table: words segmented by MeCab, or trigrams of the raw title
+MECAB_TOKENIZER = 'unicode61 remove_diacritics 0'
+TRIGRAM_TOKENIZER = 'trigram'
+
+# Shortest keyword the trigram tokenizer can match
+TRIGRAM_LENGTH = 3
+
+_tagger = None
+_tagger_loaded = False
+
+def load_mecab_tagger() -> Optional[object]:
+    '''
+    Load the MeCab tagger segmenting titles, once per process.
+
+    Returns
+    -------
+    MeCab.Tagger or None
+        A tagger with the NEologd dictionary (and the user dictionary if it exists), or
+        None if MeCab or the dictionary is not installed.
+    '''
+    global _tagger, _tagger_loaded
+    if _tagger_loaded:
+        return _tagger
+    _tagger_loaded = True
+    try:
+        from ..text.tokenizer import create_tagger
+    except ImportError:
+        logger.warning("MeCab is not installed. Titles are searched by trigrams.")
+        return None
+    if not MECAB_NEOLOGD_PATH.exists():
+        logger.warning(f"The NEologd dictionary is not found at {MECAB_NEOLOGD_PATH}. Titles are searched by trigrams.")
+        return None
+    _tagger = create_tagger(MECAB_NEOLOGD_PATH, MECAB_USER_DIC_PATH, wakati=True)
+    return _tagger
+
+def get_title_search_tokenizer() -> str:
+    '''
+    Choose the FTS5 tokenizer for the title search table: MeCab words if the tagger is available, trigrams otherwise.
+    '''
+    return MECAB_TOKENIZER if load_mecab_tagger() is not None else TRIGRAM_TOKENIZER
+
+def segment_title(title: Optional[str]) -> Optional[str]:
+    '''
+    Build the text indexed for a title.
+
+    The title is NFKC-normalized, so full-width and half-width forms match each other,
+    and split into space-separated words by MeCab when it is available.
+
+    Parameters
+    ----------
+    title : str, optional
+        Title of a voice work.
+
+    Returns
+    -------
+    str or None
+        The text to index, or None for a missing title.
+    '''
+    if title is None:
+        return None
+    text = unicodedata.normalize("NFKC", title)
+    tagger = load_mecab_tagger()
+    if tagger is not None:
+        text = tagger.parse(text).strip()
+    return text
+
+def _quote(term: str) -> str:
+    '''
+    Quote a term as an FTS5 string, which the tokenizer splits into a phrase.
+    '''
+    return '"' + term.replace('"', '""') + '"'
+
+def build_title_match(keywords: str, tokenizer: str) -> tuple:
+    '''
+    Translate space-separated keywords into a condition on the title search table.
+
+    Every keyword must occur in the title. Keywords are normalized and segmented the
+    same way as the indexed titles. The trigram tokenizer cannot match a keyword shorter
+    than three characters, so such keywords become LIKE patterns instead.
+
+    Parameters
+    ----------
+    keywords : str
+        Keywords separated by spaces.
+    tokenizer : str
+        Tokenizer of the title search table.
+
+    Returns
+    -------
+    tuple
+        The FTS5 MATCH expression (None if no keyword can be matched) and the list of LIKE patterns.
+    '''
+    phrases = []
+    patterns = []
+    for keyword in unicodedata.normalize("NFKC", keywords).split():
+        if tokenizer != TRIGRAM_TOKENIZER:
+            phrases.append(_quote(segment_title(keyword)))
+        elif len(keyword) >= TRIGRAM_LENGTH:
+            phrases.append(_quote(keyword))
+        else:
+            escaped = keyword.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            patterns.append(f"%{escaped}%")
+    return (' '.join(phrases) or None), patterns
@@ -1,5 +1,10 @@
+from typing import Iterator, Optional, Union
+
 import pandas as pd
 from ..common import SQLiteHandler, ViewHandlerInterface
+from ..dataframe_loader import DEFAULT_CHUNK_SIZE, iter_dataframe_chunks, read_dataframe
+from ..table_managers import VoiceWorksTitleSearchTableHandler
+from ..title_search import build_title_match
 from ..constants import (
     # Voice Works Table
     VOICE_WORKS_TABLE, VOICE_WORKS_PRIMARY_KEY, VOICE_WORKS_TITLE, VOICE_WORKS_URL,
@@ -16,11 +21,79 @@ from ..constants import (
     # Voice Works View
     VOICE_WORKS_VIEW, VOICE_WORKS_PRODUCT_FORMAT_VIEW, VOICE_WORKS_VIEW_CIRCLE,
     VOICE_WORKS_VIEW_VOICE_ACTOR, VOICE_WORKS_VIEW_AGE,
+    # Materialized Voice Works View
+    VOICE_WORKS_MATERIALIZED_VIEW,
+    # Voice Works Title Search Table
+    TITLE_SEARCH_PRODUCT_ID, TITLE_SEARCH_TITLE,
 )
 
+# Columns of the materialized view, in the order of the view
+MATERIALIZED_COLUMNS_WITH_TYPES = {
+    VOICE_WORKS_PRIMARY_KEY: "TEXT PRIMARY KEY",
+    VOICE_WORKS_TITLE: "TEXT",
+    VOICE_WORKS_URL: "TEXT",
+    VOICE_WORKS_PRODUCT_FORMAT_VIEW: "TEXT",
+    VOICE_WORKS_VIEW_CIRCLE: "TEXT",
+    VOICE_WORKS_VIEW_VOICE_ACTOR: "TEXT",
+    VOICE_WORKS_PRICE: "INTEGER",
+    VOICE_WORKS_POINTS: "INTEGER",
+    VOICE_WORKS_SALES_COUNT: "INTEGER",
+    VOICE_WORKS_REVIEW_COUNT: "INTEGER",
+    VOICE_WORKS_VIEW_AGE: "TEXT",
+    VOICE_WORKS_FULL_IMAGE_URL: "TEXT",
+}
+
+# Dtypes of the loaded view. Names of circles, voice actors, formats and age ratings repeat
+# across many works, and sales counts are 64-bit so that revenue (price x sales) cannot overflow.
+VOICE_WORKS_VIEW_DTYPES = {
+    VOICE_WORKS_PRODUCT_FORMAT_VIEW: "category",
+    VOICE_WORKS_VIEW_CIRCLE: "category",
+    VOICE_WORKS_VIEW_VOICE_ACTOR: "category",
+    VOICE_WORKS_VIEW_AGE: "category",
+    VOICE_WORKS_PRICE: "Int32",
+    VOICE_WORKS_POINTS: "Int32",
+    VOICE_WORKS_SALES_COUNT: "Int64",
+    VOICE_WORKS_REVIEW_COUNT: "Int32",
+}
+
+# Tables joined by the view, with the voice works column referring to each
+_DIMENSION_TABLES = [
+    (CIRCLES_TABLE, CIRCLE_PRIMARY_KEY, VOICE_WORKS_CIRCLE_ID),
+    (PRODUCT_FORMAT_TABLE, PRODUCT_FORMAT_PRIMARY_KEY, VOICE_WORKS_PRODUCT_FORMAT_ID),
+    (VOICE_ACTORS_TABLE, VOICE_ACTOR_PRIMARY_KEY, VOICE_WORKS_VOICE_ACTOR_ID),
+    (AGE_RATING_TABLE, AGE_RATING_PRIMARY_KEY, VOICE_WORKS_AGE_ID),
+]
+
+# Expression of every view column on the joined tables, in the order of the view
+_VIEW_COLUMN_EXPRESSIONS = {
+    VOICE_WORKS_PRIMARY_KEY: f"{VOICE_WORKS_TABLE}.{VOICE_WORKS_PRIMARY_KEY}",
+    VOICE_WORKS_TITLE: f"{VOICE_WORKS_TABLE}.{VOICE_WORKS_TITLE}",
+    VOICE_WORKS_URL: f"{VOICE_WORKS_TABLE}.{VOICE_WORKS_URL}",
+    VOICE_WORKS_PRODUCT_FORMAT_VIEW: f"{PRODUCT_FORMAT_TABLE}.{PRODUCT_FORMAT_NAME}",
+    VOICE_WORKS_VIEW_CIRCLE: f"{CIRCLES_TABLE}.{CIRCLE_NAME}",
+    VOICE_WORKS_VIEW_VOICE_ACTOR: f"{VOICE_ACTORS_TABLE}.{VOICE_ACTOR_NAME}",
+    VOICE_WORKS_PRICE: f"{VOICE_WORKS_TABLE}.{VOICE_WORKS_PRICE}",
+    VOICE_WORKS_POINTS: f"{VOICE_WORKS_TABLE}.{VOICE_WORKS_POINTS}",
+    VOICE_WORKS_SALES_COUNT: f"{VOICE_WORKS_TABLE}.{VOICE_WORKS_SALES_COUNT}",
+    VOICE_WORKS_REVIEW_COUNT: f"{VOICE_WORKS_TABLE}.{VOICE_WORKS_REVIEW_COUNT}",
+    VOICE_WORKS_VIEW_AGE: f"{AGE_RATING_TABLE}.{AGE_RATING_NAME}",
+    VOICE_WORKS_FULL_IMAGE_URL: f"{VOICE_WORKS_TABLE}.{VOICE_WORKS_FULL_IMAGE_URL}",
+}
+
+def _select_expression(column: str) -> str:
+    '''
+    Build the select list entry of a view column, named after the column.
+    '''
+    expression = _VIEW_COLUMN_EXPRESSIONS[column]
+    return expression if expression.endswith(f".{column}") else f"{expression} AS {column}"
+
 class VoiceWorksViewHandler(ViewHandlerInterface):
     '''
     A handler for managing the Voice Works view in the database.
+
+    The view can optionally be materialized into a table with the same columns. Triggers
+    on the joined tables keep the table current row by row, and `get_all_voice_works`
+    then reads the table instead of joining the whole catalog on every call.
     '''
     def __init__(self, db_connection: SQLiteHandler):
         '''
@@ -34,6 +107,7 @@ class VoiceWorksViewHandler(ViewHandlerInterface):
         view_name = VOICE_WORKS_VIEW
         select_query = self._build_select_query()
         super().__init__(db_connection, view_name, select_query)
+        self.materialized_view_name = VOICE_WORKS_MATERIALIZED_VIEW
 
     @staticmethod
     def _build_select_query() -> str:
@@ -45,21 +119,21 @@ class VoiceWorksViewHandler(ViewHandlerInterface):
         str
             The SQL query defining the Voice Works view.
         '''
+        select_list = ',\n            '.join(map(_select_expression, _VIEW_COLUMN_EXPRESSIONS))
         return f'''
         SELECT
-            {VOICE_WORKS_TABLE}.{VOICE_WORKS_PRIMARY_KEY},
-            {VOICE_WORKS_TABLE}.{VOICE_WORKS_TITLE},
-            {VOICE_WORKS_TABLE}.{VOICE_WORKS_URL},
-            {PRODUCT_FORMAT_TABLE}.{PRODUCT_FORMAT_NAME} AS {VOICE_WORKS_PRODUCT_FORMAT_VIEW},
-            {CIRCLES_TABLE}.{CIRCLE_NAME} AS {VOICE_WORKS_VIEW_CIRCLE},
-            {VOICE_ACTORS_TABLE}.{VOICE_ACTOR_NAME} AS {VOICE_WORKS_VIEW_VOICE_ACTOR},
-            {VOICE_WORKS_TABLE}.{VOICE_WORKS_PRICE},
-            {VOICE_WORKS_TABLE}.{VOICE_WORKS_POINTS},
-            {VOICE_WORKS_TABLE}.{VOICE_WORKS_SALES_COUNT},
-            {VOICE_WORKS_TABLE}.{VOICE_WORKS_REVIEW_COUNT},
-            {AGE_RATING_TABLE}.{AGE_RATING_NAME} AS {VOICE_WORKS_VIEW_AGE},
-            {VOICE_WORKS_TABLE}.{VOICE_WORKS_FULL_IMAGE_URL}
-        FROM
+            {select_list}
+        {VoiceWorksViewHandler._build_join_clause()}
+        ORDER BY
+            {VOICE_WORKS_TABLE}.{VOICE_WORKS_PRIMARY_KEY}
+        '''
+
+    @staticmethod
+    def _build_join_clause() -> str:
+        '''
+        Build the FROM clause joining the voice works to their circles, product formats, voice actors and age ratings.
+        '''
+        return f'''FROM
             {VOICE_WORKS_TABLE}
         INNER JOIN {CIRCLES_TABLE}
             ON {VOICE_WORKS_TABLE}.{VOICE_WORKS_CIRCLE_ID} = {CIRCLES_TABLE}.{CIRCLE_PRIMARY_KEY}
@@ -68,23 +142,369 @@ class VoiceWorksViewHandler(ViewHandlerInterface):
         INNER JOIN {VOICE_ACTORS_TABLE}
             ON {VOICE_WORKS_TABLE}.{VOICE_WORKS_VOICE_ACTOR_ID} = {VOICE_ACTORS_TABLE}.{VOICE_ACTOR_PRIMARY_KEY}
         INNER JOIN {AGE_RATING_TABLE}
-            ON {VOICE_WORKS_TABLE}.{VOICE_WORKS_AGE_ID} = {AGE_RATING_TABLE}.{AGE_RATING_PRIMARY_KEY}
-        ORDER BY
-            {VOICE_WORKS_TABLE}.{VOICE_WORKS_PRIMARY_KEY}
+            ON {VOICE_WORKS_TABLE}.{VOICE_WORKS_AGE_ID} = {AGE_RATING_TABLE}.{AGE_RATING_PRIMARY_KEY}'''
+
+    def has_materialized_view(self) -> bool:
+        '''
+        Check whether the materialized view exists.
+
+        Returns
+        -------
+        bool
+            True if the materialized view table exists.
+        '''
+        query = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+        return self.db_connection.execute_query(query, (self.materialized_view_name,)).fetchone() is not None
+
+    def create_materialized_view(self) -> None:
+        '''
+        Create the materialized view and the triggers keeping it current.
+
+        A new table is filled from the view. Calling this again on an existing table only
+        recreates missing triggers, e.g. after a table was rebuilt by a migration.
+        '''
+        exists = self.has_materialized_view()
+        columns = ', '.join(f"{column} {dtype}" for column, dtype in MATERIALIZED_COLUMNS_WITH_TYPES.items())
+        query = f"CREATE TABLE IF NOT EXISTS {self.materialized_view_name} ({columns}) WITHOUT ROWID"
+        try:
+            self.db_connection.execute_query(query)
+            for trigger in self._build_trigger_queries():
+                self.db_connection.execute_query(trigger)
+            self.db_connection.commit()
+        except Exception as e:
+            raise RuntimeError(f"Failed to create materialized view: {e}")
+
+        if not exists:
+            self.rebuild_materialized_view()
+
+    def rebuild_materialized_view(self) -> None:
+        '''
+        Refill the materialized view from the view, e.g. to recover from edits made while the triggers were missing.
+        '''
+        try:
+            self.db_connection.execute_query(f"DELETE FROM {self.materialized_view_name}")
+            self.db_connection.execute_query(self._build_refresh_query())
+            self.db_connection.commit()
+        except Exception as e:
+            raise RuntimeError(f"Failed to rebuild materialized view: {e}")
+
+    def drop_materialized_view(self) -> None:
+        '''
+        Drop the materialized view and its triggers, so that reads go back to the view.
+        '''
+        try:
+            for trigger_name in self._get_trigger_names():
+                self.db_connection.execute_query(f"DROP TRIGGER IF EXISTS {trigger_name}")
+            self.db_connection.execute_query(f"DROP TABLE IF EXISTS {self.materialized_view_name}")
+            self.db_connection.commit()
+        except Exception as e:
+            raise RuntimeError(f"Failed to drop materialized view: {e}")
+
+    def _build_refresh_query(self, condition: str="") -> str:
+        '''
+        Build the statement copying the rows of the view that match a condition into the materialized view.
+        '''
+        columns = ', '.join(MATERIALIZED_COLUMNS_WITH_TYPES)
+        where = f" WHERE {condition}" if condition else ""
+        return f"INSERT INTO {self.materialized_view_name} ({columns}) SELECT {columns} FROM {self.view_name}{where}"
+
+    def _get_trigger_names(self) -> list:
+        '''
+        Retrieve the names of the triggers maintaining the materialized view.
+        '''
+        query = "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?"
+        res = self.db_connection.execute_query(query, (f"trg_{self.materialized_view_name}_%",))
+        return [row[0] for row in res.fetchall()]
+
+    def _build_trigger_queries(self) -> list:
+        '''
+        Build the triggers that refresh the affected rows of the materialized view.
+
+        Rows are deleted and inserted again rather than replaced, because the conflict
+        policy of the statement firing a trigger (e.g. INSERT OR IGNORE) overrides the
+        one of the statements inside it.
+
+        Returns
+        -------
+        list
+            CREATE TRIGGER statements.
+        '''
+        def trigger(table: str, event: str, body: list) -> str:
+            statements = ' '.join(f"{statement};" for statement in body)
+            return (
+                f"CREATE TRIGGER IF NOT EXISTS trg_{self.materialized_view_name}_{table}_{event.lower()} "
+                f"AFTER {event} ON {table} BEGIN {statements} END"
+            )
+
+        delete = f"DELETE FROM {self.materialized_view_name} WHERE {VOICE_WORKS_PRIMARY_KEY}"
+        queries = [
+            trigger(VOICE_WORKS_TABLE, "INSERT", [
+                f"{delete} = NEW.{VOICE_WORKS_PRIMARY_KEY}",
+                self._build_refresh_query(f"{VOICE_WORKS_PRIMARY_KEY} = NEW.{VOICE_WORKS_PRIMARY_KEY}"),
+            ]),
+            trigger(VOICE_WORKS_TABLE, "UPDATE", [
+                f"{delete} IN (OLD.{VOICE_WORKS_PRIMARY_KEY}, NEW.{VOICE_WORKS_PRIMARY_KEY})",
+                self._build_refresh_query(f"{VOICE_WORKS_PRIMARY_KEY} = NEW.{VOICE_WORKS_PRIMARY_KEY}"),
+            ]),
+            trigger(VOICE_WORKS_TABLE, "DELETE", [
+                f"{delete} = OLD.{VOICE_WORKS_PRIMARY_KEY}",
+            ]),
+        ]
+        # A renamed, added or removed dimension row changes the works referring to it
+        for table, primary_key, foreign_key in _DIMENSION_TABLES:
+            def works_of(row: str) -> str:
+                return (
+                    f"{VOICE_WORKS_PRIMARY_KEY} IN (SELECT {VOICE_WORKS_PRIMARY_KEY} FROM {VOICE_WORKS_TABLE} "
+                    f"WHERE {foreign_key} = {row}.{primary_key})"
+                )
+
+            queries += [
+                trigger(table, "INSERT", [
+                    f"DELETE FROM {self.materialized_view_name} WHERE {works_of('NEW')}",
+                    self._build_refresh_query(works_of('NEW')),
+                ]),
+                trigger(table, "UPDATE", [
+                    f"DELETE FROM {self.materialized_view_name} WHERE {works_of('OLD')}",
+                    f"DELETE FROM {self.materialized_view_name} WHERE {works_of('NEW')}",
+                    self._build_refresh_query(works_of('NEW')),
+                ]),
+                trigger(table, "DELETE", [
+                    f"DELETE FROM {self.materialized_view_name} WHERE {works_of('OLD')}",
+                ]),
+            ]
+        return queries
+
+    def _build_select_all_query(self) -> str:
         '''
+        Build the query reading every voice work, from the materialized view if it exists.
+        '''
+        if self.has_materialized_view():
+            return f"SELECT * FROM {self.materialized_view_name} ORDER BY {VOICE_WORKS_PRIMARY_KEY}"
+        return f"SELECT * FROM {self.view_name}"
 
-    def get_all_voice_works(self) -> pd.DataFrame:
+    def get_all_voice_works(self, chunk_size: int=DEFAULT_CHUNK_SIZE) -> pd.DataFrame:
         '''
-        Retrieve all voice works information from the view.
+        Retrieve all voice works information, from the materialized view if it exists.
+
+        The rows are read in chunks and converted to the dtypes in VOICE_WORKS_VIEW_DTYPES.
+
+        Parameters
+        ----------
+        chunk_size : int
+            Number of rows fetched at a time.
 
         Returns
         -------
         pd.DataFrame
             A DataFrame containing all voice works information.
         '''
-        query = f"SELECT * FROM {self.view_name}"
         try:
-            res = self.db_connection.execute_query(query)
-            return pd.DataFrame(res.fetchall(), columns=self.get_columns())
+            return read_dataframe(
+                self.db_connection, self._build_select_all_query(), dtypes=VOICE_WORKS_VIEW_DTYPES, chunk_size=chunk_size,
+            )
         except Exception as e:
             raise RuntimeError(f"Failed to fetch voice works data: {e}")
+
+    def iter_voice_works(self, chunk_size: int=DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        '''
+        Iterate over all voice works information in chunks, for processing in bounded memory.
+
+        Parameters
+        ----------
+        chunk_size : int
+            Maximum number of voice works per chunk.
+
+        Yields
+        ------
+        pd.DataFrame
+            The next chunk, with the dtypes in VOICE_WORKS_VIEW_DTYPES. Categories are per chunk.
+        '''
+        try:
+            yield from iter_dataframe_chunks(
+                self.db_connection, self._build_select_all_query(), dtypes=VOICE_WORKS_VIEW_DTYPES, chunk_size=chunk_size,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch voice works data: {e}")
+
+    def build_voice_works_query(
+        self,
+        columns: Optional[list]=None,
+        age: Optional[Union[str, list]]=None,
+        circle: Optional[Union[str, list]]=None,
+        voice_actor: Optional[str]=None,
+        product_format: Optional[Union[str, list]]=None,
+        price_range: Optional[tuple]=None,
+        sales_range: Optional[tuple]=None,
+        order_by: Optional[str]=None,
+        descending: bool=True,
+        limit: Optional[int]=None,
+    ) -> tuple[str, list]:
+        '''
+        Build a parameterized query for columns of the view with the given filters, order and limit.
+
+        Filter values are always passed as parameters; column names are checked against
+        the columns of the view. The query joins the tables of the view itself, without the
+        product ID order of the view, so SQLite can serve the filters and the order from
+        the indexes of voice works.
+
+        Parameters
+        ----------
+        columns : list, optional
+            Columns to return (default is every column of the view).
+        age : str or list, optional
+            Age rating name, or names, to keep.
+        circle : str or list, optional
+            Circle name, or names, to keep.
+        voice_actor : str, optional
+            Keep works whose voice actor text contains this name. Works list all of their
+            voice actors in one text, so the match is a substring match. The matching names
+            are looked up in the voice actors table first, and their works through its index.
+        product_format : str or list, optional
+            Product format name, or names, to keep.
+        price_range : tuple, optional
+            (minimum, maximum) price, both inclusive. Either bound may be None.
+        sales_range : tuple, optional
+            (minimum, maximum) sales count, both inclusive. Either bound may be None.
+        order_by : str, optional
+            Column to sort by. Ties are broken by product ID.
+        descending : bool
+            Whether to sort `order_by` in descending order.
+        limit : int, optional
+            Maximum number of rows, e.g. for top-N rankings.
+
+        Returns
+        -------
+        tuple[str, list]
+            The SQL query and its parameters.
+
+        Raises
+        ------
+        ValueError
+            If a column is not a column of the view.
+        '''
+        view_columns = list(MATERIALIZED_COLUMNS_WITH_TYPES)
+        columns = list(columns) if columns else view_columns
+        unknown = [column for column in [*columns, order_by] if column is not None and column not in view_columns]
+        if unknown:
+            raise ValueError(f"Unknown voice works columns: {', '.join(unknown)}")
+
+        conditions = []
+        params = []
+        for column, values in (
+            (VOICE_WORKS_VIEW_AGE, age),
+            (VOICE_WORKS_VIEW_CIRCLE, circle),
+            (VOICE_WORKS_PRODUCT_FORMAT_VIEW, product_format),
+        ):
+            if values is None:
+                continue
+            values = [values] if isinstance(values, str) else list(values)
+            conditions.append(f"{_VIEW_COLUMN_EXPRESSIONS[column]} IN ({', '.join('?' for _ in values)})")
+            params += values
+        if voice_actor is not None:
+            conditions.append(
+                f"{_VIEW_COLUMN_EXPRESSIONS[VOICE_WORKS_VIEW_VOICE_ACTOR]} IN "
+                f"(SELECT {VOICE_ACTOR_NAME} FROM {VOICE_ACTORS_TABLE} WHERE instr({VOICE_ACTOR_NAME}, ?) > 0)"
+            )
+            params.append(voice_actor)
+        for column, value_range in ((VOICE_WORKS_PRICE, price_range), (VOICE_WORKS_SALES_COUNT, sales_range)):
+            minimum, maximum = value_range or (None, None)
+            if minimum is not None:
+                conditions.append(f"{_VIEW_COLUMN_EXPRESSIONS[column]} >= ?")
+                params.append(minimum)
+            if maximum is not None:
+                conditions.append(f"{_VIEW_COLUMN_EXPRESSIONS[column]} <= ?")
+                params.append(maximum)
+
+        query = f"SELECT {', '.join(map(_select_expression, columns))} {self._build_join_clause()}"
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        if order_by is not None:
+            query += (
+                f" ORDER BY {_VIEW_COLUMN_EXPRESSIONS[order_by]} {'DESC' if descending else 'ASC'}, "
+                f"{_VIEW_COLUMN_EXPRESSIONS[VOICE_WORKS_PRIMARY_KEY]}"
+            )
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return query, params
+
+    def query_voice_works(self, chunk_size: int=DEFAULT_CHUNK_SIZE, **criteria) -> pd.DataFrame:
+        '''
+        Retrieve the voice works matching the criteria, filtered, sorted and limited in SQLite.
+
+        The query joins the tables of the view and uses their indexes, so only the requested
+        rows and columns are read. Example::
+
+            view_handler.query_voice_works(
+                columns=[VOICE_WORKS_TITLE, VOICE_WORKS_SALES_COUNT], age="R-18",
+                order_by=VOICE_WORKS_SALES_COUNT, limit=100,
+            )
+
+        Parameters
+        ----------
+        chunk_size : int
+            Number of rows fetched at a time.
+        **criteria
+            Keyword arguments of `build_voice_works_query`.
+
+        Returns
+        -------
+        pd.DataFrame
+            The matching voice works, with the dtypes in VOICE_WORKS_VIEW_DTYPES.
+
+        Raises
+        ------
+        ValueError
+            If a column is not a column of the view.
+        '''
+        query, params = self.build_voice_works_query(**criteria)
+        try:
+            return read_dataframe(self.db_connection, query, tuple(params), dtypes=VOICE_WORKS_VIEW_DTYPES, chunk_size=chunk_size)
+        except Exception as e:
+            raise RuntimeError(f"Failed to query voice works data: {e}")
+
+    def search_titles(self, keywords: str, limit: Optional[int]=100) -> list:
+        '''
+        Search the titles of the voice works with the full-text index.
+
+        Every space-separated keyword must occur in the title. With MeCab the keywords match
+        whole words of the title, ranked by BM25; with the trigram fallback they match any
+        part of the title, and keywords shorter than three characters are matched by a LIKE
+        scan of the index.
+
+        Parameters
+        ----------
+        keywords : str
+            Keywords separated by spaces.
+        limit : int, optional
+            Maximum number of product IDs, None for all (default is 100).
+
+        Returns
+        -------
+        list
+            Product IDs of the matching voice works, best match first.
+        '''
+        search_handler = VoiceWorksTitleSearchTableHandler(self.db_connection)
+        tokenizer = search_handler.get_tokenizer()
+        if tokenizer is None:
+            raise RuntimeError(f"The title search table {search_handler.table_name} does not exist.")
+        match, patterns = build_title_match(keywords, tokenizer)
+        if match is None and not patterns:
+            return []
+
+        conditions = [f"{TITLE_SEARCH_TITLE} LIKE ? ESCAPE '\\'" for _ in patterns]
+        params = list(patterns)
+        if match is not None:
+            conditions.insert(0, f"{search_handler.table_name} MATCH ?")
+            params.insert(0, match)
+        query = (
+            f"SELECT {TITLE_SEARCH_PRODUCT_ID} FROM {search_handler.table_name} WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {'rank' if match is not None else 'rowid'}"
+        )
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        try:
+            return [row[0] for row in self.db_connection.execute_query(query, tuple(params)).fetchall()]
+        except Exception as e:
+            raise RuntimeError(f"Failed to search voice work titles: {e}")
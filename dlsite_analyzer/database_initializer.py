@@ -6,8 +6,16 @@ from .database import (
     ProductFormatTableHandler,
     VoiceActorsTableHandler,
     AgeRatingTableHandler,
+    CrawlRunsTableHandler,
+    VoiceWorkSnapshotsTableHandler,
+    VoiceWorkRollupsTableHandler,
+    VoiceWorksTitleSearchTableHandler,
+    VoiceWorkTokensTableHandler,
+    TermCountsTableHandler,
     VoiceWorksViewHandler
 )
+from .database.table_managers.voice_work_rollups import ROLLUP_DIMENSIONS
+from .database.table_managers.term_counts import TERM_COUNT_DIMENSIONS
 from .database.constants import VOICE_ACTOR_NAME
 from .utils import Logger
 
@@ -18,26 +26,47 @@ class DatabaseInitializer:
     A class to handle database initialization, including table creation, index setup, 
     inserting initial data, and creating views.
     '''
-    def __init__(self):
-        self.db_connection = SQLiteHandler(DATABASE_PATH)
+    def __init__(self, db_path: str=DATABASE_PATH):
+        '''
+        Initialize the database initializer.
+
+        Parameters
+        ----------
+        db_path : str
+            Path to the SQLite database file, default is DATABASE_PATH.
+        '''
+        self.db_connection = SQLiteHandler(db_path)
         self.table_handlers = self._initialize_table_handlers()
     
-    def initialize(self):
+    def initialize(self, materialize_views: bool=False):
         '''
         Perform the full initialization process for the database.
+
+        Parameters
+        ----------
+        materialize_views : bool
+            Whether to materialize the views into tables kept current by triggers.
+            Views materialized earlier stay materialized either way.
         '''
         # Create tables
         self._execute_handlers("create_table", "Tables created.")
 
+        # Add columns introduced after the tables were created
+        self._execute_handlers("add_missing_columns", "Columns migrated.")
+        self._execute_handlers("migrate_column_types", "Column types migrated.")
+
         # Create indexes
         self._execute_handlers("create_index", "Indexes created.")
 
+        # Create triggers keeping the rollups and the title search index current
+        self._execute_handlers("create_triggers", "Triggers created.")
+
         # Insert initial data
         self._insert_initial_data()
         logger.info("Initial data inserted.")
         
         # Create views
-        self._create_views()
+        self._create_views(materialize_views)
         logger.info("Views created.")
         
         # Commit changes
@@ -58,8 +87,14 @@ class DatabaseInitializer:
             ProductFormatTableHandler,
             VoiceActorsTableHandler,
             AgeRatingTableHandler,
+            CrawlRunsTableHandler,
+            VoiceWorkSnapshotsTableHandler,
+            VoiceWorksTitleSearchTableHandler,
+            VoiceWorkTokensTableHandler,
         ]
-        return [handler(self.db_connection) for handler in handlers]
+        rollup_handlers = [VoiceWorkRollupsTableHandler(self.db_connection, table_name) for table_name in ROLLUP_DIMENSIONS]
+        term_count_handlers = [TermCountsTableHandler(self.db_connection, table_name) for table_name in TERM_COUNT_DIMENSIONS]
+        return [handler(self.db_connection) for handler in handlers] + rollup_handlers + term_count_handlers
 
     def _execute_handlers(self, action: str, log_message: str):
         '''
@@ -89,9 +124,14 @@ class DatabaseInitializer:
             if handler:
                 handler.insert(data)
     
-    def _create_views(self):
+    def _create_views(self, materialize_views: bool=False):
         '''
         Create database views to support specific data displays.
+
+        Parameters
+        ----------
+        materialize_views : bool
+            Whether to materialize the views into tables.
         '''
         view_handlers = [
             VoiceWorksViewHandler,
@@ -100,3 +140,5 @@ class DatabaseInitializer:
         for view_handler_class in view_handlers:
             handler = view_handler_class(self.db_connection)
             handler.create_view()
+            if materialize_views or handler.has_materialized_view():
+                handler.create_materialized_view()
@@ -1,5 +1,31 @@
 from .voice_work_scraper import VoiceWorkScraper
+from .batch_parser import parse_pages_in_parallel, parse_html_files_in_parallel
+from .concurrent_fetcher import ConcurrentPageFetcher
+from .crawl_manifest import CrawlManifest
+from .delta import DeltaCrawlTracker
+from .listing_parsers import ListingParser, BeautifulSoupListingParser, LxmlListingParser
+from .parser_registry import LISTING_PARSERS, get_listing_parser
+from .pipeline import CrawlPipeline, StageStats
+from .rate_limiter import TokenBucketRateLimiter
+from .streaming_parser import StreamingListingParser
+from .transport import HttpTransport, SessionTransport
 
 __all__ = [
-    'VoiceWorkScraper'
+    'VoiceWorkScraper',
+    'parse_pages_in_parallel',
+    'parse_html_files_in_parallel',
+    'ConcurrentPageFetcher',
+    'CrawlManifest',
+    'DeltaCrawlTracker',
+    'ListingParser',
+    'BeautifulSoupListingParser',
+    'LxmlListingParser',
+    'LISTING_PARSERS',
+    'get_listing_parser',
+    'CrawlPipeline',
+    'StageStats',
+    'TokenBucketRateLimiter',
+    'StreamingListingParser',
+    'HttpTransport',
+    'SessionTransport'
 ]
\ No newline at end of file
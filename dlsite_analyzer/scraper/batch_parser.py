@@ -0,0 +1,98 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .parser_registry import get_listing_parser
+
+# ワーカープロセスごとに1つだけ生成される一覧ページのパーサー
+_worker_parser = None
+
+def _init_worker(parser: str) -> None:
+    '''
+    ワーカープロセスの初期化処理。解析に使うパーサーを生成する
+
+    HTMLの解析だけを行うため、セッションやレート制限を持つVoiceWorkScraperは生成しない
+    '''
+    global _worker_parser
+    _worker_parser = get_listing_parser(parser)
+
+def _parse_html(html: str) -> list:
+    '''
+    ワーカープロセスでHTMLからボイス作品の情報を抽出する
+    '''
+    return _worker_parser.extract(html)
+
+def _parse_html_file(html_path: str, encoding: str) -> list:
+    '''
+    ワーカープロセスでHTMLファイルを読み込み、ボイス作品の情報を抽出する
+
+    HTML本文をプロセス間で受け渡さないよう、ファイルの読み込みもワーカー側で行う
+    '''
+    with open(html_path, "r", encoding=encoding) as file:
+        return _worker_parser.extract(file.read())
+
+def parse_pages_in_parallel(
+    html_pages: Iterable[str],
+    max_workers: Optional[int]=None,
+    chunksize: int=1,
+    parser: str="bs4",
+) -> list:
+    '''
+    複数ページのHTMLをプロセスプールで並列に解析する
+
+    結果は入力と同じ順序で返され、VoiceWorkScraper.extract_voice_work_dataを順に呼び出した結果と一致する
+
+    Parameters
+    ----------
+    html_pages : Iterable[str]
+        各ページのHTML
+    max_workers : int, optional
+        ワーカープロセス数(省略時はCPUコア数)
+    chunksize : int
+        1回のタスクでワーカーに渡すページ数
+    parser : str
+        使用するパーサー名("bs4", "lxml", "stream")
+
+    Returns
+    -------
+    list
+        ページごとのボイス作品情報のリスト
+    '''
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(parser,)) as executor:
+        return list(executor.map(_parse_html, html_pages, chunksize=chunksize))
+
+def parse_html_files_in_parallel(
+    html_paths: Iterable[Path],
+    max_workers: Optional[int]=None,
+    chunksize: int=1,
+    encoding: str="UTF-8",
+    parser: str="bs4",
+) -> list:
+    '''
+    保存済みのHTMLファイルをプロセスプールで並列に解析する
+
+    再解析やバックフィルのように、HTMLが既にディスク上にある場合に使用する。
+    結果は入力と同じ順序で返される
+
+    Parameters
+    ----------
+    html_paths : Iterable[Path]
+        HTMLファイルのパス
+    max_workers : int, optional
+        ワーカープロセス数(省略時はCPUコア数)
+    chunksize : int
+        1回のタスクでワーカーに渡すファイル数
+    encoding : str
+        HTMLファイルの文字コード
+    parser : str
+        使用するパーサー名("bs4", "lxml", "stream")
+
+    Returns
+    -------
+    list
+        ファイルごとのボイス作品情報のリスト
+    '''
+    html_paths = [str(html_path) for html_path in html_paths]
+    encodings = [encoding] * len(html_paths)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(parser,)) as executor:
+        return list(executor.map(_parse_html_file, html_paths, encodings, chunksize=chunksize))
@@ -0,0 +1,155 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+from typing import Callable, Iterable, Iterator, Optional
+
+import requests
+
+from .voice_work_scraper import VoiceWorkScraper
+from ..utils import Logger
+
+logger = Logger.get_logger(__name__)
+
+class ConcurrentPageFetcher:
+    '''
+    ボイス作品一覧ページを複数スレッドで並行に取得するクラス
+
+    リクエストの送信間隔はスクレイパーが持つレートリミッタで全スレッド共通に制御される。
+    ストリーミングモードでは、各スレッドがレスポンス本文をダウンロードしながら解析し、
+    レスポンスの代わりに作品情報のリストを返す
+    '''
+    def __init__(
+        self,
+        scraper: VoiceWorkScraper,
+        max_workers: int=4,
+        max_retries: int=3,
+        retry_delay: float=2.0,
+        on_attempt: Optional[Callable[[int], None]]=None,
+        stream: bool=False,
+    ):
+        '''
+        初期化メソッド
+
+        Parameters
+        ----------
+        scraper : VoiceWorkScraper
+            リクエストの送信に使用するスクレイパー
+        max_workers : int
+            同時に送信するリクエストの最大数
+        max_retries : int
+            失敗したリクエストの最大試行回数
+        retry_delay : float
+            リトライまでの待機秒数
+        on_attempt : Callable[[int], None], optional
+            リクエストを送信するたびにページ番号を引数に呼び出される関数(ワーカースレッドから呼び出される)
+        stream : bool
+            Trueの場合、VoiceWorkScraper.iter_voice_worksでダウンロードしながら解析した作品情報のリストを返す
+        '''
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+
+        self.scraper = scraper
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.on_attempt = on_attempt
+        self.stream = stream
+
+    def fetch_pages(self, pages: Iterable[int]) -> Iterator[tuple[int, Optional[requests.Response | list]]]:
+        '''
+        指定されたページを並行に取得し、ページ番号順に結果を返す
+
+        先読みするページ数はmax_workersの2倍までに制限される。
+        ジェネレータが途中で閉じられた場合、未着手のリクエストはキャンセルされる
+
+        Parameters
+        ----------
+        pages : Iterable[int]
+            取得するページ番号
+
+        Yields
+        ------
+        tuple[int, Optional[requests.Response | list]]
+            ページ番号とレスポンス(ストリーミングモードでは作品情報のリスト)のタプル(リトライ上限に達した場合はNone)
+        '''
+        fetch = self.fetch_page_works if self.stream else self.fetch_page
+        page_iter = iter(pages)
+        in_flight = deque()
+        max_in_flight = self.max_workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for page in page_iter:
+                    in_flight.append((page, executor.submit(fetch, page)))
+                    if len(in_flight) >= max_in_flight:
+                        break
+
+                while in_flight:
+                    page, future = in_flight.popleft()
+                    response = future.result()
+                    next_page = next(page_iter, None)
+                    if next_page is not None:
+                        in_flight.append((next_page, executor.submit(fetch, next_page)))
+                    yield page, response
+            finally:
+                for _, future in in_flight:
+                    future.cancel()
+
+    def fetch_page(self, page: int) -> Optional[requests.Response]:
+        '''
+        1ページ分のレスポンスをリトライ付きで取得する
+
+        Parameters
+        ----------
+        page : int
+            ページ番号
+
+        Returns
+        -------
+        Optional[requests.Response]
+            ステータスコード200のレスポンス(リトライ上限に達した場合はNone)
+        '''
+        return self._fetch_with_retries(page, self._get_response)
+
+    def fetch_page_works(self, page: int) -> Optional[list]:
+        '''
+        1ページ分のレスポンスをダウンロードしながら解析し、作品情報のリストをリトライ付きで取得する
+
+        本文の受信中に接続が切れた場合も、ページの先頭から取得し直す
+
+        Parameters
+        ----------
+        page : int
+            ページ番号
+
+        Returns
+        -------
+        Optional[list]
+            ボイス作品の情報が格納されたリスト(リトライ上限に達した場合はNone)
+        '''
+        return self._fetch_with_retries(page, lambda page: list(self.scraper.iter_voice_works(page)))
+
+    def _get_response(self, page: int) -> requests.Response:
+        '''
+        1ページ分のレスポンスを取得する。ステータスコードが200以外の場合は例外を送出する
+        '''
+        response = self.scraper.get_voice_works_response(page)
+        if response.status_code != 200:
+            raise requests.HTTPError(f"status {response.status_code}", response=response)
+        return response
+
+    def _fetch_with_retries(self, page: int, fetch: Callable[[int], object]) -> Optional[object]:
+        '''
+        取得処理を最大max_retries回試行し、リトライ上限に達した場合はNoneを返す
+        '''
+        for attempt in range(self.max_retries):
+            if self.on_attempt:
+                self.on_attempt(page)
+            try:
+                return fetch(page)
+            except requests.RequestException as e:
+                logger.error(f"Failed to fetch page {page}: {e}. Retrying ({attempt + 1}/{self.max_retries})...")
+            sleep(self.retry_delay)
+
+        logger.error(f"Exceeded maximum retries for page {page}.")
+        return None
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from ..utils import NDJSON_GZ_SUFFIX
+
+class CrawlManifest:
+    '''
+    クロールの進捗をページ単位で記録するマニフェスト
+
+    各ページの状態・試行回数・保存内容のハッシュ・記録ファイル名をJSONファイルに保持し、
+    中断されたクロールを未取得または失敗したページだけ再取得して再開できるようにする
+    '''
+    STATUS_PENDING = "pending"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    def __init__(self, path: Path):
+        '''
+        初期化メソッド。マニフェストファイルが存在する場合は読み込む
+
+        Parameters
+        ----------
+        path : Path
+            マニフェストファイルのパス
+        '''
+        self.path = Path(path)
+        self.run_id = None
+        self.total_pages = None
+        self.completed_at = None
+        self.pages = {}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            self._load()
+
+    def start_run(self) -> None:
+        '''
+        新しいクロールを開始し、これまでの記録を破棄する
+        '''
+        with self._lock:
+            self.run_id = datetime.now().strftime("%Y-%m-%d-%H%M%S")
+            self.total_pages = None
+            self.completed_at = None
+            self.pages = {}
+        self.save()
+
+    def set_total_pages(self, total_pages: int) -> None:
+        '''
+        総ページ数を設定し、未記録のページを未取得として登録する
+
+        Parameters
+        ----------
+        total_pages : int
+            総ページ数
+        '''
+        with self._lock:
+            self.total_pages = total_pages
+            for page in range(1, total_pages + 1):
+                self.pages.setdefault(page, self._new_entry())
+        self.save()
+
+    def is_resumable(self) -> bool:
+        '''
+        中断されたクロールが残っているかを判定する
+
+        Returns
+        -------
+        bool
+            総ページ数が確定していて、完了していないクロールがある場合はTrue
+        '''
+        return self.total_pages is not None and self.completed_at is None
+
+    def is_complete(self) -> bool:
+        '''
+        クロールが最後まで実行されたかを判定する
+
+        Returns
+        -------
+        bool
+            クロールが完了している、または記録が無い場合はTrue
+        '''
+        return self.run_id is None or self.completed_at is not None
+
+    def pending_pages(self, save_dir: Path) -> list:
+        '''
+        再開時に取得が必要なページ番号を返す
+
+        取得済みでも記録ファイルが存在しないページは再取得の対象とする。
+        ページごとのJSONファイルで保存された旧形式の記録は、内容のハッシュが一致しない場合も再取得の対象とする
+
+        Parameters
+        ----------
+        save_dir : Path
+            記録ファイルが保存されているディレクトリ
+
+        Returns
+        -------
+        list
+            取得が必要なページ番号のリスト(昇順)
+        '''
+        pages = []
+        for page, entry in sorted(self.pages.items()):
+            if entry["status"] == self.STATUS_DONE:
+                if data_file := entry.get("data_file"):
+                    if (Path(save_dir) / data_file).exists():
+                        continue
+                else:
+                    save_file_path = Path(save_dir) / page_file_name(page)
+                    if save_file_path.exists() and file_sha256(save_file_path) == entry["content_hash"]:
+                        continue
+            pages.append(page)
+        return pages
+
+    def dead_letter_pages(self) -> list:
+        '''
+        リトライ上限に達して取得できなかったページ番号を返す
+
+        Returns
+        -------
+        list
+            デッドレターのページ番号のリスト(昇順)
+        '''
+        return sorted(page for page, entry in self.pages.items() if entry["status"] == self.STATUS_FAILED)
+
+    def record_attempt(self, page: int) -> None:
+        '''
+        ページの試行回数を1増やす(ワーカースレッドから呼び出される)
+
+        Parameters
+        ----------
+        page : int
+            ページ番号
+        '''
+        with self._lock:
+            self.pages.setdefault(page, self._new_entry())["attempts"] += 1
+
+    def mark_done(self, page: int, content_hash: str, data_file: str) -> None:
+        '''
+        ページを取得済みとして記録する
+
+        Parameters
+        ----------
+        page : int
+            ページ番号
+        content_hash : str
+            保存したページ内容のSHA-256ハッシュ
+        data_file : str
+            ページの作品情報を追記した記録ファイルの名前
+        '''
+        with self._lock:
+            entry = self.pages.setdefault(page, self._new_entry())
+            entry["status"] = self.STATUS_DONE
+            entry["content_hash"] = content_hash
+            entry["data_file"] = data_file
+        self.save()
+
+    def mark_failed(self, page: int) -> None:
+        '''
+        ページをデッドレターとして記録する
+
+        Parameters
+        ----------
+        page : int
+            ページ番号
+        '''
+        with self._lock:
+            entry = self.pages.setdefault(page, self._new_entry())
+            entry["status"] = self.STATUS_FAILED
+            entry["content_hash"] = None
+        self.save()
+
+    def mark_completed(self) -> None:
+        '''
+        クロールを完了として記録する
+        '''
+        with self._lock:
+            self.completed_at = datetime.now().isoformat(timespec="seconds")
+        self.save()
+
+    def reopen(self) -> None:
+        '''
+        完了済みのクロールをデッドレターの再取得のために再開する
+        '''
+        with self._lock:
+            self.completed_at = None
+        self.save()
+
+    def save(self) -> None:
+        '''
+        マニフェストをファイルに書き込む
+
+        書き込み途中で中断されてもファイルが壊れないよう、一時ファイルに書いてから置き換える
+        '''
+        with self._lock:
+            data = {
+                "run_id": self.run_id,
+                "total_pages": self.total_pages,
+                "completed_at": self.completed_at,
+                "pages": {str(page): dict(entry) for page, entry in sorted(self.pages.items())},
+                "dead_letters": sorted(page for page, entry in self.pages.items() if entry["status"] == self.STATUS_FAILED),
+            }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="UTF-8") as file:
+            json.dump(data, file, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        '''
+        マニフェストファイルを読み込む
+        '''
+        with open(self.path, "r", encoding="UTF-8") as file:
+            data = json.load(file)
+        self.run_id = data.get("run_id")
+        self.total_pages = data.get("total_pages")
+        self.completed_at = data.get("completed_at")
+        self.pages = {int(page): entry for page, entry in data.get("pages", {}).items()}
+
+    @classmethod
+    def _new_entry(cls) -> dict:
+        '''
+        未取得ページの記録を作成する
+        '''
+        return {"status": cls.STATUS_PENDING, "attempts": 0, "content_hash": None}
+
+def records_file_name() -> str:
+    '''
+    クロールのセッションごとに作成する記録ファイル(gzip圧縮したNDJSON)の名前を返す
+
+    再開や再取得のたびに新しいファイルへ追記するため、中断で末尾が壊れても以前のセッションのファイルには影響しない
+
+    Returns
+    -------
+    str
+        ファイル名
+    '''
+    return f"voice_works_{datetime.now().strftime('%Y-%m-%d-%H%M%S')}{NDJSON_GZ_SUFFIX}"
+
+def page_file_name(page: int) -> str:
+    '''
+    旧形式で保存されたページのJSONファイル名を返す
+
+    Parameters
+    ----------
+    page : int
+        ページ番号
+
+    Returns
+    -------
+    str
+        ファイル名
+    '''
+    return f"voice_works_page_{page}.json"
+
+def file_sha256(file_path: Path) -> str:
+    '''
+    ファイル内容のSHA-256ハッシュを計算する
+
+    Parameters
+    ----------
+    file_path : Path
+        ファイルのパス
+
+    Returns
+    -------
+    str
+        16進数表記のハッシュ値
+    '''
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
@@ -0,0 +1,50 @@
+from typing import Iterable
+
+class DeltaCrawlTracker:
+    '''
+    差分クロールの停止判定を行うクラス
+
+    一覧ページは発売日の新しい順に並んでいるため、既知の作品だけで構成されたページに到達した時点で
+    それ以降のページも既知であるとみなせる。並び順の揺れに備えて、停止前にoverlap_pages分だけ余分にページを取得する
+    '''
+    def __init__(self, known_product_ids: Iterable[str], overlap_pages: int=1):
+        '''
+        初期化メソッド
+
+        Parameters
+        ----------
+        known_product_ids : Iterable[str]
+            データベースに登録済みの作品ID
+        overlap_pages : int
+            既知の作品だけのページに到達した後、停止するまでに追加で取得するページ数
+        '''
+        if overlap_pages < 0:
+            raise ValueError("overlap_pages must be 0 or greater.")
+
+        self.known_product_ids = frozenset(known_product_ids)
+        self.overlap_pages = overlap_pages
+        self._consecutive_known_pages = 0
+
+    def update(self, product_ids: Iterable[str]) -> bool:
+        '''
+        取得したページの作品IDを記録し、クロールを停止すべきかを返す
+
+        ページは番号順に渡すこと。作品が1件もないページ(レイアウトの変更やエラーページなど)は
+        既知とはみなさず、停止の判定を最初からやり直す
+
+        Parameters
+        ----------
+        product_ids : Iterable[str]
+            ページに含まれる作品ID
+
+        Returns
+        -------
+        bool
+            クロールを停止すべき場合はTrue
+        '''
+        product_ids = list(product_ids)
+        if product_ids and all(product_id in self.known_product_ids for product_id in product_ids):
+            self._consecutive_known_pages += 1
+        else:
+            self._consecutive_known_pages = 0
+        return self._consecutive_known_pages > self.overlap_pages
@@ -0,0 +1,467 @@
+from abc import ABC, abstractmethod
+
+from bs4 import BeautifulSoup
+
+class ListingParser(ABC):
+    '''
+    ボイス作品一覧ページから作品情報を抽出するパーサーのインターフェース
+
+    すべての実装は同じHTMLに対して同じフィールド・同じ値の辞書のリストを返す
+    '''
+    @abstractmethod
+    def extract(self, html: str) -> list:
+        '''
+        ボイス作品の情報を抽出
+        
+        Parameters
+        ----------
+        html : str
+            レスポンスのHTML
+        
+        Returns
+        -------
+        list
+            ボイス作品の情報が格納されたリスト
+        '''
+
+class BeautifulSoupListingParser(ListingParser):
+    '''
+    BeautifulSoup(html.parser)を使ったパーサー。他の実装の出力を検証する際の基準となる
+    '''
+    def extract(self, html: str) -> list:
+        '''
+        ボイス作品の情報を抽出
+        
+        Parameters
+        ----------
+        html : str
+            レスポンスのHTML
+        
+        Returns
+        -------
+        list
+            ボイス作品の情報が格納されたリスト
+        '''
+        soup = BeautifulSoup(html, "html.parser")
+        voice_works_list = soup.find_all("li", class_="search_result_img_box_inner")
+        results = []
+
+        for work in voice_works_list:
+            title_and_link = self._extract_title_and_link(work)
+            work_data = {
+                "product_id": self._extract_product_id(work), # 作品ID
+                "title": title_and_link["title"], # タイトル
+                "url": title_and_link["url"], # URL
+                "category": self._extract_category(work), # カテゴリー
+                "maker_id": self._extract_maker_id(work), # メーカーID
+                "maker": self._extract_maker_name(work), # メーカー名
+                "author": self._extract_author_name(work), # 作者名
+                "price": self._extract_price(work), # 価格
+                "points": self._extract_points(work), # ポイント
+                "currency_data": self._extract_currency_data(work), # 通貨データ
+                "sales_count": self._extract_sales_count(work), # 販売数
+                "review_count": self._extract_review_count(work), # レビュー数
+                "age_rating": self._extract_age_restriction(work), # 年齢制限
+                "full_image_url": self._extract_full_image_url(work), # フルサイズ画像のURL
+            }
+            results.append(work_data)
+
+        return results
+
+    def _extract_product_id(self, work: BeautifulSoup) -> str:
+        '''
+        作品IDの取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        str
+            作品ID
+        '''
+        if product_id_element := work.find("dt", class_="search_img work_thumb"):
+            return product_id_element["id"].replace("_link_", "")
+        return ""
+    
+    def _extract_title_and_link(self, work: BeautifulSoup) -> dict:
+        '''
+        タイトルとリンクの取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        dict
+            タイトル情報を含む辞書
+        '''
+        if title_element := work.find("dd", class_="work_name").find("a"):
+            return {
+                "title": title_element.get_text(strip=True),
+                "url": title_element["href"]
+            }
+        return {"title": "", "url": ""}
+    
+    def _extract_category(self, work: BeautifulSoup) -> str:
+        '''
+        カテゴリーを取得する
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        str
+            カテゴリーの名前
+        '''
+        if category_element := work.find("dd", class_="work_category_free_sample"):
+            category_link = category_element.find("div", class_="work_category").find("a")
+            if category_link:
+                return category_link.get_text(strip=True)
+        return ""
+    
+    def _extract_maker_id(self, work: BeautifulSoup) -> str:
+        '''
+        メーカーIDの取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        str
+            メーカーID
+        '''
+        attributes_element = work.find("input", {"class": "__product_attributes"})
+        if attributes_element and (value := attributes_element.get("value")):
+            attribute_list = value.split(",")
+            if len(attribute_list) > 0:
+                return attribute_list[0]
+        return ""
+    
+    def _extract_maker_name(self, work: BeautifulSoup) -> str:
+        '''
+        メーカー名の取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        str
+            メーカー名
+        '''
+        if maker_element := work.find("dd", class_="maker_name").find("a"):
+            return maker_element.get_text(strip=True)
+        return ""
+    
+    def _extract_author_name(self, work: BeautifulSoup) -> str:
+        '''
+        作者名の取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        str
+            作者名
+        '''
+        if author_element := work.find("span", class_="author"):
+            return author_element.get_text(strip=True)
+        return ""
+    
+    def _extract_price(self, work: BeautifulSoup) -> int:
+        '''
+        価格の取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        int
+            価格
+        '''
+        if price_element := work.find("span", class_="work_price_base"):
+            return int(price_element.get_text(strip=True).replace(",", ""))
+        return 0
+    
+    def _extract_points(self, work: BeautifulSoup) -> int:
+        '''
+        ポイントの取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        int
+            ポイント
+        '''
+        if point_element := work.find("span", class_="work_point"):
+            return int(point_element.get_text(strip=True).strip("pt").replace(",", ""))
+        return 0
+    
+    def _extract_currency_data(self, work: BeautifulSoup) -> str:
+        '''
+        通貨データの取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        str
+            通貨データ
+        '''
+        if currency_data_element := work.find("div", {"data-vue-component": "currency-price"}):
+            return currency_data_element["data-currency_price"]
+        return ""
+    
+    def _extract_sales_count(self, work: BeautifulSoup) -> int:
+        '''
+        販売数の取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        int
+            販売数
+        '''
+        if sales_count_element := work.find("dd", class_="work_dl"):
+            return int(sales_count_element.find("span").get_text(strip=True).replace(",", ""))
+        return 0
+    
+    def _extract_review_count(self, work: BeautifulSoup) -> int:
+        '''
+        レビュー数の取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        int
+            レビュー数
+        '''
+        if review_container := work.find("dd", class_="work_rating"):
+            if review_count_element := review_container.find("a"):
+                return int(review_count_element.get_text(strip=True).strip("()"))
+        return 0
+    
+    def _extract_age_restriction(self, work: BeautifulSoup) -> str:
+        '''
+        年齢制限の取得
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        str
+            年齢制限
+        '''
+        genre_element = work.find("dd", class_="work_genre")
+        if genre_element:
+            age_rating_element = genre_element.find("span", {"title": True})
+            return age_rating_element["title"] if age_rating_element else "R-18"
+        return ""
+    
+    def _extract_full_image_url(self, work: BeautifulSoup) -> str:
+        '''
+        フルサイズ画像のURLを取得し、https:を付けて返す
+        
+        Parameters
+        ----------
+        work : BeautifulSoup
+            作品情報が格納された要素
+        
+        Returns
+        -------
+        str
+            フルサイズ画像のURL
+        '''
+        if img_element := work.find("div", class_="work_img_popover"):
+            if src_value := img_element.find("img").get(":src"):
+                # 条件式の中から先頭が`//`で始まるURLを抽出
+                urls = src_value.split("'")
+                for url in urls:
+                    if url.startswith("//"):
+                        return f"https:{url}"
+        return ""
+
+def _has_class(class_name: str) -> str:
+    '''
+    class属性に指定したクラスを含む要素にマッチするXPathの条件式を返す
+    '''
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+class LxmlListingParser(ListingParser):
+    '''
+    lxmlとコンパイル済みXPathを使った高速なパーサー
+
+    BeautifulSoupListingParserと同じフィールドを同じ規則で抽出する。lxmlがインストールされている必要がある
+    '''
+    def __init__(self):
+        '''
+        初期化メソッド。使用するXPathを事前にコンパイルする
+
+        Raises
+        ------
+        ImportError
+            lxmlがインストールされていない場合
+        '''
+        try:
+            from lxml import etree, html
+        except ImportError as e:
+            raise ImportError("LxmlListingParser requires lxml. Install it with `pip install lxml`.") from e
+
+        self._html = html
+        self._works = etree.XPath(f"//li[{_has_class('search_result_img_box_inner')}]")
+        self._texts = etree.XPath(".//text()")
+        self._product_id = etree.XPath(".//dt[@class='search_img work_thumb']/@id")
+        self._title_link = etree.XPath(f"(.//dd[{_has_class('work_name')}])[1]//a")
+        self._category_link = etree.XPath(
+            f"((.//dd[{_has_class('work_category_free_sample')}])[1]//div[{_has_class('work_category')}])[1]//a"
+        )
+        self._product_attributes = etree.XPath(f"(.//input[{_has_class('__product_attributes')}])[1]/@value")
+        self._maker_link = etree.XPath(f"(.//dd[{_has_class('maker_name')}])[1]//a")
+        self._author = etree.XPath(f".//span[{_has_class('author')}]")
+        self._price = etree.XPath(f".//span[{_has_class('work_price_base')}]")
+        self._point = etree.XPath(f".//span[{_has_class('work_point')}]")
+        self._currency_data = etree.XPath(".//div[@data-vue-component='currency-price']/@data-currency_price")
+        self._sales_count = etree.XPath(f"(.//dd[{_has_class('work_dl')}])[1]//span")
+        self._review_count = etree.XPath(f"(.//dd[{_has_class('work_rating')}])[1]//a")
+        self._genre = etree.XPath(f".//dd[{_has_class('work_genre')}]")
+        self._age_rating = etree.XPath(".//span[@title]/@title")
+        self._popover_image = etree.XPath(f"(.//div[{_has_class('work_img_popover')}])[1]//img")
+
+    def extract(self, html: str) -> list:
+        '''
+        ボイス作品の情報を抽出
+        
+        Parameters
+        ----------
+        html : str
+            レスポンスのHTML
+        
+        Returns
+        -------
+        list
+            ボイス作品の情報が格納されたリスト
+        '''
+        root = self._html.fromstring(html)
+        results = []
+
+        for work in self._works(root):
+            title_link = self._first(self._title_link(work))
+            work_data = {
+                "product_id": self._extract_product_id(work), # 作品ID
+                "title": self._text(title_link) if title_link is not None else "", # タイトル
+                "url": title_link.get("href") if title_link is not None else "", # URL
+                "category": self._first_text(self._category_link(work)), # カテゴリー
+                "maker_id": self._extract_maker_id(work), # メーカーID
+                "maker": self._first_text(self._maker_link(work)), # メーカー名
+                "author": self._first_text(self._author(work)), # 作者名
+                "price": self._first_int(self._price(work)), # 価格
+                "points": self._first_int(self._point(work), strip_chars="pt"), # ポイント
+                "currency_data": self._first(self._currency_data(work), ""), # 通貨データ
+                "sales_count": self._first_int(self._sales_count(work)), # 販売数
+                "review_count": self._first_int(self._review_count(work), strip_chars="()"), # レビュー数
+                "age_rating": self._extract_age_restriction(work), # 年齢制限
+                "full_image_url": self._extract_full_image_url(work), # フルサイズ画像のURL
+            }
+            results.append(work_data)
+
+        return results
+
+    def _extract_product_id(self, work) -> str:
+        '''
+        作品IDの取得
+        '''
+        product_id = self._first(self._product_id(work))
+        return product_id.replace("_link_", "") if product_id is not None else ""
+
+    def _extract_maker_id(self, work) -> str:
+        '''
+        メーカーIDの取得
+        '''
+        if value := self._first(self._product_attributes(work)):
+            return value.split(",")[0]
+        return ""
+
+    def _extract_age_restriction(self, work) -> str:
+        '''
+        年齢制限の取得(年齢制限のアイコンが無い場合はR-18)
+        '''
+        genre_element = self._first(self._genre(work))
+        if genre_element is None:
+            return ""
+        return self._first(self._age_rating(genre_element), "R-18")
+
+    def _extract_full_image_url(self, work) -> str:
+        '''
+        フルサイズ画像のURLを取得し、https:を付けて返す
+        '''
+        img_element = self._first(self._popover_image(work))
+        if img_element is not None and (src_value := img_element.get(":src")):
+            # 条件式の中から先頭が`//`で始まるURLを抽出
+            for url in src_value.split("'"):
+                if url.startswith("//"):
+                    return f"https:{url}"
+        return ""
+
+    def _text(self, element) -> str:
+        '''
+        要素内のテキストを各テキストノードの前後の空白を除いて連結する(BeautifulSoupのget_text(strip=True)相当)
+        '''
+        return "".join(text.strip() for text in self._texts(element))
+
+    def _first_text(self, elements: list) -> str:
+        '''
+        最初の要素のテキストを返す。要素が無い場合は空文字
+        '''
+        return self._text(elements[0]) if elements else ""
+
+    def _first_int(self, elements: list, strip_chars: str=None) -> int:
+        '''
+        最初の要素のテキストを整数に変換して返す。要素が無い場合は0
+        '''
+        if not elements:
+            return 0
+        return int(self._text(elements[0]).strip(strip_chars).replace(",", ""))
+
+    @staticmethod
+    def _first(values: list, default=None):
+        '''
+        リストの最初の要素を返す。空の場合はdefault
+        '''
+        return values[0] if values else default
@@ -0,0 +1,34 @@
+from .listing_parsers import ListingParser, BeautifulSoupListingParser, LxmlListingParser
+from .streaming_parser import StreamingListingParser
+
+# パーサー名と実装クラスの対応
+LISTING_PARSERS = {
+    "bs4": BeautifulSoupListingParser,
+    "lxml": LxmlListingParser,
+    "stream": StreamingListingParser,
+}
+
+def get_listing_parser(parser: str | ListingParser) -> ListingParser:
+    '''
+    パーサー名またはパーサーのインスタンスからパーサーを取得する
+
+    Parameters
+    ----------
+    parser : str | ListingParser
+        パーサー名("bs4", "lxml", "stream")またはListingParserのインスタンス
+
+    Returns
+    -------
+    ListingParser
+        パーサーのインスタンス
+
+    Raises
+    ------
+    ValueError
+        未知のパーサー名が指定された場合
+    '''
+    if isinstance(parser, ListingParser):
+        return parser
+    if parser not in LISTING_PARSERS:
+        raise ValueError(f"Unknown listing parser: {parser}. Choose from {list(LISTING_PARSERS)}.")
+    return LISTING_PARSERS[parser]()
@@ -0,0 +1,228 @@
+import queue
+import threading
+from time import monotonic
+from typing import Callable, Iterator, Optional
+
+import requests
+from tqdm import tqdm
+
+from ..utils import Logger
+
+logger = Logger.get_logger(__name__)
+
+# ステージの終了を下流に伝えるための番兵
+_SENTINEL = object()
+
+class StageStats:
+    '''
+    パイプラインの1ステージの処理件数・処理時間・入力キューの深さを集計するクラス
+    '''
+    def __init__(self, name: str, input_queue: Optional[queue.Queue]=None):
+        '''
+        初期化メソッド
+
+        Parameters
+        ----------
+        name : str
+            ステージ名
+        input_queue : queue.Queue, optional
+            ステージの入力キュー(入力キューを持たないステージはNone)
+        '''
+        self.name = name
+        self.input_queue = input_queue
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self._started = monotonic()
+
+    def record(self, seconds: float) -> None:
+        '''
+        1件分の処理時間を記録する
+
+        Parameters
+        ----------
+        seconds : float
+            処理にかかった秒数
+        '''
+        self.processed += 1
+        self.busy_seconds += seconds
+
+    @property
+    def queue_depth(self) -> int:
+        '''
+        入力キューに溜まっている件数
+        '''
+        return self.input_queue.qsize() if self.input_queue is not None else 0
+
+    @property
+    def throughput(self) -> float:
+        '''
+        ステージ開始からの1秒あたりの処理件数
+        '''
+        elapsed = monotonic() - self._started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        '''
+        集計結果を1行の文字列で返す
+        '''
+        return (
+            f"{self.name}: {self.processed} pages, {self.throughput:.2f} pages/s, "
+            f"busy {self.busy_seconds:.1f}s, queue depth {self.queue_depth}"
+        )
+
+class CrawlPipeline:
+    '''
+    取得・解析・保存の3ステージをサイズ上限付きのキューでつないだクロールパイプライン
+
+    取得と解析はそれぞれ専用スレッド、保存は呼び出し元のスレッドで実行される。
+    キューが満杯になると上流のステージが待機するため、メモリ使用量はキューサイズで頭打ちになる。
+    取得ステージがダウンロードしながら解析する場合(parseがNone)、解析ステージは作品情報をそのまま保存ステージに渡す
+    '''
+    def __init__(
+        self,
+        parse: Optional[Callable[[str], list]],
+        persist: Callable[[int, Optional[list]], bool],
+        queue_size: int=8,
+    ):
+        '''
+        初期化メソッド
+
+        Parameters
+        ----------
+        parse : Callable[[str], list], optional
+            ページのHTMLから作品情報のリストを抽出する関数(Noneの場合、取得ステージが作品情報のリストを渡す)
+        persist : Callable[[int, Optional[list]], bool]
+            ページ番号と作品情報のリスト(取得失敗時はNone)を保存する関数。Trueを返すとクロールを停止する
+        queue_size : int
+            各ステージ間のキューに溜められるページ数の上限
+        '''
+        self.parse = parse
+        self.persist = persist
+        self._parse_queue = queue.Queue(maxsize=queue_size)
+        self._persist_queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._errors = []
+        self.fetch_stats = StageStats("fetch")
+        self.parse_stats = StageStats("parse", self._parse_queue)
+        self.persist_stats = StageStats("persist", self._persist_queue)
+
+    @property
+    def stats(self) -> list:
+        '''
+        各ステージの集計結果(取得・解析・保存の順)
+        '''
+        return [self.fetch_stats, self.parse_stats, self.persist_stats]
+
+    def run(self, responses: Iterator[tuple[int, Optional[requests.Response | list]]], progress: Optional[tqdm]=None) -> None:
+        '''
+        パイプラインを実行し、全ページの保存が終わるか停止が要求されるまで待機する
+
+        Parameters
+        ----------
+        responses : Iterator[tuple[int, Optional[requests.Response | list]]]
+            ページ番号とレスポンス(parseがNoneの場合は作品情報のリスト)を返すイテレータ
+            (取得ステージのスレッドで消費され、終了時に閉じられる)
+        progress : tqdm, optional
+            保存したページ数とキューの深さを表示するプログレスバー
+        '''
+        threads = [
+            threading.Thread(target=self._fetch_stage, args=(responses,), name="crawl-fetch", daemon=True),
+            threading.Thread(target=self._parse_stage, name="crawl-parse", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            self._persist_stage(progress)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+    def _fetch_stage(self, responses: Iterator[tuple[int, Optional[requests.Response | list]]]) -> None:
+        '''
+        レスポンスを受け取り、解析キューに渡す
+        '''
+        try:
+            while not self._stop.is_set():
+                start = monotonic()
+                item = next(responses, _SENTINEL)
+                if item is _SENTINEL:
+                    break
+                self.fetch_stats.record(monotonic() - start)
+                self._put(self._parse_queue, item)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            if close := getattr(responses, "close", None):
+                close()
+            self._put(self._parse_queue, _SENTINEL)
+
+    def _parse_stage(self) -> None:
+        '''
+        解析キューからレスポンスを取り出して作品情報を抽出し、保存キューに渡す
+        '''
+        try:
+            while (item := self._get(self._parse_queue)) is not _SENTINEL:
+                page, response = item
+                start = monotonic()
+                if response is None or self.parse is None:
+                    voice_works = response
+                else:
+                    voice_works = self.parse(response.text)
+                self.parse_stats.record(monotonic() - start)
+                self._put(self._persist_queue, (page, voice_works))
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put(self._persist_queue, _SENTINEL)
+
+    def _persist_stage(self, progress: Optional[tqdm]) -> None:
+        '''
+        保存キューから作品情報を取り出して保存する
+        '''
+        while (item := self._get(self._persist_queue)) is not _SENTINEL:
+            page, voice_works = item
+            start = monotonic()
+            should_stop = self.persist(page, voice_works)
+            self.persist_stats.record(monotonic() - start)
+
+            if progress is not None:
+                progress.update(1)
+                progress.set_postfix(parse_q=self.parse_stats.queue_depth, persist_q=self.persist_stats.queue_depth)
+
+            if should_stop:
+                break
+
+    def _put(self, target_queue: queue.Queue, item) -> None:
+        '''
+        キューに空きができるまで待ってから要素を追加する。停止が要求された場合は追加せずに戻る
+        '''
+        while not self._stop.is_set():
+            try:
+                target_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, source_queue: queue.Queue):
+        '''
+        キューから要素を取り出す。停止が要求された場合は番兵を返す
+        '''
+        while not self._stop.is_set():
+            try:
+                return source_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _SENTINEL
+
+    def _fail(self, error: BaseException) -> None:
+        '''
+        ステージで発生した例外を記録し、パイプライン全体を停止する
+        '''
+        logger.error(f"Crawl pipeline stage failed: {error}")
+        self._errors.append(error)
+        self._stop.set()
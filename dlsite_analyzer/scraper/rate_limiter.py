@@ -0,0 +1,52 @@
+import threading
+from time import monotonic, sleep
+
+class TokenBucketRateLimiter:
+    '''
+    トークンバケット方式のレートリミッタ
+
+    複数スレッドから共有され、全体のリクエスト数を1秒あたりrequests_per_second回に制限する
+    '''
+    def __init__(self, requests_per_second: float, burst: int=1):
+        '''
+        初期化メソッド
+
+        Parameters
+        ----------
+        requests_per_second : float
+            1秒あたりに補充されるトークン数(許可するリクエスト数)
+        burst : int
+            バケットに溜められるトークンの最大数(連続で許可するリクエスト数)
+        '''
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be greater than 0.")
+        if burst < 1:
+            raise ValueError("burst must be at least 1.")
+
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        '''
+        トークンを1つ取得する。トークンが無い場合は補充されるまで待機する
+        '''
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.requests_per_second
+            sleep(wait_seconds)
+
+    def _refill(self) -> None:
+        '''
+        経過時間に応じてトークンを補充する(ロック取得済みで呼び出すこと)
+        '''
+        now = monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.requests_per_second)
+        self._last_refill = now
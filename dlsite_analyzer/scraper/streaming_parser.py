@@ -0,0 +1,313 @@
+import codecs
+from collections import deque
+from html.parser import HTMLParser
+from typing import Iterable, Iterator
+
+from .listing_parsers import ListingParser
+
+# 終了タグを持たない要素(BeautifulSoupのhtml.parserツリービルダーと同じ集合)
+_VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta",
+    "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+})
+
+class _WorkState:
+    '''
+    1作品(li.search_result_img_box_inner)の解析中の状態
+
+    DOMを構築せず、各フィールドについて「最初にマッチした要素」だけを記録する。
+    スコープ(例えば最初のdd.work_name)の中で最初にマッチした要素のテキストを取得する点はBeautifulSoupのfindと同じ
+    '''
+    def __init__(self, depth: int):
+        '''
+        初期化メソッド
+
+        Parameters
+        ----------
+        depth : int
+            作品要素(li)の要素スタック上の位置
+        '''
+        self.depth = depth
+        self.values = {}
+        self.texts = {}
+        self._captures = []
+        self._scopes = {}
+        self._seen = set()
+
+    def start(self, tag: str, attrs: dict, depth: int) -> None:
+        '''
+        作品内の開始タグを処理する
+
+        Parameters
+        ----------
+        tag : str
+            タグ名
+        attrs : dict
+            属性
+        depth : int
+            要素スタック上の位置
+        '''
+        class_names = (attrs.get("class") or "").split()
+
+        if tag == "dt" and " ".join(class_names) == "search_img work_thumb" and self._first("product_id"):
+            self.values["product_id"] = attrs.get("id", "").replace("_link_", "")
+        elif tag == "input" and "__product_attributes" in class_names and self._first("maker_id"):
+            value = attrs.get("value")
+            self.values["maker_id"] = value.split(",")[0] if value else ""
+        elif tag == "div" and attrs.get("data-vue-component") == "currency-price" and self._first("currency_data"):
+            self.values["currency_data"] = attrs.get("data-currency_price", "")
+
+        if tag == "dd":
+            for scope in ("work_name", "work_category_free_sample", "maker_name", "work_dl", "work_rating", "work_genre"):
+                if scope in class_names:
+                    self._open_scope(scope, depth)
+            if "work_genre" in class_names and "age_rating" not in self.values:
+                self.values["age_rating"] = "R-18"
+        elif tag == "div":
+            if "work_img_popover" in class_names:
+                self._open_scope("work_img_popover", depth)
+            if "work_category" in class_names and self._in_scope("work_category_free_sample"):
+                self._open_scope("work_category", depth)
+        elif tag == "span":
+            if "author" in class_names and self._first("author"):
+                self._capture("author", depth)
+            if "work_price_base" in class_names and self._first("price"):
+                self._capture("price", depth)
+            if "work_point" in class_names and self._first("points"):
+                self._capture("points", depth)
+            if self._in_scope("work_dl") and self._first("sales_count"):
+                self._capture("sales_count", depth)
+            if "title" in attrs and self._in_scope("work_genre") and self._first("age_rating_title"):
+                self.values["age_rating"] = attrs["title"]
+        elif tag == "a":
+            if self._in_scope("work_name") and self._first("title"):
+                self.values["url"] = attrs.get("href", "")
+                self._capture("title", depth)
+            if self._in_scope("work_category") and self._first("category"):
+                self._capture("category", depth)
+            if self._in_scope("maker_name") and self._first("maker"):
+                self._capture("maker", depth)
+            if self._in_scope("work_rating") and self._first("review_count"):
+                self._capture("review_count", depth)
+        elif tag == "img" and self._in_scope("work_img_popover") and self._first("full_image_url"):
+            self.values["full_image_url"] = self._to_full_image_url(attrs.get(":src"))
+
+    def data(self, data: str) -> None:
+        '''
+        テキストを取得中のすべてのフィールドに追加する(前後の空白を除き、空のテキストは無視する)
+
+        Parameters
+        ----------
+        data : str
+            テキストノードの内容
+        '''
+        if self._captures and (stripped := data.strip()):
+            for _, _, pieces in self._captures:
+                pieces.append(stripped)
+
+    def end(self, depth: int) -> None:
+        '''
+        要素スタックのdepthの位置にあった要素が閉じられたときの処理
+
+        Parameters
+        ----------
+        depth : int
+            閉じられた要素の要素スタック上の位置
+        '''
+        while self._captures and self._captures[-1][1] >= depth:
+            field, _, pieces = self._captures.pop()
+            self.texts[field] = "".join(pieces)
+        for scope, scope_depth in list(self._scopes.items()):
+            if scope_depth is not None and scope_depth >= depth:
+                self._scopes[scope] = None
+
+    def to_record(self) -> dict:
+        '''
+        解析結果をBeautifulSoupListingParserと同じ形式の辞書に変換する
+
+        Returns
+        -------
+        dict
+            作品情報
+        '''
+        for field, _, pieces in self._captures:
+            self.texts[field] = "".join(pieces)
+        texts = self.texts
+
+        return {
+            "product_id": self.values.get("product_id", ""), # 作品ID
+            "title": texts.get("title", ""), # タイトル
+            "url": self.values.get("url", ""), # URL
+            "category": texts.get("category", ""), # カテゴリー
+            "maker_id": self.values.get("maker_id", ""), # メーカーID
+            "maker": texts.get("maker", ""), # メーカー名
+            "author": texts.get("author", ""), # 作者名
+            "price": int(texts["price"].replace(",", "")) if "price" in texts else 0, # 価格
+            "points": int(texts["points"].strip("pt").replace(",", "")) if "points" in texts else 0, # ポイント
+            "currency_data": self.values.get("currency_data", ""), # 通貨データ
+            "sales_count": int(texts["sales_count"].replace(",", "")) if "sales_count" in texts else 0, # 販売数
+            "review_count": int(texts["review_count"].strip("()")) if "review_count" in texts else 0, # レビュー数
+            "age_rating": self.values.get("age_rating", ""), # 年齢制限
+            "full_image_url": self.values.get("full_image_url", ""), # フルサイズ画像のURL
+        }
+
+    def _first(self, key: str) -> bool:
+        '''
+        keyに対応する要素が初めて現れた場合にTrueを返し、以降はFalseを返す
+        '''
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def _open_scope(self, scope: str, depth: int) -> None:
+        '''
+        最初に現れたスコープ要素だけを開く
+        '''
+        if self._first(f"scope:{scope}"):
+            self._scopes[scope] = depth
+
+    def _in_scope(self, scope: str) -> bool:
+        '''
+        スコープ要素の内側にいるかを判定する
+        '''
+        return self._scopes.get(scope) is not None
+
+    def _capture(self, field: str, depth: int) -> None:
+        '''
+        要素が閉じられるまでのテキストの取得を開始する
+        '''
+        self._captures.append((field, depth, []))
+
+    @staticmethod
+    def _to_full_image_url(src_value: str) -> str:
+        '''
+        :src属性の条件式から先頭が`//`で始まるURLを抽出し、https:を付けて返す
+        '''
+        if src_value:
+            for url in src_value.split("'"):
+                if url.startswith("//"):
+                    return f"https:{url}"
+        return ""
+
+class _ListingTokenizer(HTMLParser):
+    '''
+    一覧ページのHTMLを逐次的に字句解析し、作品要素が閉じられるたびに作品情報を出力するパーサー
+
+    保持するのは開いている要素のタグ名のスタックと解析中の1作品分の状態だけなので、
+    メモリ使用量はページの大きさに依存しない
+    '''
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.records = deque()
+        self._stack = []
+        self._work = None
+        self._pending_text = []
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        self._flush_text()
+        attrs = dict(attrs)
+        depth = len(self._stack)
+        if self._work is not None:
+            self._work.start(tag, attrs, depth)
+        elif tag == "li" and "search_result_img_box_inner" in (attrs.get("class") or "").split():
+            self._work = _WorkState(depth)
+
+        if tag not in _VOID_ELEMENTS:
+            self._stack.append(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush_text()
+        if tag in _VOID_ELEMENTS or tag not in self._stack:
+            return
+
+        # BeautifulSoupと同様に、対応する開始タグまでの要素をすべて閉じる
+        while True:
+            closed_tag = self._stack.pop()
+            depth = len(self._stack)
+            if self._work is not None:
+                self._work.end(depth)
+                if depth == self._work.depth:
+                    self.records.append(self._work.to_record())
+                    self._work = None
+            if closed_tag == tag:
+                return
+
+    def handle_data(self, data: str) -> None:
+        # 入力の区切りで1つのテキストノードが分割されて渡されるため、次のタグまで溜めておく
+        if self._work is not None:
+            self._pending_text.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._flush_text()
+
+    def close(self) -> None:
+        '''
+        入力の終わりを処理し、閉じられていない作品要素があれば出力する
+        '''
+        super().close()
+        self._flush_text()
+        if self._work is not None:
+            self.records.append(self._work.to_record())
+            self._work = None
+
+    def _flush_text(self) -> None:
+        '''
+        溜めておいたテキストを1つのテキストノードとして作品の状態に渡す
+        '''
+        if self._pending_text:
+            self._work.data("".join(self._pending_text))
+            self._pending_text.clear()
+
+class StreamingListingParser(ListingParser):
+    '''
+    DOMを構築せずに一覧ページを解析するストリーミングパーサー
+
+    html.parser.HTMLParserで入力を逐次的に字句解析し、作品要素が閉じられるたびに1件ずつ作品情報を返す。
+    レスポンスのダウンロード中から解析を始められ、ピークメモリはページの大きさに依存しない
+    '''
+    def extract(self, html: str) -> list:
+        '''
+        ボイス作品の情報を抽出
+
+        Parameters
+        ----------
+        html : str
+            レスポンスのHTML
+
+        Returns
+        -------
+        list
+            ボイス作品の情報が格納されたリスト
+        '''
+        return list(self.iter_works([html]))
+
+    def iter_works(self, chunks: Iterable[str | bytes], encoding: str="UTF-8") -> Iterator[dict]:
+        '''
+        HTMLの断片を順に解析し、作品情報を1件ずつ返す
+
+        Parameters
+        ----------
+        chunks : Iterable[str | bytes]
+            HTMLの断片(レスポンス本文のチャンクなど)
+        encoding : str
+            断片がbytesの場合の文字コード
+
+        Yields
+        ------
+        dict
+            作品情報
+        '''
+        tokenizer = _ListingTokenizer()
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+        for chunk in chunks:
+            tokenizer.feed(decoder.decode(chunk) if isinstance(chunk, bytes) else chunk)
+            while tokenizer.records:
+                yield tokenizer.records.popleft()
+
+        tokenizer.feed(decoder.decode(b"", final=True))
+        tokenizer.close()
+        while tokenizer.records:
+            yield tokenizer.records.popleft()
@@ -0,0 +1,135 @@
+import importlib.util
+from abc import ABC, abstractmethod
+
+import requests
+from requests.adapters import HTTPAdapter
+
+def _supported_encodings() -> str:
+    '''
+    urllib3が展開できる圧縮形式をAccept-Encodingヘッダーの形式で返す
+
+    brotliはbrotliまたはbrotlicffiがインストールされている場合のみ対応する
+    '''
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.append("br")
+    return ", ".join(encodings)
+
+class HttpTransport(ABC):
+    '''
+    スクレイパーが使用するHTTP通信層のインターフェース
+
+    テストではこのクラスを継承したフェイクに差し替えることで、ネットワークを使わずにスクレイパーを動かせる
+    '''
+    @abstractmethod
+    def get(self, url: str, headers: dict) -> requests.Response:
+        '''
+        GETリクエストを送信する
+
+        Parameters
+        ----------
+        url : str
+            リクエスト先のURL
+        headers : dict
+            HTTPリクエストヘッダー
+
+        Returns
+        -------
+        requests.Response
+            レスポンスオブジェクト
+        '''
+
+    @abstractmethod
+    def get_stream(self, url: str, headers: dict) -> requests.Response:
+        '''
+        本文を読み込まずにGETリクエストを送信する
+
+        本文はiter_contentで少しずつ受け取り、読み終えたらレスポンスを閉じること
+
+        Parameters
+        ----------
+        url : str
+            リクエスト先のURL
+        headers : dict
+            HTTPリクエストヘッダー
+
+        Returns
+        -------
+        requests.Response
+            本文が未読のレスポンスオブジェクト
+        '''
+
+    def close(self) -> None:
+        '''
+        保持しているコネクションを解放する
+        '''
+        pass
+
+class SessionTransport(HttpTransport):
+    '''
+    コネクションプールを持つrequests.Sessionを使ったHTTP通信層
+
+    同一ホストへのTCP/TLS接続を再利用し、gzip/brotliでの圧縮転送を要求する
+    '''
+    def __init__(self, pool_maxsize: int=10, connect_timeout: float=5.0, read_timeout: float=30.0):
+        '''
+        初期化メソッド
+
+        Parameters
+        ----------
+        pool_maxsize : int
+            ホストごとに保持するコネクションの最大数(同時リクエスト数以上にする)
+        connect_timeout : float
+            接続確立のタイムアウト秒数
+        read_timeout : float
+            レスポンス受信のタイムアウト秒数
+        '''
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = _supported_encodings()
+
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, headers: dict) -> requests.Response:
+        '''
+        プール済みのコネクションを使ってGETリクエストを送信する
+
+        Parameters
+        ----------
+        url : str
+            リクエスト先のURL
+        headers : dict
+            HTTPリクエストヘッダー
+
+        Returns
+        -------
+        requests.Response
+            レスポンスオブジェクト
+        '''
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def get_stream(self, url: str, headers: dict) -> requests.Response:
+        '''
+        プール済みのコネクションを使い、本文を読み込まずにGETリクエストを送信する
+
+        Parameters
+        ----------
+        url : str
+            リクエスト先のURL
+        headers : dict
+            HTTPリクエストヘッダー
+
+        Returns
+        -------
+        requests.Response
+            本文が未読のレスポンスオブジェクト
+        '''
+        return self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+
+    def close(self) -> None:
+        '''
+        セッションを閉じ、プール内のコネクションを解放する
+        '''
+        self.session.close()
@@ -1,19 +1,54 @@
+from typing import Iterator, Optional
+from urllib.parse import urlencode
+
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urlencode
 
-from ..utils import (
-    Logger,
-    sleep_random
-)
+from .listing_parsers import ListingParser
+from .parser_registry import get_listing_parser
+from .streaming_parser import StreamingListingParser
+from .rate_limiter import TokenBucketRateLimiter
+from .transport import HttpTransport, SessionTransport
+from ..utils import Logger
 
 logger = Logger.get_logger(__name__)
 
+# Content-Typeに文字コードの指定がないレスポンスの文字コード(DLsiteのページはUTF-8)
+DEFAULT_ENCODING = "UTF-8"
+
+def _declared_encoding(response: requests.Response) -> str:
+    '''
+    Content-Typeヘッダーで宣言された文字コードを返す
+
+    requestsはcharsetのないtext/htmlにISO-8859-1を設定するため、response.encodingは使わない。
+    宣言がない場合はDEFAULT_ENCODINGを返す
+    '''
+    if 'charset' not in response.headers.get('Content-Type', '').lower():
+        return DEFAULT_ENCODING
+    return requests.utils.get_encoding_from_headers(response.headers) or DEFAULT_ENCODING
+
 class VoiceWorkScraper:
-    def __init__(self):
+    def __init__(
+        self,
+        requests_per_second: float=0.5,
+        burst: int=1,
+        transport: Optional[HttpTransport]=None,
+        parser: str | ListingParser="bs4",
+    ):
         '''
         初期化メソッド
         
+        Parameters
+        ----------
+        requests_per_second : float
+            1秒あたりに送信するリクエスト数の上限(全スレッド共通)
+        burst : int
+            連続で送信できるリクエスト数の上限
+        transport : HttpTransport, optional
+            リクエストの送信に使用する通信層(省略時はSessionTransport)
+        parser : str | ListingParser
+            一覧ページの解析に使用するパーサー名("bs4", "lxml", "stream")またはパーサーのインスタンス
+        
         Attributes
         ----------
         base_url : str
@@ -22,6 +57,14 @@ class VoiceWorkScraper:
             HTTPリクエストヘッダー
         params : dict
             クエリパラメータ
+        rate_limiter : TokenBucketRateLimiter
+            リクエスト送信間隔を制御するレートリミッタ
+        transport : HttpTransport
+            コネクションを保持する通信層
+        parser : ListingParser
+            一覧ページから作品情報を抽出するパーサー
+        streaming_parser : StreamingListingParser
+            ダウンロード中のレスポンスから作品情報を抽出するパーサー
         '''
         self.base_url = "https://www.dlsite.com/maniax/works/type/=/language/jp/"
         self.headers = {
@@ -46,6 +89,10 @@ class VoiceWorkScraper:
             "lang_options[0]": "日本語",
             "lang_options[1]": "言語不要"
         }
+        self.rate_limiter = TokenBucketRateLimiter(requests_per_second, burst)
+        self.transport = transport or SessionTransport()
+        self.parser = get_listing_parser(parser)
+        self.streaming_parser = StreamingListingParser()
 
     def get_voice_works_response(self, page=1) -> requests.Response:
         '''
@@ -61,17 +108,9 @@ class VoiceWorkScraper:
         requests.Response
             レスポンスオブジェクト
         '''
-        # ページ番号をクエリパラメータに設定
-        self.params['page'] = str(page)
-        
-        # 完全なURLを構築してGETリクエストを送信
-        url = self._build_url()
-        response = requests.get(url, headers=self.headers)
-        
-        # リクエストが成功した場合はランダムな秒数だけスリープ
-        sleep_random(2, 4)
-        
-        return response
+        # ページ番号を指定して完全なURLを構築し、GETリクエストを送信
+        url = self._build_url(page)
+        return self.get_voice_works_response_by_url(url)
     
     def get_voice_works_response_by_url(self, url: str) -> requests.Response:
         '''
@@ -87,12 +126,51 @@ class VoiceWorkScraper:
         requests.Response
             レスポンスオブジェクト
         '''
-        response = requests.get(url, headers=self.headers)
+        # レートリミッタの許可を待ってからリクエストを送信
+        self.rate_limiter.acquire()
+        return self.transport.get(url, headers=self.headers)
+    
+    def iter_voice_works(self, page: int=1, chunk_size: int=16384) -> Iterator[dict]:
+        '''
+        ボイス作品一覧ページをダウンロードしながら解析し、作品情報を1件ずつ返す
+
+        レスポンス本文をチャンク単位で受け取りながらStreamingListingParserに渡すため、
+        ダウンロードの完了を待たずに解析が始まり、ページ全体をメモリに保持しない。
+        文字コードはContent-Typeで宣言されたもの、宣言がない場合はUTF-8とする。
+        リトライはConcurrentPageFetcher.fetch_page_worksが行う
         
-        # リクエストが成功した場合はランダムな秒数だけスリープ
-        sleep_random(2, 4)
+        Parameters
+        ----------
+        page : int
+            ページ番号
+        chunk_size : int
+            1回に受け取るレスポンス本文のバイト数
         
-        return response
+        Yields
+        ------
+        dict
+            作品情報
+
+        Raises
+        ------
+        requests.HTTPError
+            レスポンスのステータスコードがエラーを示す場合
+        '''
+        url = self._build_url(page)
+        self.rate_limiter.acquire()
+        response = self.transport.get_stream(url, headers=self.headers)
+        try:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=chunk_size)
+            yield from self.streaming_parser.iter_works(chunks, encoding=_declared_encoding(response))
+        finally:
+            response.close()
+    
+    def close(self) -> None:
+        '''
+        通信層が保持しているコネクションを解放する
+        '''
+        self.transport.close()
     
     def get_total_pages(self, html: str, items_per_page=100) -> int:
         '''
@@ -118,16 +196,26 @@ class VoiceWorkScraper:
             return -(-total_items // items_per_page)  # 切り上げ除算で総ページ数を算出
         return 1  # デフォルトで1ページ
 
-    def _build_url(self) -> str:
+    def _build_url(self, page: int=1) -> str:
         '''
         クエリパラメータを組み込んだ完全なURLを構築
+
+        複数スレッドから呼び出されるため、self.paramsは変更せずコピーにページ番号を設定する
+        
+        Parameters
+        ----------
+        page : int
+            ページ番号
         '''
-        query_string = urlencode(self.params, doseq=True)
+        params = {**self.params, "page": str(page)}
+        query_string = urlencode(params, doseq=True)
         return f"{self.base_url}?{query_string}"
     
     def extract_voice_work_data(self, html: str) -> list:
         '''
         ボイス作品の情報を抽出
+
+        抽出処理は初期化時に指定したパーサーに委譲する
         
         Parameters
         ----------
@@ -139,277 +227,4 @@ class VoiceWorkScraper:
         list
             ボイス作品の情報が格納されたリスト
         '''
-        soup = BeautifulSoup(html, "html.parser")
-        voice_works_list = soup.find_all("li", class_="search_result_img_box_inner")
-        results = []
-
-        for work in voice_works_list:
-            work_data = {
-                "product_id": self._extract_product_id(work), # 作品ID
-                "title": self._extract_title_and_link(work)["title"], # タイトル
-                "url": self._extract_title_and_link(work)["url"], # URL
-                "category": self._extract_category(work), # カテゴリー
-                "maker_id": self._extract_maker_id(work), # メーカーID
-                "maker": self._extract_maker_name(work), # メーカー名
-                "author": self._extract_author_name(work), # 作者名
-                "price": self._extract_price(work), # 価格
-                "points": self._extract_points(work), # ポイント
-                "currency_data": self._extract_currency_data(work), # 通貨データ
-                "sales_count": self._extract_sales_count(work), # 販売数
-                "review_count": self._extract_review_count(work), # レビュー数
-                "age_rating": self._extract_age_restriction(work), # 年齢制限
-                "full_image_url": self._extract_full_image_url(work), # フルサイズ画像のURL
-            }
-            results.append(work_data)
-
-        return results
-
-    def _extract_product_id(self, work: BeautifulSoup) -> str:
-        '''
-        作品IDの取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        str
-            作品ID
-        '''
-        if product_id_element := work.find("dt", class_="search_img work_thumb"):
-            return product_id_element["id"].replace("_link_", "")
-        return ""
-    
-    def _extract_title_and_link(self, work: BeautifulSoup) -> dict:
-        '''
-        タイトルとリンクの取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        dict
-            タイトル情報を含む辞書
-        '''
-        if title_element := work.find("dd", class_="work_name").find("a"):
-            return {
-                "title": title_element.get_text(strip=True),
-                "url": title_element["href"]
-            }
-        return {"title": "", "url": ""}
-    
-    def _extract_category(self, work: BeautifulSoup) -> str:
-        '''
-        カテゴリーを取得する
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        str
-            カテゴリーの名前
-        '''
-        if category_element := work.find("dd", class_="work_category_free_sample"):
-            category_link = category_element.find("div", class_="work_category").find("a")
-            if category_link:
-                return category_link.get_text(strip=True)
-        return ""
-    
-    def _extract_maker_id(self, work: BeautifulSoup) -> str:
-        '''
-        メーカーIDの取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        str
-            メーカーID
-        '''
-        attributes_element = work.find("input", {"class": "__product_attributes"})
-        if attributes_element and (value := attributes_element.get("value")):
-            attribute_list = value.split(",")
-            if len(attribute_list) > 0:
-                return attribute_list[0]
-        return ""
-    
-    def _extract_maker_name(self, work: BeautifulSoup) -> str:
-        '''
-        メーカー名の取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        str
-            メーカー名
-        '''
-        if maker_element := work.find("dd", class_="maker_name").find("a"):
-            return maker_element.get_text(strip=True)
-        return ""
-    
-    def _extract_author_name(self, work: BeautifulSoup) -> str:
-        '''
-        作者名の取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        str
-            作者名
-        '''
-        if author_element := work.find("span", class_="author"):
-            return author_element.get_text(strip=True)
-        return ""
-    
-    def _extract_price(self, work: BeautifulSoup) -> int:
-        '''
-        価格の取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        int
-            価格
-        '''
-        if price_element := work.find("span", class_="work_price_base"):
-            return int(price_element.get_text(strip=True).replace(",", ""))
-        return 0
-    
-    def _extract_points(self, work: BeautifulSoup) -> int:
-        '''
-        ポイントの取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        int
-            ポイント
-        '''
-        if point_element := work.find("span", class_="work_point"):
-            return int(point_element.get_text(strip=True).strip("pt").replace(",", ""))
-        return 0
-    
-    def _extract_currency_data(self, work: BeautifulSoup) -> str:
-        '''
-        通貨データの取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        str
-            通貨データ
-        '''
-        if currency_data_element := work.find("div", {"data-vue-component": "currency-price"}):
-            return currency_data_element["data-currency_price"]
-        return ""
-    
-    def _extract_sales_count(self, work: BeautifulSoup) -> int:
-        '''
-        販売数の取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        int
-            販売数
-        '''
-        if sales_count_element := work.find("dd", class_="work_dl"):
-            return int(sales_count_element.find("span").get_text(strip=True).replace(",", ""))
-        return 0
-    
-    def _extract_review_count(self, work: BeautifulSoup) -> int:
-        '''
-        レビュー数の取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        int
-            レビュー数
-        '''
-        if review_container := work.find("dd", class_="work_rating"):
-            if review_count_element := review_container.find("a"):
-                return int(review_count_element.get_text(strip=True).strip("()"))
-        return 0
-    
-    def _extract_age_restriction(self, work: BeautifulSoup) -> str:
-        '''
-        年齢制限の取得
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        str
-            年齢制限
-        '''
-        genre_element = work.find("dd", class_="work_genre")
-        if genre_element:
-            age_rating_element = genre_element.find("span", {"title": True})
-            return age_rating_element["title"] if age_rating_element else "R-18"
-        return ""
-    
-    def _extract_full_image_url(self, work: BeautifulSoup) -> str:
-        '''
-        フルサイズ画像のURLを取得し、https:を付けて返す
-        
-        Parameters
-        ----------
-        work : BeautifulSoup
-            作品情報が格納された要素
-        
-        Returns
-        -------
-        str
-            フルサイズ画像のURL
-        '''
-        if img_element := work.find("div", class_="work_img_popover"):
-            if src_value := img_element.find("img").get(":src"):
-                # 条件式の中から先頭が`//`で始まるURLを抽出
-                urls = src_value.split("'")
-                for url in urls:
-                    if url.startswith("//"):
-                        return f"https:{url}"
-        return ""
\ No newline at end of file
+        return self.parser.extract(html)
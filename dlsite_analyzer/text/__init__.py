@@ -0,0 +1,20 @@
+from .term_matrix import DocumentTermMatrix
+from .tokenizer import (
+    DEFAULT_TARGET_POS,
+    MeCabTokenizer,
+    create_tagger,
+    normalize_text,
+    tokenize_in_parallel,
+)
+from .wordcloud_renderer import render_wordclouds, wordcloud_cache_key
+
+__all__ = [
+    'DEFAULT_TARGET_POS',
+    'DocumentTermMatrix',
+    'MeCabTokenizer',
+    'create_tagger',
+    'normalize_text',
+    'tokenize_in_parallel',
+    'render_wordclouds',
+    'wordcloud_cache_key'
+]
@@ -0,0 +1,212 @@
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ..config import MECAB_NEOLOGD_PATH, MECAB_USER_DIC_PATH
+from .tokenizer import DEFAULT_TARGET_POS, tokenize_in_parallel
+
+class DocumentTermMatrix:
+    '''
+    文書ごとの単語の出現回数を疎行列で保持し、任意のグループ単位で集計する
+
+    行が文書、列が語彙に対応するCSR形式の行列を1回の形態素解析で作成する。
+    年齢指定やサークルなどのグループごとの出現回数は、グループと文書の対応を表す
+    疎行列との積で求めるため、グループの切り口を変えても再解析は行わない。
+    語彙は文字列順に並べてあり、列番号の順序がそのまま単語の順序になる
+    '''
+    def __init__(self, matrix: sparse.csr_matrix, vocabulary: np.ndarray, index: Optional[pd.Index]=None):
+        '''
+        Parameters
+        ----------
+        matrix : sparse.csr_matrix
+            文書数×語彙数の出現回数の行列
+        vocabulary : np.ndarray
+            列に対応する単語(文字列順)
+        index : pd.Index, optional
+            行に対応する文書のインデックス(省略時は0からの連番)
+        '''
+        self.matrix = matrix
+        self.vocabulary = vocabulary
+        self.index = pd.RangeIndex(matrix.shape[0]) if index is None else pd.Index(index)
+        self.term_index = {term: position for position, term in enumerate(vocabulary)}
+
+    @classmethod
+    def from_token_lists(cls, token_lists: Iterable[list], index: Optional[Iterable]=None) -> 'DocumentTermMatrix':
+        '''
+        文書ごとの単語のリストから行列を作成する
+
+        Parameters
+        ----------
+        token_lists : Iterable[list]
+            文書ごとの単語のリスト
+        index : Iterable, optional
+            文書のインデックス
+
+        Returns
+        -------
+        DocumentTermMatrix
+            作成した行列
+        '''
+        token_lists = list(token_lists)
+        vocabulary = {}
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        columns = np.fromiter(
+            (vocabulary.setdefault(token, len(vocabulary)) for tokens in token_lists for token in tokens),
+            dtype=np.int64, count=int(lengths.sum()),
+        )
+
+        # 語彙を文字列順に並べ替え、列番号を付け直す
+        terms = np.array(list(vocabulary), dtype=str)
+        order = np.argsort(terms, kind="stable")
+        new_columns = np.empty_like(order)
+        new_columns[order] = np.arange(len(order))
+
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        matrix = sparse.csr_matrix(
+            (np.ones(len(columns), dtype=np.int64), new_columns[columns], indptr),
+            shape=(len(token_lists), len(terms)),
+        )
+        matrix.sum_duplicates()
+        return cls(matrix, terms[order], index)
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: Iterable[str],
+        index: Optional[Iterable]=None,
+        max_workers: Optional[int]=None,
+        target_pos: Iterable[str]=DEFAULT_TARGET_POS,
+        stop_words: Iterable[str]=(),
+        dic_path: Optional[Path]=MECAB_NEOLOGD_PATH,
+        user_dic_path: Optional[Path]=MECAB_USER_DIC_PATH,
+    ) -> 'DocumentTermMatrix':
+        '''
+        テキストを1回だけ形態素解析して行列を作成する
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            解析対象のテキスト(pd.Seriesの場合はそのインデックスを文書のインデックスとする)
+        index : Iterable, optional
+            文書のインデックス
+        max_workers : int, optional
+            形態素解析のワーカープロセス数(tokenize_in_parallelを参照)
+        target_pos : Iterable[str]
+            抽出する品詞
+        stop_words : Iterable[str]
+            除外する単語
+        dic_path : Path, optional
+            システム辞書のディレクトリ(Noneの場合はMeCabの既定の辞書)
+        user_dic_path : Path, optional
+            ユーザ辞書のパス(存在しない場合は使用しない)
+
+        Returns
+        -------
+        DocumentTermMatrix
+            作成した行列
+        '''
+        if index is None and isinstance(texts, pd.Series):
+            index = texts.index
+        token_lists = tokenize_in_parallel(
+            texts, max_workers=max_workers, target_pos=target_pos, stop_words=stop_words,
+            dic_path=dic_path, user_dic_path=user_dic_path,
+        )
+        return cls.from_token_lists(token_lists, index)
+
+    def term_counts(self) -> pd.Series:
+        '''
+        すべての文書を通した単語の出現回数を返す
+
+        Returns
+        -------
+        pd.Series
+            単語ごとの出現回数(多い順、同数の場合は単語順)
+        '''
+        counts = np.asarray(self.matrix.sum(axis=0)).ravel()
+        return self._to_series(np.flatnonzero(counts), counts[counts > 0])
+
+    def group_counts(self, groups: Iterable) -> dict:
+        '''
+        グループごとの単語の出現回数を返す
+
+        Parameters
+        ----------
+        groups : Iterable
+            文書ごとのグループ(年齢指定、サークル、声優、作品形式など)。
+            文書と同じ順序で並べる。欠損値の文書はどのグループにも含めない
+
+        Returns
+        -------
+        dict
+            グループから単語ごとの出現回数(多い順、同数の場合は単語順)のpd.Seriesへの辞書
+
+        Raises
+        ------
+        ValueError
+            グループの数が文書の数と一致しない場合
+        '''
+        labels, counts = self._group_product(groups)
+        return {label: self._row_series(counts, row) for row, label in enumerate(labels)}
+
+    def group_tfidf(self, groups: Iterable, smooth_idf: bool=True) -> dict:
+        '''
+        グループを1つの文書とみなしたTF-IDFを返す
+
+        TFはグループ内の出現回数、IDFはその単語を含むグループの数から求める。
+        多くのグループに共通する単語の重みが下がるため、グループに特徴的な単語が上位に来る
+
+        Parameters
+        ----------
+        groups : Iterable
+            文書ごとのグループ(group_countsを参照)
+        smooth_idf : bool
+            IDFの分子と分母に1を加えて、すべてのグループに現れる単語の重みを0にしないかどうか
+
+        Returns
+        -------
+        dict
+            グループから単語ごとのTF-IDF(大きい順、同値の場合は単語順)のpd.Seriesへの辞書
+        '''
+        labels, counts = self._group_product(groups)
+        smoothing = 1 if smooth_idf else 0
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log((len(labels) + smoothing) / (document_frequency + smoothing)) + 1
+        scores = sparse.csr_matrix(
+            (counts.data * idf[counts.indices], counts.indices, counts.indptr), shape=counts.shape,
+        )
+        return {label: self._row_series(scores, row) for row, label in enumerate(labels)}
+
+    def _group_product(self, groups: Iterable) -> tuple[pd.Index, sparse.csr_matrix]:
+        '''
+        グループ×文書の対応行列と文書×単語の行列の積を求める
+        '''
+        if not isinstance(groups, pd.Series):
+            groups = pd.Series(list(groups), dtype=object)
+        codes, labels = pd.factorize(groups, sort=True)
+        if len(codes) != self.matrix.shape[0]:
+            raise ValueError(f"グループの数({len(codes)})が文書の数({self.matrix.shape[0]})と一致しません")
+        documents = np.flatnonzero(codes >= 0)
+        membership = sparse.csr_matrix(
+            (np.ones(len(documents), dtype=np.int64), (codes[documents], documents)),
+            shape=(len(labels), self.matrix.shape[0]),
+        )
+        counts = (membership @ self.matrix).tocsr()
+        counts.sort_indices()
+        return labels, counts
+
+    def _row_series(self, matrix: sparse.csr_matrix, row: int) -> pd.Series:
+        '''
+        行列の1行を単語ごとの値のpd.Seriesにする
+        '''
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        return self._to_series(matrix.indices[start:end], matrix.data[start:end])
+
+    def _to_series(self, columns: np.ndarray, values: np.ndarray) -> pd.Series:
+        '''
+        列番号の昇順に並んだ値を、値の大きい順(同値の場合は単語順)のpd.Seriesにする
+        '''
+        order = np.argsort(-values, kind="stable")
+        return pd.Series(values[order], index=pd.Index(self.vocabulary[columns[order]], dtype=object))
@@ -0,0 +1,259 @@
+import os
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Optional
+
+import MeCab
+
+from ..config import MECAB_NEOLOGD_PATH, MECAB_USER_DIC_PATH
+
+# 抽出する品詞の既定値
+DEFAULT_TARGET_POS = ("名詞", "動詞", "形容詞")
+
+# 文頭・文末を表すノードの種類(MECAB_BOS_NODE, MECAB_EOS_NODE)
+_BOS_EOS_STATS = (2, 3)
+
+# 正規化で削除する全角記号と、スペースに置き換える括弧
+_REMOVED_CHARS = "【】()（）『』「」"
+_SPACED_CHARS = "[]［］"
+_NORMALIZATION_TABLE = str.maketrans(
+    {**{char: None for char in _REMOVED_CHARS}, **{char: " " for char in _SPACED_CHARS}}
+)
+
+def normalize_text(text: str) -> str:
+    '''
+    形態素解析の前にテキストを正規化する
+
+    NFKC正規化と大文字化の後、括弧類を1回の変換表の適用で削除またはスペースに置き換える
+
+    Parameters
+    ----------
+    text : str
+        正規化するテキスト
+
+    Returns
+    -------
+    str
+        正規化されたテキスト
+    '''
+    return unicodedata.normalize("NFKC", text).upper().translate(_NORMALIZATION_TABLE)
+
+def create_tagger(
+    dic_path: Optional[Path]=MECAB_NEOLOGD_PATH,
+    user_dic_path: Optional[Path]=MECAB_USER_DIC_PATH,
+    wakati: bool=False,
+) -> MeCab.Tagger:
+    '''
+    辞書を指定してMeCabのTaggerを生成する
+
+    Parameters
+    ----------
+    dic_path : Path, optional
+        システム辞書のディレクトリ(Noneの場合はMeCabの既定の辞書)
+    user_dic_path : Path, optional
+        ユーザ辞書のパス(存在しない場合は使用しない)
+    wakati : bool
+        分かち書きのみを出力するかどうか
+
+    Returns
+    -------
+    MeCab.Tagger
+        生成したTagger
+
+    Raises
+    ------
+    FileNotFoundError
+        システム辞書のディレクトリが存在しない場合
+    '''
+    options = []
+    if wakati:
+        options.append("-Owakati")
+    if dic_path is not None:
+        if not Path(dic_path).exists():
+            raise FileNotFoundError(f"MeCabの辞書が見つかりません: {dic_path}")
+        options.append(f'-d "{dic_path}"')
+    if user_dic_path is not None and Path(user_dic_path).exists():
+        options.append(f'-u "{user_dic_path}"')
+    return MeCab.Tagger(" ".join(options))
+
+class MeCabTokenizer:
+    '''
+    MeCabでテキストを形態素解析し、指定した品詞の単語を抽出するトークナイザー
+
+    Taggerは生成時に1つだけ作成し、すべてのテキストの解析に使い回す。
+    品詞とストップワードは集合として保持し、単語ごとの判定を定数時間で行う
+    '''
+    def __init__(
+        self,
+        target_pos: Iterable[str]=DEFAULT_TARGET_POS,
+        stop_words: Iterable[str]=(),
+        dic_path: Optional[Path]=MECAB_NEOLOGD_PATH,
+        user_dic_path: Optional[Path]=MECAB_USER_DIC_PATH,
+    ):
+        '''
+        Parameters
+        ----------
+        target_pos : Iterable[str]
+            抽出する品詞(素性の先頭の項目)
+        stop_words : Iterable[str]
+            除外する単語
+        dic_path : Path, optional
+            システム辞書のディレクトリ(Noneの場合はMeCabの既定の辞書)
+        user_dic_path : Path, optional
+            ユーザ辞書のパス(存在しない場合は使用しない)
+        '''
+        self.target_pos = frozenset(target_pos)
+        self.stop_words = frozenset(stop_words)
+        self._tagger = create_tagger(dic_path, user_dic_path)
+
+    @property
+    def dictionary_version(self) -> str:
+        '''
+        使用している辞書を識別する文字列
+
+        システム辞書とユーザ辞書のディレクトリ名、ファイル名、バージョン、語数をつなげたもの。
+        辞書が変われば解析結果も変わりうるため、解析結果のキャッシュのキーに用いる
+        '''
+        versions = []
+        info = self._tagger.dictionary_info()
+        while info:
+            path = Path(info.filename)
+            versions.append(f"{path.parent.name}/{path.name}:{info.version}:{info.size}")
+            info = info.next
+        return ",".join(versions)
+
+    def tokenize(self, text: str) -> list:
+        '''
+        テキストを正規化して形態素解析し、条件に合う単語のリストを返す
+
+        Parameters
+        ----------
+        text : str
+            解析対象のテキスト
+
+        Returns
+        -------
+        list
+            抽出された単語のリスト(出現順)
+        '''
+        target_pos = self.target_pos
+        stop_words = self.stop_words
+        tokens = []
+        node = self._tagger.parseToNode(normalize_text(text))
+        while node:
+            surface = node.surface
+            if node.feature.partition(",")[0] in target_pos and surface not in stop_words:
+                tokens.append(surface)
+            node = node.next
+        return tokens
+
+    def tag(self, text: str) -> list:
+        '''
+        テキストを正規化して形態素解析し、すべての単語を品詞とともに返す
+
+        品詞とストップワードによる絞り込みは行わないため、結果を保存しておけば
+        後から任意の条件で絞り込める
+
+        Parameters
+        ----------
+        text : str
+            解析対象のテキスト
+
+        Returns
+        -------
+        list
+            (単語, 品詞)のタプルのリスト(出現順)
+        '''
+        tags = []
+        node = self._tagger.parseToNode(normalize_text(text))
+        while node:
+            if node.stat not in _BOS_EOS_STATS:
+                tags.append((node.surface, node.feature.partition(",")[0]))
+            node = node.next
+        return tags
+
+    def tokenize_many(self, texts: Iterable[str]) -> list:
+        '''
+        複数のテキストを順に解析する
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            解析対象のテキスト
+
+        Returns
+        -------
+        list
+            テキストごとの単語のリスト
+        '''
+        return [self.tokenize(text) for text in texts]
+
+# ワーカープロセスごとに1つだけ生成されるトークナイザー
+_worker_tokenizer = None
+
+def _init_worker(target_pos: tuple, stop_words: tuple, dic_path: Optional[Path], user_dic_path: Optional[Path]) -> None:
+    '''
+    ワーカープロセスの初期化処理。解析に使うトークナイザーを生成する
+    '''
+    global _worker_tokenizer
+    _worker_tokenizer = MeCabTokenizer(target_pos, stop_words, dic_path, user_dic_path)
+
+def _tokenize_shard(texts: list) -> list:
+    '''
+    ワーカープロセスでテキストの断片をまとめて解析する
+    '''
+    return _worker_tokenizer.tokenize_many(texts)
+
+def tokenize_in_parallel(
+    texts: Iterable[str],
+    max_workers: Optional[int]=None,
+    shard_size: Optional[int]=None,
+    target_pos: Iterable[str]=DEFAULT_TARGET_POS,
+    stop_words: Iterable[str]=(),
+    dic_path: Optional[Path]=MECAB_NEOLOGD_PATH,
+    user_dic_path: Optional[Path]=MECAB_USER_DIC_PATH,
+) -> list:
+    '''
+    テキストのリストを断片に分け、プロセスプールで並列に形態素解析する
+
+    各ワーカーは初期化時にTaggerを1つだけ生成し、断片単位でテキストを受け取るため、
+    プロセス間の受け渡しはテキスト1件ごとではなく断片ごとに行われる。
+    結果は入力と同じ順序で返され、MeCabTokenizer.tokenize_manyの結果と一致する
+
+    Parameters
+    ----------
+    texts : Iterable[str]
+        解析対象のテキスト
+    max_workers : int, optional
+        ワーカープロセス数(省略時はCPUコア数、1の場合はプロセスを起動せずに解析する)
+    shard_size : int, optional
+        1回のタスクでワーカーに渡すテキスト数(省略時はワーカーあたり4断片になるように決める)
+    target_pos : Iterable[str]
+        抽出する品詞
+    stop_words : Iterable[str]
+        除外する単語
+    dic_path : Path, optional
+        システム辞書のディレクトリ(Noneの場合はMeCabの既定の辞書)
+    user_dic_path : Path, optional
+        ユーザ辞書のパス(存在しない場合は使用しない)
+
+    Returns
+    -------
+    list
+        テキストごとの単語のリスト
+    '''
+    texts = list(texts)
+    target_pos = tuple(target_pos)
+    stop_words = tuple(stop_words)
+    if max_workers == 1:
+        return MeCabTokenizer(target_pos, stop_words, dic_path, user_dic_path).tokenize_many(texts)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, -(-len(texts) // (max_workers * 4)))
+    shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(target_pos, stop_words, dic_path, user_dic_path),
+    ) as executor:
+        return list(chain.from_iterable(executor.map(_tokenize_shard, shards)))
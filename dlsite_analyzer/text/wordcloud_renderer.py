@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Mapping, Optional
+
+from wordcloud import WordCloud
+
+from ..config import WORDCLOUD_CACHE_DIR
+
+# ワードクラウドの配置に使う乱数のシード(同じ入力から常に同じ画像を描画するため固定する)
+WORDCLOUD_RANDOM_STATE = 0
+
+def wordcloud_cache_key(
+    frequencies: Mapping[str, float],
+    font_path: Path,
+    width: int=900,
+    height: int=500,
+    background_color: str='white',
+) -> str:
+    '''
+    ワードクラウドの画像のキャッシュキーを求める
+
+    単語と出現回数の表、フォント(パス、サイズ、更新日時)、画像の大きさと背景色のハッシュ。
+    いずれかが変われば描画結果も変わるため、キーも変わる
+
+    Parameters
+    ----------
+    frequencies : Mapping[str, float]
+        単語から出現回数への対応(辞書またはpd.Series)
+    font_path : Path
+        フォントのパス
+    width : int
+        画像の幅
+    height : int
+        画像の高さ
+    background_color : str
+        背景色
+
+    Returns
+    -------
+    str
+        キャッシュキー(16進数の文字列)
+    '''
+    font_stat = Path(font_path).stat()
+    table = sorted((str(word), float(count)) for word, count in frequencies.items())
+    key = json.dumps(
+        [table, str(Path(font_path).resolve()), font_stat.st_size, font_stat.st_mtime_ns,
+         width, height, background_color, WORDCLOUD_RANDOM_STATE],
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(key.encode('UTF-8'), digest_size=16).hexdigest()
+
+def _render_wordcloud(
+    frequencies: dict,
+    image_path: Path,
+    font_path: Path,
+    width: int,
+    height: int,
+    background_color: str,
+) -> None:
+    '''
+    ワードクラウドを配置してPNG画像に保存する
+
+    画像はPillowで直接書き出すため、matplotlibや画面を必要とせずワーカープロセスでも描画できる。
+    書き込み中の画像をキャッシュとして読まれないよう、一時ファイルに保存してから置き換える
+    '''
+    wc = WordCloud(
+        background_color=background_color, font_path=str(font_path), width=width, height=height,
+        random_state=WORDCLOUD_RANDOM_STATE,
+    )
+    wc.generate_from_frequencies(frequencies)
+    temp_path = image_path.with_name(f"{image_path.stem}.{os.getpid()}.tmp.png")
+    wc.to_file(str(temp_path))
+    os.replace(temp_path, image_path)
+
+def render_wordclouds(
+    frequency_tables: Mapping[str, Mapping[str, float]],
+    output_paths: Mapping[str, Path],
+    font_path: Path,
+    width: int=900,
+    height: int=500,
+    background_color: str='white',
+    max_workers: Optional[int]=None,
+    cache_dir: Path=WORDCLOUD_CACHE_DIR,
+) -> dict:
+    '''
+    複数のワードクラウドをワーカープロセスで並列に描画して保存する
+
+    描画した画像はキャッシュキーをファイル名としてキャッシュディレクトリに保存する。
+    単語の出現回数、フォント、画像の大きさが前回と同じカテゴリーは、配置を計算せずに
+    キャッシュの画像を出力先にコピーする
+
+    Parameters
+    ----------
+    frequency_tables : Mapping[str, Mapping[str, float]]
+        カテゴリーから、単語と出現回数の対応(辞書またはpd.Series)への対応
+    output_paths : Mapping[str, Path]
+        カテゴリーから画像の保存先への対応
+    font_path : Path
+        フォントのパス
+    width : int
+        画像の幅
+    height : int
+        画像の高さ
+    background_color : str
+        背景色
+    max_workers : int, optional
+        ワーカープロセス数(省略時はCPUコア数、1の場合はプロセスを起動せずに描画する)
+    cache_dir : Path
+        描画済みの画像のキャッシュディレクトリ
+
+    Returns
+    -------
+    dict
+        カテゴリーから、新たに描画したか(キャッシュを使った場合はFalse)への対応
+
+    Raises
+    ------
+    ValueError
+        保存先が指定されていないカテゴリーがある場合
+    '''
+    missing = [category for category in frequency_tables if category not in output_paths]
+    if missing:
+        raise ValueError(f"保存先が指定されていないカテゴリーがあります: {missing}")
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    cache_paths = {}
+    pending = {}
+    for category, frequencies in frequency_tables.items():
+        cache_path = cache_dir / f"{wordcloud_cache_key(frequencies, font_path, width, height, background_color)}.png"
+        cache_paths[category] = cache_path
+        if not cache_path.exists() and cache_path not in pending:
+            pending[cache_path] = dict(frequencies)
+
+    jobs = [
+        (frequencies, cache_path, font_path, width, height, background_color)
+        for cache_path, frequencies in pending.items()
+    ]
+    if max_workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            _render_wordcloud(*job)
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers or os.cpu_count() or 1, len(jobs))) as executor:
+            list(executor.map(_render_wordcloud, *zip(*jobs)))
+
+    for category, cache_path in cache_paths.items():
+        output_path = Path(output_paths[category])
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cache_path, output_path)
+    return {category: cache_path in pending for category, cache_path in cache_paths.items()}
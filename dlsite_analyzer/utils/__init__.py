@@ -1,9 +1,11 @@
 from .logger import Logger
 from .os_util import *
 from .file_util import *
+from .ndjson_util import *
 
 __all__ = [
     'Logger',
     'file_util',
+    'ndjson_util',
     'os_util'
 ]
\ No newline at end of file
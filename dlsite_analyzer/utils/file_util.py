@@ -1,27 +1,17 @@
+import hashlib
 import json
-import random
+import os
 import shutil
+import zipfile
 from datetime import datetime
 from pathlib import Path
-from time import sleep
 
 from .logger import Logger
 
 logger = Logger.get_logger(__name__)
 
-def sleep_random(min_seconds: int, max_seconds: int) -> None:
-    '''
-    Pause execution for a random duration between min_seconds and max_seconds.
-
-    Parameters
-    ----------
-    min_seconds : int
-        Minimum duration in seconds.
-    max_seconds : int
-        Maximum duration in seconds.
-    '''
-    delay = random.uniform(min_seconds, max_seconds)
-    sleep(delay)
+# Name of the member listing the files stored in an archive
+ARCHIVE_INDEX_NAME = '.archive_index.json'
 
 def load_json(file_path: str, encoding: str='UTF-8') -> dict:
     '''
@@ -103,6 +93,11 @@ def archive_and_zip_files(files: list, output_dir: str) -> bool:
     '''
     Archive files into a ZIP file.
 
+    Each file is streamed straight into the archive and deleted once the archive is complete.
+    Files that are already gzip-compressed are stored without recompression. An index member
+    listing the name, size and SHA-256 hash of every file is added so readers can find the
+    members without scanning the archive.
+
     Parameters
     ----------
     files : list
@@ -119,13 +114,68 @@ def archive_and_zip_files(files: list, output_dir: str) -> bool:
         logger.warning("No files provided for archiving.")
         return False
 
-    archive_path = Path(output_dir) / datetime.now().strftime("%Y-%m-%d-%H%M%S")
-    archive_path.mkdir(parents=True, exist_ok=True)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    zip_path = Path(output_dir) / (datetime.now().strftime("%Y-%m-%d-%H%M%S") + ".zip")
+    tmp_path = zip_path.with_name(zip_path.name + ".tmp")
 
-    for file in files:
-        shutil.move(file, archive_path)
+    members = []
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for file in files:
+            members.append(_write_archive_member(archive, Path(file)))
+        index = {"created_at": datetime.now().isoformat(timespec="seconds"), "members": members}
+        archive.writestr(ARCHIVE_INDEX_NAME, json.dumps(index, indent=2, ensure_ascii=False))
+    os.replace(tmp_path, zip_path)
 
-    zip_path = shutil.make_archive(str(archive_path), 'zip', root_dir=archive_path)
-    shutil.rmtree(archive_path)
+    for file in files:
+        Path(file).unlink()
     logger.info(f"Files archived and saved as ZIP: {zip_path}")
     return True
+
+def _write_archive_member(archive: zipfile.ZipFile, file_path: Path) -> dict:
+    '''
+    Stream a file into an open archive and return its index entry.
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        Archive opened for writing.
+    file_path : Path
+        Path to the file to be added.
+
+    Returns
+    -------
+    dict
+        Name, size and SHA-256 hash of the archived file.
+    '''
+    zip_info = zipfile.ZipInfo.from_file(file_path, arcname=file_path.name)
+    zip_info.compress_type = zipfile.ZIP_STORED if file_path.name.endswith('.gz') else zipfile.ZIP_DEFLATED
+
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as source, archive.open(zip_info, 'w') as destination:
+        for chunk in iter(lambda: source.read(1 << 20), b''):
+            sha256.update(chunk)
+            destination.write(chunk)
+    return {"name": zip_info.filename, "size": zip_info.file_size, "sha256": sha256.hexdigest()}
+
+def list_archive_members(archive: zipfile.ZipFile) -> list:
+    '''
+    List the files stored in an archive.
+
+    The index member is used when present. Archives created before the index existed
+    fall back to the ZIP directory.
+
+    Parameters
+    ----------
+    archive : zipfile.ZipFile
+        Archive opened for reading.
+
+    Returns
+    -------
+    list
+        Member names in the order they were archived, excluding the index itself.
+    '''
+    try:
+        with archive.open(ARCHIVE_INDEX_NAME) as index_file:
+            return [member["name"] for member in json.load(index_file)["members"]]
+    except KeyError:
+        return [name for name in archive.namelist() if not name.endswith('/')]
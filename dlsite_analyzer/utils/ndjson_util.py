@@ -0,0 +1,171 @@
+import gzip
+import hashlib
+import json
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+from .logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+try:
+    import orjson
+
+    def _dumps(record: dict) -> bytes:
+        return orjson.dumps(record)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(record: dict) -> bytes:
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('UTF-8')
+
+    _loads = json.loads
+
+NDJSON_GZ_SUFFIX = '.ndjson.gz'
+
+__all__ = [
+    'NDJSON_GZ_SUFFIX',
+    'NDJSONWriter',
+    'iter_ndjson',
+    'iter_ndjson_blocks',
+    'decode_ndjson_lines',
+]
+
+class NDJSONWriter:
+    '''
+    Append-only writer for gzip-compressed newline-delimited JSON records.
+
+    Records are encoded with orjson when it is installed, otherwise with the standard
+    json module. Non-ASCII text is stored as UTF-8 instead of \\uXXXX escapes.
+    The file is created on the first write, so an empty session leaves no file behind.
+    '''
+    def __init__(self, file_path: str, compresslevel: int=6):
+        '''
+        Initialize the writer.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the .ndjson.gz file. New records are appended if it exists.
+        compresslevel : int
+            gzip compression level, default is 6.
+        '''
+        self.file_path = Path(file_path)
+        self.compresslevel = compresslevel
+        self._file = None
+
+    def __enter__(self) -> 'NDJSONWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_many(self, records: Iterable[dict]) -> str:
+        '''
+        Append records and flush them to disk.
+
+        Parameters
+        ----------
+        records : Iterable[dict]
+            Records to be written.
+
+        Returns
+        -------
+        str
+            SHA-256 hex digest of the written lines, usable as a content fingerprint.
+        '''
+        if self._file is None:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = gzip.open(self.file_path, 'ab', compresslevel=self.compresslevel)
+
+        data = b''.join(_dumps(record) + b'\n' for record in records)
+        self._file.write(data)
+        self._file.flush()
+        return hashlib.sha256(data).hexdigest()
+
+    def close(self) -> None:
+        '''
+        Close the file and write the gzip trailer.
+        '''
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def iter_ndjson(file_path: str | BinaryIO) -> Iterator[dict]:
+    '''
+    Stream records from a gzip-compressed NDJSON file one at a time.
+
+    A file cut short by an interrupted writer is read up to its last complete record.
+
+    Parameters
+    ----------
+    file_path : str | BinaryIO
+        Path to the .ndjson.gz file, or a binary file object such as an archive member.
+
+    Yields
+    ------
+    dict
+        Decoded records.
+    '''
+    name = getattr(file_path, 'name', file_path)
+    with gzip.open(file_path, 'rb') as file:
+        try:
+            for line in file:
+                if not line.endswith(b'\n'):
+                    logger.warning(f"Ignoring an incomplete record at the end of {name}")
+                    break
+                yield _loads(line)
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            logger.warning(f"Stopped reading truncated file {name}: {e}")
+
+def iter_ndjson_blocks(file_path: str | BinaryIO, block_size: int=1 << 20) -> Iterator[bytes]:
+    '''
+    Stream the decompressed contents of a gzip-compressed NDJSON file in blocks of whole lines.
+
+    The blocks are not decoded, so they can be handed to other processes and decoded
+    there with `decode_ndjson_lines`. A truncated tail is dropped as in `iter_ndjson`.
+
+    Parameters
+    ----------
+    file_path : str | BinaryIO
+        Path to the .ndjson.gz file, or a binary file object such as an archive member.
+    block_size : int
+        Approximate number of decompressed bytes per block, default is 1 MiB.
+
+    Yields
+    ------
+    bytes
+        Complete NDJSON lines.
+    '''
+    name = getattr(file_path, 'name', file_path)
+    tail = b''
+    with gzip.open(file_path, 'rb') as file:
+        try:
+            while chunk := file.read(block_size):
+                end = chunk.rfind(b'\n') + 1
+                if end == 0:
+                    tail += chunk
+                    continue
+                yield tail + chunk[:end]
+                tail = chunk[end:]
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            logger.warning(f"Stopped reading truncated file {name}: {e}")
+    if tail:
+        logger.warning(f"Ignoring an incomplete record at the end of {name}")
+
+def decode_ndjson_lines(data: bytes) -> list:
+    '''
+    Decode a block of NDJSON lines.
+
+    Parameters
+    ----------
+    data : bytes
+        Complete NDJSON lines, as yielded by `iter_ndjson_blocks`.
+
+    Returns
+    -------
+    list
+        Decoded records.
+    '''
+    return [_loads(line) for line in data.splitlines() if line]
@@ -0,0 +1,25 @@
+'''
+Shared fixtures of the tests: empty databases with the application schema.
+'''
+from pathlib import Path
+
+import pytest
+
+from dlsite_analyzer import DatabaseInitializer
+
+def _create_database(db_path: Path) -> Path:
+    '''
+    Create an empty database with the application schema and return its path.
+    '''
+    initializer = DatabaseInitializer(db_path)
+    initializer.initialize()
+    initializer.db_connection.close()
+    return db_path
+
+@pytest.fixture
+def db_path(tmp_path):
+    return _create_database(tmp_path / "voice_works.db")
+
+@pytest.fixture(scope="module")
+def module_db_path(tmp_path_factory):
+    return _create_database(tmp_path_factory.mktemp("db") / "voice_works.db")
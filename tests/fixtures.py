@@ -0,0 +1,78 @@
+'''
+Synthetic DLsite listing pages for the tests and the benchmarks.
+
+The markup mirrors the elements read by VoiceWorkScraper, including the optional
+ones (author, review count, age rating icon) so every extractor branch is exercised.
+'''
+import random
+
+def _build_work(index: int, rng: random.Random) -> str:
+    '''
+    Build the markup of a single work in the listing.
+
+    Parameters
+    ----------
+    index : int
+        Index of the work, used to derive its IDs and optional elements.
+    rng : random.Random
+        Random generator for prices and counts.
+
+    Returns
+    -------
+    str
+        HTML of one `li.search_result_img_box_inner` element.
+    '''
+    product_id = f"RJ{1000000 + index:08d}"
+    maker_id = f"RG{index % 500:05d}"
+    author = "" if index % 7 == 0 else f'<span class="author"><a href="#">声優{index % 97}</a> / <a href="#">声優{index % 31}</a></span>'
+    review = "" if index % 5 == 0 else f'<a href="#">({rng.randint(1, 300)})</a>'
+    age_icon = "" if index % 3 == 0 else f'<span class="icon_GEN" title="{"全年齢" if index % 2 else "R-15"}">全年齢</span>'
+    return f'''
+<li class="search_result_img_box_inner">
+  <dl class="work_img_main">
+    <dt class="search_img work_thumb" id="_link_{product_id}"><a href="#"><img src="//img.dlsite.jp/{product_id}_sam.jpg" alt=""></a></dt>
+    <dd class="work_name"><div class="icon_wrap"><span class="icon_NEW">新作</span></div>
+      <a href="https://www.dlsite.com/maniax/work/=/product_id/{product_id}.html" title="title">【ASMR】癒やしの耳かき &amp; 添い寝 {index} ～<b>特典付き</b>～</a></dd>
+    <dd class="maker_name"><a href="https://www.dlsite.com/maniax/circle/profile/=/maker_id/{maker_id}.html">サークル{index % 500}</a>{author}</dd>
+    <dd class="work_category_free_sample"><div class="work_category type_SOU"><a href="#">ボイス・ASMR</a></div></dd>
+    <dd class="work_price_wrap">
+      <span class="work_price"><span class="work_price_base">{rng.randint(1, 30) * 110:,}</span><i>円</i></span>
+      <span class="work_point">{rng.randint(1, 300)}pt</span>
+      <div data-vue-component="currency-price" data-currency_price='{{"JPY":{index}}}'></div>
+    </dd>
+    <dd class="work_dl">販売数: <span class="_dl_count_{product_id}">{rng.randint(0, 50000):,}</span></dd>
+    <dd class="work_rating"><div class="star_rating star_45">{review}</div></dd>
+    <dd class="work_genre">{age_icon}<span class="icon_SND">音声あり</span></dd>
+  </dl>
+  <div class="work_img_popover"><img :src="hover ? '//img.dlsite.jp/modpub/images2/work/doujin/{product_id}_img_main.jpg' : ''" alt=""></div>
+  <input type="hidden" class="__product_attributes" value="{maker_id},male,SOU,JPN">
+</li>'''
+
+def build_listing_page(page: int=1, items_per_page: int=100, total_items: int=25000) -> str:
+    '''
+    Build a synthetic listing page.
+
+    Parameters
+    ----------
+    page : int
+        Page number, used to derive product IDs and as the random seed.
+    items_per_page : int
+        Number of works on the page.
+    total_items : int
+        Total number of works shown in the page header.
+
+    Returns
+    -------
+    str
+        HTML of the listing page.
+    '''
+    rng = random.Random(page)
+    offset = (page - 1) * items_per_page
+    works = "".join(_build_work(offset + i, rng) for i in range(items_per_page))
+    return f'''<!DOCTYPE html>
+<html lang="ja"><head><meta charset="utf-8"><title>ボイス・ASMR</title>
+<script>var template = "<li class='search_result_img_box_inner'></li>";</script></head>
+<body>
+<div class="page_total"><strong>{total_items:,}</strong><span>件中</span></div>
+<ul id="search_result_img_box" class="n_worklist">{works}</ul>
+</body></html>'''
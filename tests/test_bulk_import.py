@@ -0,0 +1,47 @@
+'''
+Tests of the bulk importer upsert: importing works again rewrites only the changed ones.
+'''
+import sqlite3
+
+import pytest
+
+from dlsite_analyzer.database import SQLiteHandler, VoiceWorksBulkImporter
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from tests.fixtures import build_listing_page
+
+@pytest.fixture
+def works():
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in (1, 2) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+    return works
+
+def _import(db_path, works: list) -> VoiceWorksBulkImporter:
+    with SQLiteHandler(db_path) as db_connection, VoiceWorksBulkImporter(db_connection, batch_size=64, index_terms=False) as importer:
+        importer.add_many(works)
+    return importer
+
+def _read_rows(db_path) -> dict:
+    with sqlite3.connect(db_path) as connection:
+        return {row[1]: row for row in connection.execute("SELECT rowid, * FROM voice_works")}
+
+def test_reimport_rewrites_only_changed_works(db_path, works):
+    assert _import(db_path, works).changed == len(works)
+    before = _read_rows(db_path)
+
+    changed_work = dict(works[10], sales_count=works[10]["sales_count"] + 1)
+    importer = _import(db_path, [*works[:10], changed_work, *works[11:]])
+    after = _read_rows(db_path)
+
+    assert importer.processed == len(works)
+    assert importer.changed == 1
+    assert after.keys() == before.keys()
+    assert {product_id for product_id in after if after[product_id] != before[product_id]} == {changed_work["product_id"]}
+    assert all(after[product_id][0] == row[0] for product_id, row in before.items())
+
+def test_reimport_of_unchanged_works_changes_nothing(db_path, works):
+    _import(db_path, works)
+    before = _read_rows(db_path)
+    assert _import(db_path, works).changed == 0
+    assert _read_rows(db_path) == before
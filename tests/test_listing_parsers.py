@@ -0,0 +1,45 @@
+'''
+Differential tests of the listing parser backends.
+
+Every backend must return exactly the same records as the BeautifulSoup reference
+parser on the synthetic listing pages, and the streaming parser must give the same
+records however the response body is split into chunks.
+'''
+import pytest
+
+from dlsite_analyzer.scraper import BeautifulSoupListingParser, LISTING_PARSERS, StreamingListingParser
+
+from tests.fixtures import build_listing_page
+
+PAGES = [build_listing_page(page) for page in range(1, 4)]
+
+@pytest.fixture(scope="module")
+def expected_records() -> list:
+    '''
+    Records of each page extracted by the reference parser.
+    '''
+    reference_parser = BeautifulSoupListingParser()
+    records = [reference_parser.extract(html) for html in PAGES]
+    assert all(records), "The fixture pages must hold works for the comparison to mean anything."
+    return records
+
+@pytest.mark.parametrize("name", list(LISTING_PARSERS))
+def test_backend_matches_reference(name: str, expected_records: list):
+    try:
+        backend = LISTING_PARSERS[name]()
+    except ImportError as e:
+        pytest.skip(f"{name} is not installed: {e}")
+    assert [backend.extract(html) for html in PAGES] == expected_records
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_stream_parser_byte_chunks(chunk_size: int, expected_records: list):
+    parser = StreamingListingParser()
+    for html, records in zip(PAGES, expected_records):
+        body = html.encode("UTF-8")
+        chunks = (body[start:start + chunk_size] for start in range(0, len(body), chunk_size))
+        assert list(parser.iter_works(chunks, encoding="UTF-8")) == records
+
+def test_stream_parser_text_chunks(expected_records: list):
+    parser = StreamingListingParser()
+    for html, records in zip(PAGES, expected_records):
+        assert list(parser.iter_works(iter(html))) == records
@@ -0,0 +1,74 @@
+'''
+Tests of the materialized voice works view: after writes to the voice works table or to
+the tables it joins, the rows kept by the triggers equal the rows of the view.
+'''
+import sqlite3
+
+import pytest
+
+from dlsite_analyzer.database import SQLiteHandler, VoiceWorksBulkImporter, VoiceWorksViewHandler
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from tests.fixtures import build_listing_page
+
+@pytest.fixture
+def db_path(db_path):
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in (1, 2) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+
+    with SQLiteHandler(db_path) as db_connection:
+        VoiceWorksViewHandler(db_connection).create_materialized_view()
+        with VoiceWorksBulkImporter(db_connection, index_terms=False) as importer:
+            importer.add_many(works)
+    return db_path
+
+def _read_rows(db_path) -> tuple:
+    with sqlite3.connect(db_path) as connection:
+        materialized = connection.execute("SELECT * FROM voice_works_view_materialized ORDER BY id").fetchall()
+        view = connection.execute(VoiceWorksViewHandler._build_select_query()).fetchall()
+    return materialized, view
+
+def _insert(connection: sqlite3.Connection) -> None:
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(voice_works)") if row[1] != "id"]
+    connection.execute(
+        f"INSERT INTO voice_works (id, {', '.join(columns)}) "
+        f"SELECT 'RJ09999999', {', '.join(columns)} FROM voice_works ORDER BY id LIMIT 1"
+    )
+
+def _update(connection: sqlite3.Connection) -> None:
+    connection.execute(
+        "UPDATE voice_works SET title = '添い寝ラジオ特別編', price = price + 100, "
+        "circle_id = (SELECT MAX(circle_id) FROM voice_works) WHERE id = (SELECT MIN(id) FROM voice_works)"
+    )
+
+def _delete(connection: sqlite3.Connection) -> None:
+    connection.execute("DELETE FROM voice_works WHERE id = (SELECT MIN(id) FROM voice_works)")
+
+def _rename_circle(connection: sqlite3.Connection) -> None:
+    connection.execute("UPDATE circles SET name = 'サークル改名' WHERE id = (SELECT MIN(circle_id) FROM voice_works)")
+
+def _rename_voice_actor(connection: sqlite3.Connection) -> None:
+    connection.execute("UPDATE voice_actor SET name = '声優改名' WHERE id = (SELECT MAX(voice_actor_id) FROM voice_works)")
+
+CHANGES = [
+    pytest.param(_insert, id="insert"),
+    pytest.param(_update, id="update"),
+    pytest.param(_delete, id="delete"),
+    pytest.param(_rename_circle, id="rename circle"),
+    pytest.param(_rename_voice_actor, id="rename voice actor"),
+]
+
+def test_materialized_view_is_filled(db_path):
+    materialized, view = _read_rows(db_path)
+    assert len(materialized) == 200
+    assert materialized == view
+
+@pytest.mark.parametrize("change", CHANGES)
+def test_triggers_match_view(db_path, change):
+    before, _ = _read_rows(db_path)
+    with sqlite3.connect(db_path) as connection:
+        change(connection)
+    materialized, view = _read_rows(db_path)
+    assert materialized != before
+    assert materialized == view
@@ -0,0 +1,39 @@
+'''
+Tests of the parallel import: errors name the record file and block they came from.
+'''
+import sqlite3
+
+import pytest
+
+from dlsite_analyzer import DatabaseInitializer, _iter_record_blocks, _iter_record_sources
+from dlsite_analyzer.database import import_blocks_in_parallel
+from dlsite_analyzer.scraper import VoiceWorkScraper
+from dlsite_analyzer.utils import NDJSONWriter
+
+from tests.fixtures import build_listing_page
+
+@pytest.fixture
+def record_dir(tmp_path):
+    scraper = VoiceWorkScraper(parser="stream")
+    for page in (1, 2):
+        with NDJSONWriter(tmp_path / f"voice_works_{page:03d}.ndjson.gz") as writer:
+            writer.write_many(scraper.extract_voice_work_data(build_listing_page(page)))
+    scraper.close()
+    return tmp_path
+
+def test_blocks_are_named_after_their_record_file(record_dir):
+    names = [name for name, _, _ in _iter_record_blocks(_iter_record_sources(record_dir))]
+    assert names == [
+        f"{record_dir / 'voice_works_001.ndjson.gz'} (block 1)",
+        f"{record_dir / 'voice_works_002.ndjson.gz'} (block 1)",
+    ]
+
+def test_writer_error_names_the_block(record_dir, tmp_path):
+    # Without the voice works table the writer fails when it flushes the first block
+    db_path = tmp_path / "voice_works.db"
+    DatabaseInitializer(db_path).initialize()
+    with sqlite3.connect(db_path) as db_connection:
+        db_connection.execute("DROP TABLE voice_works")
+    blocks = _iter_record_blocks(_iter_record_sources(record_dir))
+    with pytest.raises(RuntimeError, match=r"voice_works_001\.ndjson\.gz \(block 1\)"):
+        import_blocks_in_parallel(str(db_path), blocks, max_workers=1, batch_size=1)
@@ -0,0 +1,120 @@
+'''
+Query plan tests of the voice works view and the common analysis queries.
+
+A fresh database is filled with synthetic voice works and snapshots, then every query
+below is run through EXPLAIN QUERY PLAN. A plan must not read a table in full, unless
+the query is meant to read that whole table; a scan in the order of an index counts as
+a full read unless the index covers the query or the query has a LIMIT.
+'''
+import pytest
+
+from dlsite_analyzer.database import (
+    SQLiteHandler,
+    VoiceWorksBulkImporter,
+    VoiceWorksViewHandler,
+    explain_query_plan,
+    find_full_scans,
+    verify_query_plan,
+)
+from dlsite_analyzer.database.constants import VOICE_WORKS_TABLE, VOICE_ACTORS_TABLE
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from tests.fixtures import build_listing_page
+
+# (description, query, parameters, tables the query is meant to read in full)
+QUERIES = [
+    ("view: all works", "SELECT * FROM voice_works_view", (), (VOICE_WORKS_TABLE,)),
+    ("view: one work", "SELECT * FROM voice_works_view WHERE id = ?", ("RJ01000001",), ()),
+    ("view: by circle", "SELECT * FROM voice_works_view WHERE circle = ?", ("circle",), ()),
+    ("view: by voice actor", "SELECT * FROM voice_works_view WHERE voice_actor = ?", ("actor",), ()),
+    ("view: by age rating", "SELECT * FROM voice_works_view WHERE age = ?", ("全年齢",), ()),
+    ("view: by product format", "SELECT * FROM voice_works_view WHERE product_format = ?", ("format",), ()),
+    ("view: sales range", "SELECT * FROM voice_works_view WHERE sales_count BETWEEN ? AND ?", (100, 200), ()),
+    ("view: price range", "SELECT * FROM voice_works_view WHERE price BETWEEN ? AND ?", (500, 1000), ()),
+    ("view: top sales", "SELECT * FROM voice_works_view ORDER BY sales_count DESC LIMIT 10", (), ()),
+    (
+        "circle ranking",
+        "SELECT id, sales_count FROM voice_works WHERE circle_id = ? ORDER BY sales_count DESC",
+        ("RG00001",),
+        (),
+    ),
+    (
+        "totals per age rating",
+        "SELECT age_id, COUNT(*), SUM(sales_count), SUM(sales_count * price) FROM voice_works GROUP BY age_id",
+        (),
+        (),
+    ),
+    (
+        "most reviewed",
+        "SELECT id, review_count FROM voice_works WHERE review_count > 0 ORDER BY review_count DESC LIMIT 20",
+        (),
+        (),
+    ),
+    ("known product IDs", "SELECT id FROM voice_works", (), (VOICE_WORKS_TABLE,)),
+    (
+        "snapshot: changed products",
+        "SELECT DISTINCT product_id FROM voice_work_snapshots WHERE crawl_run_id > ? AND crawl_run_id <= ?",
+        (1, 2),
+        (),
+    ),
+    (
+        "snapshot: history",
+        "SELECT * FROM voice_work_snapshots WHERE product_id = ? ORDER BY crawl_run_id",
+        ("RJ01000001",),
+        (),
+    ),
+]
+
+# (description, criteria of VoiceWorksViewHandler.build_voice_works_query, tables the query is meant to read in full)
+QUERY_BUILDER_CRITERIA = [
+    ("query: R-18 top sales", {"age": "R-18", "order_by": "sales_count", "limit": 100}, ()),
+    ("query: two age ratings", {"age": ["全年齢", "R-15"], "columns": ["title", "age"]}, ()),
+    ("query: circles", {"circle": ["circle 1", "circle 2"], "order_by": "sales_count"}, ()),
+    ("query: voice actor", {"voice_actor": "声優"}, (VOICE_ACTORS_TABLE,)),
+    ("query: price range", {"price_range": (500, 1000), "order_by": "price", "descending": False}, ()),
+    ("query: sales range", {"sales_range": (1000, None), "columns": ["id", "sales_count"]}, ()),
+]
+
+# Queries whose filters no index serves. SQLite reads them in the product ID order of the view.
+UNINDEXED_QUERIES = [
+    ("SELECT * FROM voice_works_view WHERE points = ?", (3,)),
+    ("SELECT * FROM voice_works_view WHERE title LIKE ?", ("%a%",)),
+]
+
+@pytest.fixture(scope="module")
+def db_connection(module_db_path):
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in range(1, 21) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+
+    with SQLiteHandler(module_db_path) as db_connection:
+        with VoiceWorksBulkImporter(db_connection, crawl_run_key="2024-01-01-000000") as importer:
+            importer.add_many(works)
+        yield db_connection
+
+@pytest.mark.parametrize("description, query, params, allowed_tables", [pytest.param(*case, id=case[0]) for case in QUERIES])
+def test_query_uses_indexes(db_connection, description: str, query: str, params: tuple, allowed_tables: tuple):
+    verify_query_plan(db_connection, query, params, allowed_tables)
+
+@pytest.mark.parametrize(
+    "description, criteria, allowed_tables",
+    [pytest.param(*case, id=case[0]) for case in QUERY_BUILDER_CRITERIA],
+)
+def test_built_query_uses_indexes(db_connection, description: str, criteria: dict, allowed_tables: tuple):
+    query, params = VoiceWorksViewHandler(db_connection).build_voice_works_query(**criteria)
+    verify_query_plan(db_connection, query, tuple(params), allowed_tables)
+
+def test_sales_range_seeks_sales_count_index(db_connection):
+    query, params = VoiceWorksViewHandler(db_connection).build_voice_works_query(sales_range=(1000, None))
+    plan = explain_query_plan(db_connection, query, tuple(params))
+    assert plan[0].startswith(f"SEARCH {VOICE_WORKS_TABLE} USING INDEX idx_voice_works_sales_count ")
+
+@pytest.mark.parametrize("query, params", UNINDEXED_QUERIES)
+def test_index_order_scan_is_reported(db_connection, query: str, params: tuple):
+    with pytest.raises(RuntimeError, match=f"Full scan of {VOICE_WORKS_TABLE}"):
+        verify_query_plan(db_connection, query, params)
+
+def test_index_order_scan_with_limit_is_accepted(db_connection):
+    plan = explain_query_plan(db_connection, "SELECT * FROM voice_works_view WHERE points = ? LIMIT 10", (3,))
+    assert find_full_scans(db_connection, plan, limited=True) == []
+    assert find_full_scans(db_connection, plan) == [VOICE_WORKS_TABLE]
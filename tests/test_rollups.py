@@ -0,0 +1,88 @@
+'''
+Tests of the rollup triggers: after every kind of write to the voice works table, the
+rollups maintained by the triggers equal the rollups recomputed from scratch.
+'''
+import sqlite3
+
+import pytest
+
+from dlsite_analyzer.database import SQLiteHandler, VoiceWorkRollupsTableHandler, VoiceWorksBulkImporter
+from dlsite_analyzer.database.table_managers.voice_work_rollups import ROLLUP_DIMENSIONS
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from tests.fixtures import build_listing_page
+
+@pytest.fixture
+def db_path(db_path):
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in (1, 2) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+
+    with SQLiteHandler(db_path) as db_connection, VoiceWorksBulkImporter(db_connection, index_terms=False) as importer:
+        importer.add_many(works)
+    return db_path
+
+def _read_rollups(db_path) -> dict:
+    with sqlite3.connect(db_path) as connection:
+        return {table: connection.execute(f"SELECT * FROM {table} ORDER BY group_id").fetchall() for table in ROLLUP_DIMENSIONS}
+
+def _most_expensive_work(connection: sqlite3.Connection) -> tuple:
+    # The work setting the maximum price of its age rating, so changing it invalidates the extreme
+    return connection.execute("SELECT id, circle_id, age_id FROM voice_works ORDER BY price DESC, id LIMIT 1").fetchone()
+
+def _insert(connection: sqlite3.Connection) -> None:
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(voice_works)") if row[1] not in ("id", "price")]
+    connection.execute(
+        f"INSERT INTO voice_works (id, price, {', '.join(columns)}) "
+        f"SELECT 'RJ09999999', price + 1000, {', '.join(columns)} FROM voice_works ORDER BY id LIMIT 1"
+    )
+
+def _update_in_place(connection: sqlite3.Connection) -> None:
+    product_id, _, _ = _most_expensive_work(connection)
+    connection.execute("UPDATE voice_works SET price = 1, sales_count = 0 WHERE id = ?", (product_id,))
+    connection.execute("UPDATE voice_works SET sales_count = sales_count * 2, review_count = review_count + 1 WHERE id < 'RJ01000050'")
+
+def _move_to_another_group(connection: sqlite3.Connection) -> None:
+    product_id, _, age_id = _most_expensive_work(connection)
+    circle_id, other_age_id = connection.execute(
+        "SELECT circle_id, age_id FROM voice_works WHERE age_id IS NOT ? ORDER BY id LIMIT 1", (age_id,)
+    ).fetchone()
+    connection.execute("UPDATE voice_works SET circle_id = ?, age_id = ? WHERE id = ?", (circle_id, other_age_id, product_id))
+
+def _delete_last_work_of_group(connection: sqlite3.Connection) -> None:
+    # Every circle of the listing has one work, so the circle loses its last work
+    product_id, _, _ = _most_expensive_work(connection)
+    connection.execute("DELETE FROM voice_works WHERE id = ?", (product_id,))
+
+def _null_price(connection: sqlite3.Connection) -> None:
+    product_id, _, _ = _most_expensive_work(connection)
+    connection.execute("UPDATE voice_works SET price = NULL WHERE id = ?", (product_id,))
+    connection.execute("UPDATE voice_works SET price = NULL WHERE id IN (SELECT id FROM voice_works ORDER BY price LIMIT 1)")
+
+CHANGES = [
+    pytest.param(_insert, id="insert"),
+    pytest.param(_update_in_place, id="update in place"),
+    pytest.param(_move_to_another_group, id="move to another group"),
+    pytest.param(_delete_last_work_of_group, id="delete last work of group"),
+    pytest.param(_null_price, id="null price"),
+]
+
+@pytest.mark.parametrize("change", CHANGES)
+def test_triggers_match_rebuild(db_path, change):
+    before = _read_rollups(db_path)
+    with sqlite3.connect(db_path) as connection:
+        change(connection)
+    maintained = _read_rollups(db_path)
+    assert maintained != before
+
+    with SQLiteHandler(db_path) as db_connection:
+        for table_name in ROLLUP_DIMENSIONS:
+            VoiceWorkRollupsTableHandler(db_connection, table_name).rebuild()
+    assert maintained == _read_rollups(db_path)
+
+def test_group_without_works_is_removed(db_path):
+    with sqlite3.connect(db_path) as connection:
+        product_id, circle_id, _ = _most_expensive_work(connection)
+        connection.execute("DELETE FROM voice_works WHERE id = ?", (product_id,))
+        remaining = connection.execute("SELECT COUNT(*) FROM circle_rollups WHERE group_id = ?", (circle_id,)).fetchone()[0]
+    assert remaining == 0
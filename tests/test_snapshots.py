@@ -0,0 +1,61 @@
+'''
+Tests of the delta-encoded snapshots: a crawl run adds a row only for the works that
+changed, whatever the order in which the runs are imported.
+'''
+import sqlite3
+
+import pytest
+
+from dlsite_analyzer.database import SQLiteHandler, VoiceWorksBulkImporter, VoiceWorkSnapshotsTableHandler
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from tests.fixtures import build_listing_page
+
+FIRST_RUN = "2024-01-01-000000"
+SECOND_RUN = "2024-01-02-000000"
+
+@pytest.fixture
+def works():
+    scraper = VoiceWorkScraper(parser="stream")
+    works = scraper.extract_voice_work_data(build_listing_page(1))
+    scraper.close()
+    return works
+
+def _import(db_path, works: list, crawl_run_key: str) -> VoiceWorksBulkImporter:
+    with SQLiteHandler(db_path) as db_connection:
+        with VoiceWorksBulkImporter(db_connection, crawl_run_key=crawl_run_key, index_terms=False) as importer:
+            importer.add_many(works)
+    return importer
+
+def _read_snapshots(db_path) -> list:
+    with sqlite3.connect(db_path) as connection:
+        return connection.execute("SELECT * FROM voice_work_snapshots ORDER BY product_id, crawl_run_id").fetchall()
+
+def _changed(works: list) -> list:
+    return [dict(works[0], sales_count=works[0]["sales_count"] + 5), *works[1:]]
+
+def test_unchanged_works_add_no_rows(db_path, works):
+    assert _import(db_path, works, FIRST_RUN).snapshots == len(works)
+    assert _import(db_path, works, SECOND_RUN).snapshots == 0
+    assert len(_read_snapshots(db_path)) == len(works)
+
+def test_changed_work_adds_one_row(db_path, works):
+    _import(db_path, works, FIRST_RUN)
+    assert _import(db_path, _changed(works), SECOND_RUN).snapshots == 1
+    assert len(_read_snapshots(db_path)) == len(works) + 1
+
+@pytest.mark.parametrize("second_works", [pytest.param(list, id="unchanged"), pytest.param(_changed, id="changed")])
+def test_runs_imported_out_of_order(tmp_path, db_path, works, second_works):
+    # Importing the later run first must end with the same snapshots as importing in order
+    in_order_db_path = tmp_path / "in_order.db"
+    in_order_db_path.write_bytes(db_path.read_bytes())
+    _import(in_order_db_path, works, FIRST_RUN)
+    _import(in_order_db_path, second_works(works), SECOND_RUN)
+
+    _import(db_path, second_works(works), SECOND_RUN)
+    _import(db_path, works, FIRST_RUN)
+    assert _read_snapshots(db_path) == _read_snapshots(in_order_db_path)
+
+    with SQLiteHandler(db_path) as db_connection:
+        history = VoiceWorkSnapshotsTableHandler(db_connection).get_history(works[0]["product_id"])
+    assert history["sales_count"].tolist() == sorted({works[0]["sales_count"], second_works(works)[0]["sales_count"]})
@@ -0,0 +1,142 @@
+'''
+Tests of the streaming crawl: the fetch workers parse each page while its body is
+downloading, with the same retry and dead-letter handling as a full download.
+
+Pages are served by a fake HttpTransport from the synthetic listing pages, so no
+network is used.
+'''
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from dlsite_analyzer import _crawl_voice_works
+from dlsite_analyzer.scraper import (
+    BeautifulSoupListingParser,
+    ConcurrentPageFetcher,
+    CrawlManifest,
+    HttpTransport,
+    VoiceWorkScraper,
+)
+from dlsite_analyzer.utils import iter_ndjson
+
+from tests.fixtures import build_listing_page
+
+TOTAL_PAGES = 3
+
+class _Body:
+    '''
+    Response body read in chunks, optionally dropping the connection halfway.
+    '''
+    def __init__(self, data: bytes, fail_at: int | None=None):
+        self.data = data
+        self.position = 0
+        self.fail_at = fail_at
+
+    def read(self, size: int=-1) -> bytes:
+        if self.fail_at is not None and self.position >= self.fail_at:
+            raise requests.ConnectionError("Connection dropped while reading the body.")
+        end = len(self.data) if size < 0 else self.position + size
+        chunk = self.data[self.position:end]
+        self.position += len(chunk)
+        return chunk
+
+    def close(self) -> None:
+        pass
+
+class _FakeTransport(HttpTransport):
+    '''
+    Serves the synthetic listing pages. The first `failures` streamed responses of
+    each page in `failing_pages` drop the connection in the middle of the body.
+    '''
+    def __init__(self, failing_pages: dict | None=None, content_type: str="text/html; charset=UTF-8"):
+        self.failing_pages = dict(failing_pages or {})
+        self.content_type = content_type
+        self.streamed_pages = []
+
+    def get(self, url: str, headers: dict) -> requests.Response:
+        return self._response(url, stream=False)
+
+    def get_stream(self, url: str, headers: dict) -> requests.Response:
+        return self._response(url, stream=True)
+
+    def _response(self, url: str, stream: bool) -> requests.Response:
+        page = int(parse_qs(urlsplit(url).query)["page"][0])
+        data = build_listing_page(page, total_items=TOTAL_PAGES * 100).encode("UTF-8")
+        fail_at = None
+        if stream:
+            self.streamed_pages.append(page)
+            if self.failing_pages.get(page, 0) > 0:
+                self.failing_pages[page] -= 1
+                fail_at = len(data) // 2
+
+        response = requests.Response()
+        response.status_code = 200
+        # requests sets the encoding from the headers, ISO-8859-1 for text/html without a charset
+        response.headers["Content-Type"] = self.content_type
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = url
+        response.raw = _Body(data, fail_at)
+        if not stream:
+            response._content = data
+        return response
+
+def _expected_records(pages: list) -> list:
+    reference_parser = BeautifulSoupListingParser()
+    return [reference_parser.extract(build_listing_page(page, total_items=TOTAL_PAGES * 100)) for page in pages]
+
+def _saved_records(save_dir) -> list:
+    return [work for path in sorted(save_dir.glob("voice_works_*")) for work in iter_ndjson(str(path))]
+
+def _fetcher(transport: _FakeTransport, attempts: list, max_retries: int=3) -> ConcurrentPageFetcher:
+    scraper = VoiceWorkScraper(requests_per_second=1000, burst=100, transport=transport, parser="stream")
+    return ConcurrentPageFetcher(
+        scraper, max_workers=2, max_retries=max_retries, retry_delay=0, on_attempt=attempts.append, stream=True,
+    )
+
+def test_stream_fetch_matches_reference():
+    attempts = []
+    fetcher = _fetcher(_FakeTransport(), attempts)
+    pages = list(range(1, TOTAL_PAGES + 1))
+    results = list(fetcher.fetch_pages(pages))
+    assert [page for page, _ in results] == pages
+    assert [records for _, records in results] == _expected_records(pages)
+
+def test_stream_fetch_without_charset_decodes_utf8():
+    attempts = []
+    records = _fetcher(_FakeTransport(content_type="text/html"), attempts).fetch_page_works(1)
+    assert records == _expected_records([1])[0]
+    assert "癒やしの耳かき" in records[0]["title"]
+
+def test_stream_fetch_retries_a_dropped_body():
+    attempts = []
+    transport = _FakeTransport(failing_pages={2: 1})
+    assert _fetcher(transport, attempts).fetch_page_works(2) == _expected_records([2])[0]
+    assert attempts == [2, 2]
+
+def test_stream_fetch_gives_up_after_max_retries():
+    attempts = []
+    transport = _FakeTransport(failing_pages={2: 5})
+    assert _fetcher(transport, attempts, max_retries=3).fetch_page_works(2) is None
+    assert attempts == [2, 2, 2]
+
+def test_stream_crawl_saves_every_page(tmp_path):
+    attempts = []
+    transport = _FakeTransport(failing_pages={3: 1})
+    fetcher = _fetcher(transport, attempts)
+    manifest = CrawlManifest(tmp_path / "manifest.json")
+    _crawl_voice_works(fetcher.scraper, fetcher, tmp_path, manifest)
+
+    expected = [work for records in _expected_records(list(range(1, TOTAL_PAGES + 1))) for work in records]
+    assert _saved_records(tmp_path) == expected
+    assert manifest.dead_letter_pages() == []
+    # The first page is downloaded whole to read the total page count; the others are streamed
+    assert sorted(set(transport.streamed_pages)) == [2, 3]
+
+@pytest.mark.parametrize("parser", ["bs4", "stream"])
+def test_crawl_parsers_save_the_same_records(tmp_path, parser: str):
+    scraper = VoiceWorkScraper(requests_per_second=1000, burst=100, transport=_FakeTransport(), parser=parser)
+    fetcher = ConcurrentPageFetcher(scraper, max_workers=2, retry_delay=0, stream=parser == "stream")
+    _crawl_voice_works(scraper, fetcher, tmp_path, CrawlManifest(tmp_path / "manifest.json"))
+    expected = [work for records in _expected_records(list(range(1, TOTAL_PAGES + 1))) for work in records]
+    assert _saved_records(tmp_path) == expected
@@ -0,0 +1,73 @@
+'''
+Tests of the incremental term counts: after a title is changed or a work is deleted, the
+counts updated as deltas equal the counts rebuilt from every title.
+'''
+import sqlite3
+
+import pytest
+
+from dlsite_analyzer.database import SQLiteHandler, VoiceWorksBulkImporter, VoiceWorkTermIndexer
+from dlsite_analyzer.database.table_managers.term_counts import TERM_COUNT_DIMENSIONS
+from dlsite_analyzer.database.term_index import WORK_GROUP_COLUMNS
+from dlsite_analyzer.scraper import VoiceWorkScraper
+from dlsite_analyzer.text import normalize_text
+
+from tests.fixtures import build_listing_page
+
+class _WhitespaceTokenizer:
+    '''
+    Splits normalized titles on whitespace, standing in for MeCab.
+    '''
+    dictionary_version = "whitespace"
+
+    def tag(self, text: str) -> list:
+        return [(word, "名詞") for word in normalize_text(text).split()]
+
+@pytest.fixture
+def db_path(db_path):
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in (1, 2) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+
+    with SQLiteHandler(db_path) as db_connection:
+        with VoiceWorksBulkImporter(db_connection, index_terms=False) as importer:
+            importer.add_many(works)
+        VoiceWorkTermIndexer(db_connection, tokenizer=_WhitespaceTokenizer()).sync()
+    return db_path
+
+def _read_term_counts(db_path) -> dict:
+    with sqlite3.connect(db_path) as connection:
+        return {table: connection.execute(f"SELECT * FROM {table} ORDER BY 1, 2, 3").fetchall() for table in TERM_COUNT_DIMENSIONS}
+
+def _read_work(db_path, product_id: str) -> tuple:
+    with sqlite3.connect(db_path) as connection:
+        query = f"SELECT id, title, {', '.join(WORK_GROUP_COLUMNS)} FROM voice_works WHERE id = ?"
+        return connection.execute(query, (product_id,)).fetchone()
+
+def _assert_matches_rebuild(db_path, indexer: VoiceWorkTermIndexer) -> None:
+    incremental = _read_term_counts(db_path)
+    indexer.rebuild()
+    assert incremental == _read_term_counts(db_path)
+
+def test_title_update_matches_rebuild(db_path):
+    before = _read_term_counts(db_path)
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("UPDATE voice_works SET title = '添い寝 ラジオ 特別編' WHERE id = 'RJ01000000'")
+    with SQLiteHandler(db_path) as db_connection:
+        indexer = VoiceWorkTermIndexer(db_connection, tokenizer=_WhitespaceTokenizer())
+        indexer.update([_read_work(db_path, 'RJ01000000')])
+        db_connection.commit()
+        assert indexer.tokenized == 1
+        assert _read_term_counts(db_path) != before
+        _assert_matches_rebuild(db_path, indexer)
+
+def test_delete_matches_rebuild(db_path):
+    before = _read_term_counts(db_path)
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("DELETE FROM voice_works WHERE id = 'RJ01000000'")
+    with SQLiteHandler(db_path) as db_connection:
+        indexer = VoiceWorkTermIndexer(db_connection, tokenizer=_WhitespaceTokenizer())
+        indexer.remove(['RJ01000000'])
+        db_connection.commit()
+        assert _read_term_counts(db_path) != before
+        _assert_matches_rebuild(db_path, indexer)
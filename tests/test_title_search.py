@@ -0,0 +1,65 @@
+'''
+Tests of the title search index: it is maintained from Python, so any SQLite client can
+write to the voice works table, and the works it writes are indexed on the next sync.
+'''
+import sqlite3
+
+import pytest
+
+from dlsite_analyzer.database import (
+    SQLiteHandler,
+    VoiceWorksBulkImporter,
+    VoiceWorksTitleSearchTableHandler,
+    VoiceWorksViewHandler,
+)
+from dlsite_analyzer.scraper import VoiceWorkScraper
+
+from tests.fixtures import build_listing_page
+
+@pytest.fixture
+def db_path(db_path):
+    scraper = VoiceWorkScraper(parser="stream")
+    works = [work for page in (1, 2) for work in scraper.extract_voice_work_data(build_listing_page(page))]
+    scraper.close()
+    works[0]["title"] = "ＡＳＭＲ 耳かき専門店"
+
+    with SQLiteHandler(db_path) as db_connection, VoiceWorksBulkImporter(db_connection, index_terms=False) as importer:
+        importer.add_many(works)
+    return db_path
+
+def _search(db_path, keywords: str) -> list:
+    with SQLiteHandler(db_path) as db_connection:
+        return VoiceWorksViewHandler(db_connection).search_titles(keywords, limit=None)
+
+def test_import_indexes_titles(db_path):
+    with sqlite3.connect(db_path) as connection:
+        product_id = connection.execute("SELECT id FROM voice_works WHERE title = 'ＡＳＭＲ 耳かき専門店'").fetchone()[0]
+        n_works = connection.execute("SELECT COUNT(*) FROM voice_works").fetchone()[0]
+        n_indexed = connection.execute("SELECT COUNT(*) FROM voice_works_title_search").fetchone()[0]
+    assert n_indexed == n_works
+    assert _search(db_path, "耳かき専門") == [product_id]
+    assert _search(db_path, "asmr 耳かき専門") == [product_id]
+
+def test_plain_connection_can_write_voice_works(db_path):
+    with sqlite3.connect(db_path) as connection:
+        product_id = connection.execute("SELECT id FROM voice_works LIMIT 1").fetchone()[0]
+        connection.execute("UPDATE voice_works SET title = '添い寝ラジオ特別編' WHERE id = ?", (product_id,))
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(voice_works)") if row[1] not in ("id", "title")]
+        connection.execute(
+            f"INSERT INTO voice_works (id, title, {', '.join(columns)}) "
+            f"SELECT 'RJ99999999', '囁きラジオ特別編', {', '.join(columns)} FROM voice_works WHERE id = ?",
+            (product_id,),
+        )
+    assert _search(db_path, "添い寝ラジオ") == []
+    assert _search(db_path, "囁きラジオ") == []
+
+    with SQLiteHandler(db_path) as db_connection:
+        assert VoiceWorksTitleSearchTableHandler(db_connection).index_missing() == 2
+    assert _search(db_path, "添い寝ラジオ") == [product_id]
+    assert _search(db_path, "囁きラジオ") == ["RJ99999999"]
+
+def test_deleted_works_leave_the_index(db_path):
+    with sqlite3.connect(db_path) as connection:
+        product_id = connection.execute("SELECT id FROM voice_works WHERE title = 'ＡＳＭＲ 耳かき専門店'").fetchone()[0]
+        connection.execute("DELETE FROM voice_works WHERE id = ?", (product_id,))
+    assert _search(db_path, "耳かき専門") == []